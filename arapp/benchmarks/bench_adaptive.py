@@ -0,0 +1,87 @@
+"""
+AdaptiveController on a simulated slow device
+
+FramePipeline runs the real overlays and encode behind a fake 30 fps
+camera. The fake frame_callback costs a fixed overhead plus time
+proportional to the payload size, like page.update on a weak phone.
+Prints the level the controller settles on, how often it changed, and
+latency against the budget.
+
+    python benchmarks/bench_adaptive.py [--seconds 12] [--budget-ms 120]
+        [--callback-ms 20] [--kb-per-ms 2]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+import cv2
+import numpy as np
+
+ARAPP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ARAPP_DIR)
+
+from src.ar_navigation.adaptive import AdaptiveController
+from src.ar_navigation.ar_camera import _arrow_img, _encode_frame_to_base64
+from src.ar_navigation.arrow_atlas import ArrowAtlas
+from src.ar_navigation.banner import BannerRenderer
+from src.ar_navigation.pipeline import FramePipeline
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=12.0)
+    parser.add_argument("--budget-ms", type=float, default=120.0)
+    parser.add_argument("--callback-ms", type=float, default=20.0)
+    parser.add_argument("--kb-per-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    # Textured scene so JPEG size actually depends on resolution and quality
+    rng = np.random.default_rng(0)
+    scene = cv2.GaussianBlur(rng.integers(0, 256, (480, 640, 3), dtype=np.uint8), (0, 0), 2)
+    controller = AdaptiveController(latency_budget_ms=args.budget_ms, cooldown_s=1.0)
+    atlas, banner = ArrowAtlas(_arrow_img), BannerRenderer()
+    stop = threading.Event()
+    trace = []
+    state = {"i": 0}
+
+    def capture():
+        time.sleep(1 / 30)
+        w, h = controller.resolution
+        return cv2.resize(scene, (w, h), interpolation=cv2.INTER_AREA)
+
+    def compose(frame):
+        i = state["i"] = state["i"] + 1
+        banner.draw(frame, f"Destination: {200 - i // 20} m")
+        return atlas.draw(frame, (i * 0.7) % 360, 0.5 * frame.shape[0] / 480.0)
+
+    def encode(frame):
+        return _encode_frame_to_base64(frame, controller.jpeg_quality)
+
+    def deliver(payload):
+        time.sleep((args.callback_ms + len(payload) / 1024 / args.kb_per_ms) / 1e3)
+        trace.append((time.perf_counter(), controller.level, len(payload)))
+
+    pipeline = FramePipeline(capture, compose, encode, deliver, stop, controller=controller)
+    t0 = time.perf_counter()
+    pipeline.start()
+    time.sleep(args.seconds)
+    stop.set()
+    pipeline.join()
+
+    print(f"budget {args.budget_ms:.0f} ms, callback {args.callback_ms:.0f} ms + payload at "
+          f"{args.kb_per_ms:g} KB/ms, {args.seconds:.0f} s")
+    second = 0
+    for t, level, size in trace:
+        if t - t0 >= second:
+            print(f"  t={second:2d}s  level {level}  {controller.levels[level]}  payload {size / 1024:5.1f} KB")
+            second += 2
+    tail = [e for e in trace if e[0] - t0 > args.seconds / 2]
+    fps = len(tail) / (args.seconds / 2)
+    print(f"  settled on {controller.settings}")
+    print(f"  {controller.changes} level changes, second half {fps:.1f} fps delivered")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Distance banner: per-frame copy/addWeighted/putText vs BannerRenderer
+
+Draws "Destination: N m" onto a 640x480 frame while the distance counts
+down the way it does when walking (a few frames per metre), and reports
+time per frame, sprite cache stats and the largest pixel difference.
+
+    python benchmarks/bench_banner.py [--frames 900]
+"""
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+ARAPP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ARAPP_DIR)
+
+from src.ar_navigation.banner import BannerRenderer
+
+
+def legacy_banner(frame, text):
+    # The banner block generate_frames used before
+    font = cv2.FONT_HERSHEY_SIMPLEX
+    (text_w, text_h), baseline = cv2.getTextSize(text, font, 0.65, 1)
+    pad_x, pad_y = 25, 15
+    banner_w = text_w + 2 * pad_x
+    banner_h = text_h + baseline + 2 * pad_y
+    fh, fw = frame.shape[:2]
+    x0 = max(0, min((fw - banner_w) // 2, fw - banner_w))
+    y0 = max(0, min(25, fh - banner_h))
+    overlay = frame.copy()
+    cv2.rectangle(overlay, (x0, y0), (x0 + banner_w, y0 + banner_h), (122, 42, 0), -1)
+    cv2.addWeighted(overlay, 0.7, frame, 0.3, 0, frame)
+    cv2.putText(frame, text, (x0 + pad_x, y0 + pad_y + text_h), font, 0.65, (240, 240, 240), 1, cv2.LINE_AA)
+    return frame
+
+
+def _time_per_frame(draw, base, texts):
+    frame = base.copy()
+    t0 = time.perf_counter()
+    for text in texts:
+        frame[:] = base
+        draw(frame, text)
+    return (time.perf_counter() - t0) / len(texts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=900)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    base = rng.integers(0, 256, (480, 640, 3), dtype=np.uint8)
+    # ~1.4 m/s at 30 fps: the metre count changes every ~20 frames
+    dists = 250.0 - np.arange(args.frames) * (1.4 / 30) + rng.normal(0, 0.3, args.frames)
+    texts = [f"Destination: {int(d)} m" for d in dists]
+
+    renderer = BannerRenderer()
+    legacy = _time_per_frame(legacy_banner, base, texts)
+    cached = _time_per_frame(renderer.draw, base, texts)
+
+    worst = 0
+    for text in texts[::50]:
+        a = legacy_banner(base.copy(), text)
+        b = renderer.draw(base.copy(), text)
+        worst = max(worst, int(np.abs(a.astype(np.int16) - b).max()))
+
+    print(f"640x480, {args.frames} frames, {len(set(texts))} distinct strings")
+    print(f"  copy + addWeighted + putText   {legacy * 1e3:7.3f} ms/frame")
+    print(f"  BannerRenderer                 {cached * 1e3:7.3f} ms/frame")
+    print(f"  max |difference|               {worst}")
+    print(f"  renderer: {renderer.stats}")
+
+
+if __name__ == "__main__":
+    main()
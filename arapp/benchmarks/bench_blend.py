@@ -0,0 +1,105 @@
+"""
+Overlay blending: float64 path vs integer fixed-point path
+
+Arrow: the old float blend from _overlay_perspective_arrow vs
+blend_premultiplied with a premultiplied sprite and reused scratch.
+Banner: full-frame copy + cv2.addWeighted vs blending the banner ROI.
+Reports time per call, bytes allocated per call (tracemalloc) and the
+largest per-channel difference.
+
+    python benchmarks/bench_blend.py [--runs 500]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+ARAPP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ARAPP_DIR)
+
+from src.ar_navigation.ar_camera import _arrow_img
+from src.ar_navigation.blend import BlendScratch, blend_premultiplied, premultiply, solid
+
+
+def legacy_arrow_blend(frame, x, y, arrow_bgra):
+    # Verbatim float blend the arrow overlay used before
+    h, w = arrow_bgra.shape[:2]
+    roi = frame[y:y+h, x:x+w]
+    b, g, r, a = cv2.split(arrow_bgra)
+    arrow_rgb = cv2.merge((b, g, r))
+    mask = a.astype(float) / 255.0
+    mask = np.stack([mask, mask, mask], axis=-1)
+    roi = roi.astype(float)
+    arrow_rgb = arrow_rgb.astype(float)
+    blended = (roi * (1 - mask) + arrow_rgb * mask).astype(np.uint8)
+    frame[y:y+h, x:x+w] = blended
+    return frame
+
+
+def legacy_banner(frame, x0, y0, w, h):
+    overlay = frame.copy()
+    cv2.rectangle(overlay, (x0, y0), (x0 + w, y0 + h), (122, 42, 0), -1)
+    cv2.addWeighted(overlay, 0.7, frame, 0.3, 0, frame)
+    return frame
+
+
+def _measure(fn, base, runs):
+    frame = base.copy()
+    fn(frame)  # warm scratch buffers
+    t0 = time.perf_counter()
+    for _ in range(runs):
+        frame[:] = base
+        fn(frame)
+    elapsed = (time.perf_counter() - t0) / runs
+
+    tracemalloc.start()
+    frame[:] = base
+    before = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    for _ in range(20):
+        fn(frame)
+    peak = tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=500)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    base = rng.integers(0, 256, (480, 640, 3), dtype=np.uint8)
+    arrow = cv2.resize(_arrow_img, (275, 275), interpolation=cv2.INTER_AREA)
+    x, y = 640 // 2 - 275 // 2, 480 - 275
+    premul, inv_alpha = premultiply(arrow)
+    scratch = BlendScratch()
+    fill = solid((122, 42, 0), 0.7)
+    bx, by, bw, bh = 180, 25, 280, 50
+
+    cases = [
+        ("arrow  float64", lambda f: legacy_arrow_blend(f, x, y, arrow)),
+        ("arrow  fixed-point", lambda f: blend_premultiplied(f, x, y, premul, inv_alpha, scratch=scratch)),
+        ("banner full-frame addWeighted", lambda f: legacy_banner(f, bx, by, bw, bh)),
+        ("banner ROI fixed-point", lambda f: blend_premultiplied(f, bx, by, *fill, size=(bh + 1, bw + 1), scratch=scratch)),
+    ]
+
+    print(f"640x480 frame, arrow 275x275, banner {bw + 1}x{bh + 1}, {args.runs} runs")
+    for name, fn in cases:
+        elapsed, peak = _measure(fn, base, args.runs)
+        print(f"  {name:<32} {elapsed * 1e3:7.3f} ms/call   peak alloc {peak / 1024:9.1f} KiB")
+
+    a = legacy_arrow_blend(base.copy(), x, y, arrow)
+    b = blend_premultiplied(base.copy(), x, y, premul, inv_alpha)
+    c = legacy_banner(base.copy(), bx, by, bw, bh)
+    d = blend_premultiplied(base.copy(), bx, by, *fill, size=(bh + 1, bw + 1))
+    print(f"  max |difference| arrow {int(np.abs(a.astype(np.int16) - b).max())}, "
+          f"banner {int(np.abs(c.astype(np.int16) - d).max())}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+AR camera startup: per-visit probing vs CameraManager
+
+Fake captures stand in for cv2.VideoCapture with configurable open
+costs (a failing device/backend still costs time). Reports time from
+entering /ar to an open capture for the old probe loop, for a cold
+acquire after the app-start probe, and for re-entry within the grace
+period.
+
+    python benchmarks/bench_camera.py [--open-ms 600] [--fail-ms 300]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import cv2
+
+ARAPP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ARAPP_DIR)
+
+from src.ar_navigation.camera_manager import PROBE_ORDER, CameraManager
+
+
+class FakeCapture:
+    # Only index 2 without DirectShow works, the worst case of the old loop
+    WORKING = (2, cv2.CAP_ANY)
+
+    def __init__(self, index, backend=cv2.CAP_ANY, open_s=0.6, fail_s=0.3):
+        self.ok = (index, backend) == self.WORKING
+        time.sleep(open_s if self.ok else fail_s)
+
+    def isOpened(self):
+        return self.ok
+
+    def read(self):
+        return self.ok, None
+
+    def release(self):
+        pass
+
+
+def old_probe(open_fn):
+    # The loop generate_frames ran on every visit
+    cap = None
+    for camera_index in [1, 2]:
+        cap = open_fn(camera_index, cv2.CAP_DSHOW)
+        if not cap.isOpened():
+            cap = open_fn(camera_index)
+        if cap.isOpened():
+            ret, _ = cap.read()
+            if ret:
+                break
+            cap.release()
+            cap = None
+    return cap
+
+
+def _timed(fn):
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--open-ms", type=float, default=600.0)
+    parser.add_argument("--fail-ms", type=float, default=300.0)
+    args = parser.parse_args()
+
+    def open_fn(index, backend=cv2.CAP_ANY):
+        return FakeCapture(index, backend, args.open_ms / 1e3, args.fail_ms / 1e3)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        camera_file = os.path.join(tmp, "camera.json")
+        old = _timed(lambda: old_probe(open_fn))
+
+        manager = CameraManager(camera_file, PROBE_ORDER, grace_s=5.0, open_fn=open_fn)
+        probe = _timed(lambda: (manager.probe_async(), manager._probed.wait()))
+        cap = None
+
+        def enter():
+            nonlocal cap
+            cap = manager.acquire()
+
+        cold = _timed(enter)
+        manager.release(cap)
+        warm = _timed(enter)
+        manager.close()
+
+        # Next app start: the saved choice is tried first
+        restarted = CameraManager(camera_file, PROBE_ORDER, open_fn=open_fn)
+        reprobe = _timed(lambda: (restarted.probe_async(), restarted._probed.wait()))
+
+    print(f"open {args.open_ms:.0f} ms, failed open {args.fail_ms:.0f} ms, camera at {FakeCapture.WORKING}")
+    print(f"  old per-visit probe            {old * 1e3:7.1f} ms on every /ar visit")
+    print(f"  app-start probe (background)   {probe * 1e3:7.1f} ms, first launch")
+    print(f"  app-start probe, saved device  {reprobe * 1e3:7.1f} ms, later launches")
+    print(f"  /ar cold acquire               {cold * 1e3:7.1f} ms")
+    print(f"  /ar re-entry within grace      {warm * 1e3:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
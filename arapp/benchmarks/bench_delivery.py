@@ -0,0 +1,112 @@
+"""
+FrameDelivery against a fake slow page
+
+Producers submit ~50 KB base64 frames faster than a fake image control
+can update (update() sleeps). Compares a naive unbounded send queue with
+FrameDelivery: peak traced memory, frames shown vs dropped, and how stale
+the shown frame is. FrameDelivery's memory must stay flat however long
+it runs.
+
+    python benchmarks/bench_delivery.py [--seconds 3] [--update-ms 50]
+        [--producers 2] [--fps 30]
+"""
+import argparse
+import os
+import queue
+import sys
+import threading
+import time
+import tracemalloc
+
+ARAPP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ARAPP_DIR)
+
+from src.ar_navigation.delivery import FrameDelivery
+
+
+class SlowImage:
+    """Stands in for ft.Image on a page whose update() takes update_s"""
+
+    def __init__(self, update_s):
+        self.update_s = update_s
+        self.src_base64 = None
+        self.ages = []
+
+    def update(self):
+        time.sleep(self.update_s)
+        made_at = float(self.src_base64[:20])
+        self.ages.append(time.perf_counter() - made_at)
+
+
+def _frame(size=50 * 1024):
+    # Timestamp prefix so the fake page can tell how old a shown frame is
+    return f"{time.perf_counter():<20.6f}" + "A" * size
+
+
+class NaiveQueue:
+    """Every frame queued for one sender thread"""
+
+    def __init__(self, control):
+        self.control = control
+        self.q = queue.Queue()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def submit(self, b64):
+        self.q.put(b64)
+
+    def _run(self):
+        while True:
+            b64 = self.q.get()
+            if b64 is None:
+                return
+            self.control.src_base64 = b64
+            self.control.update()
+
+
+def _run(make_sink, args):
+    control = SlowImage(args.update_ms / 1e3)
+    sink = make_sink(control)
+    stop = threading.Event()
+    submitted = [0]
+
+    def produce():
+        while not stop.is_set():
+            sink.submit(_frame())
+            submitted[0] += 1
+            time.sleep(1 / args.fps)
+
+    tracemalloc.start()
+    threads = [threading.Thread(target=produce) for _ in range(args.producers)]
+    for t in threads:
+        t.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    ages = sorted(control.ages)
+    return submitted[0], len(ages), peak, ages[len(ages) // 2] if ages else 0.0, sink
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--update-ms", type=float, default=50.0)
+    parser.add_argument("--producers", type=int, default=2)
+    parser.add_argument("--fps", type=float, default=30.0)
+    args = parser.parse_args()
+
+    print(f"{args.producers} producers x {args.fps:.0f} fps, update() {args.update_ms:.0f} ms, {args.seconds:.0f} s")
+    submitted, shown, peak, age, sink = _run(NaiveQueue, args)
+    backlog = sink.q.qsize()
+    sink.q.put(None)
+    print(f"  naive queue     {submitted} submitted, {shown} shown, backlog {backlog}, "
+          f"peak {peak / 1e6:6.2f} MB, median shown-frame age {age * 1e3:7.1f} ms")
+    submitted, shown, peak, age, sink = _run(FrameDelivery, args)
+    print(f"  FrameDelivery   {submitted} submitted, {shown} shown, dropped {sink.dropped}, "
+          f"peak {peak / 1e6:6.2f} MB, median shown-frame age {age * 1e3:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Per-frame allocations in the AR loop, with and without the FramePool
+
+Runs capture (into a recycled buffer), compose (banner + arrow) and
+encode one frame at a time under tracemalloc, the way the pipeline
+stages do, and reports the transient peak per frame and net growth over
+the run. The encoded payload itself (JPEG, base64 string) has to be a
+new object each frame, since the UI keeps it; it is reported separately.
+
+    python benchmarks/bench_frame_buffers.py [--frames 300]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tracemalloc
+
+import cv2
+import numpy as np
+
+ARAPP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ARAPP_DIR)
+
+from src.ar_navigation.ar_camera import _arrow_img, _encode_frame_to_base64
+from src.ar_navigation.arrow_atlas import ArrowAtlas
+from src.ar_navigation.banner import BannerRenderer
+from src.ar_navigation.pipeline import FramePool
+
+
+class FakeCamera:
+    """cv2.VideoCapture.read semantics: fills image if it fits, else allocates"""
+
+    def __init__(self):
+        noise = np.random.default_rng(0).integers(0, 256, (480, 640, 3), dtype=np.uint8)
+        self.scene = cv2.GaussianBlur(noise, (0, 0), 2)
+
+    def read(self, image=None):
+        if image is None or image.shape != self.scene.shape:
+            image = np.empty_like(self.scene)
+        np.copyto(image, self.scene)
+        return True, image
+
+
+def _run(frames, use_pool):
+    camera = FakeCamera()
+    atlas, banner = ArrowAtlas(_arrow_img), BannerRenderer()
+    pool = FramePool() if use_pool else None
+
+    def one_frame(i):
+        slot, buf = pool.acquire() if pool else (None, None)
+        _, frame = camera.read(image=buf)
+        banner.draw(frame, f"Destination: {200 - i // 20} m")
+        # A 40-pose sweep, so the atlas is fully warm and never evicts
+        frame = atlas.draw(frame, (i % 40) * atlas.angle_step, 0.5)
+        payload = _encode_frame_to_base64(frame)
+        if pool:
+            pool.release(slot, frame)
+        return payload
+
+    # Warm up: atlas sprites, banner strings, scratch buffers, pool slots
+    for i in range(120):
+        one_frame(i)
+
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    peaks, payloads = [], []
+    for i in range(frames):
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        payload = one_frame(i % 120)
+        peaks.append(tracemalloc.get_traced_memory()[1] - before)
+        payloads.append(len(payload))
+        del payload
+    growth = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    return statistics.median(peaks), statistics.median(payloads), growth, pool
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=300)
+    args = parser.parse_args()
+
+    print(f"640x480, {args.frames} frames after warm-up")
+    for name, use_pool in (("fresh arrays", False), ("FramePool", True)):
+        peak, payload, growth, pool = _run(args.frames, use_pool)
+        extra = f", pool {pool.stats}" if pool else ""
+        print(f"  {name:<13} transient {peak / 1024:7.1f} KB/frame (base64 payload {payload / 1024:5.1f} KB), "
+              f"net growth {growth / 1024:6.1f} KB{extra}")
+
+
+if __name__ == "__main__":
+    main()
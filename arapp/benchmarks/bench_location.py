@@ -0,0 +1,72 @@
+"""
+Location reads in the frame loop: per-frame geolocator call vs LocationService
+
+A fake geolocator blocks for a platform round trip on every call. The
+old loop called it once per frame; LocationService polls it on its own
+thread and the loop reads the latest-fix slot. A ReplayLocationProvider
+trace stands in for the walk. Reports cost per read, the frame rate the
+loop could reach, and how old the fix it saw was.
+
+    python benchmarks/bench_location.py [--roundtrip-ms 25] [--frames 300]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ARAPP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ARAPP_DIR)
+
+from src.ar_navigation.location import LocationService, ReplayLocationProvider
+
+
+def _trace(seconds=120):
+    # 1 Hz fixes walking north-east at ~1.4 m/s
+    return [(t, 13.6210 + t * 9e-6, 123.1940 + t * 9e-6, 5.0) for t in range(seconds)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--roundtrip-ms", type=float, default=25.0)
+    parser.add_argument("--frames", type=int, default=300)
+    args = parser.parse_args()
+
+    replay = ReplayLocationProvider(_trace())
+
+    def geolocator():
+        time.sleep(args.roundtrip_ms / 1e3)
+        return replay.read()
+
+    t0 = time.perf_counter()
+    for _ in range(args.frames):
+        geolocator()
+    blocking = (time.perf_counter() - t0) / args.frames
+
+    service = LocationService(geolocator, interval_s=1.0).start()
+    while service.latest is None:
+        time.sleep(0.01)
+    ages = []
+    t0 = time.perf_counter()
+    for _ in range(args.frames):
+        service.position()
+        ages.append(service.latest.age_s)
+        time.sleep(1 / 30)  # the rest of the frame
+    loop_s = time.perf_counter() - t0
+    service.stop()
+
+    n = 100000
+    t0 = time.perf_counter()
+    for _ in range(n):
+        service.position()
+    slot = (time.perf_counter() - t0) / n
+
+    print(f"geolocator round trip {args.roundtrip_ms:.0f} ms, {args.frames} frames")
+    print(f"  per-frame geolocator call   {blocking * 1e3:9.3f} ms/read  -> at most {1 / blocking:5.1f} fps from reads alone")
+    print(f"  LocationService slot        {slot * 1e9:9.0f} ns/read")
+    print(f"  fix age seen by the loop    p50 {statistics.median(ages) * 1e3:5.0f} ms, max {max(ages) * 1e3:5.0f} ms "
+          f"({service.stats['fixes']} fixes over {loop_s:.1f} s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+AR frame loop: serial capture/compose/encode/callback vs FramePipeline
+
+A fake 30 fps camera and a fake UI callback (fixed delay standing in for
+page.update) drive the real overlay and encode code. Reports delivered
+FPS, capture-to-delivery latency and per-stage averages.
+
+    python benchmarks/bench_pipeline.py [--seconds 5] [--callback-ms 15]
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+import numpy as np
+
+ARAPP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ARAPP_DIR)
+
+from src.ar_navigation.ar_camera import _arrow_img, _encode_frame_to_base64
+from src.ar_navigation.arrow_atlas import ArrowAtlas
+from src.ar_navigation.banner import BannerRenderer
+from src.ar_navigation.pipeline import FramePipeline
+
+
+class FakeCamera:
+    """Blocks like cap.read() until the next 1/fps tick"""
+
+    def __init__(self, fps=30):
+        self.period = 1.0 / fps
+        self.next_at = time.perf_counter()
+        self.base = np.random.default_rng(0).integers(0, 256, (480, 640, 3), dtype=np.uint8)
+
+    def read(self):
+        delay = self.next_at - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        self.next_at = max(self.next_at + self.period, time.perf_counter())
+        return self.base.copy()
+
+
+def _make_compose():
+    atlas = ArrowAtlas(_arrow_img)
+    banner = BannerRenderer()
+    state = {"i": 0}
+
+    def compose(frame):
+        i = state["i"] = state["i"] + 1
+        banner.draw(frame, f"Destination: {200 - i // 20} m")
+        return atlas.draw(frame, (i * 0.7) % 360, 0.5)
+
+    return compose
+
+
+def run_serial(seconds, callback_s):
+    # The loop generate_frames used to run, including its fixed 30 ms sleep
+    camera, compose = FakeCamera(), _make_compose()
+    latencies = []
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        frame = camera.read()
+        t0 = time.perf_counter()
+        _encode_frame_to_base64(compose(frame))
+        time.sleep(callback_s)
+        latencies.append(time.perf_counter() - t0)
+        time.sleep(0.03)
+    return len(latencies) / seconds, latencies
+
+
+def run_pipeline(seconds, callback_s):
+    camera, compose = FakeCamera(), _make_compose()
+    stop = threading.Event()
+
+    def deliver(payload):
+        time.sleep(callback_s)
+
+    pipeline = FramePipeline(camera.read, compose, _encode_frame_to_base64, deliver, stop)
+    pipeline.start()
+    time.sleep(seconds)
+    stop.set()
+    pipeline.join()
+    snapshot = pipeline.timings.snapshot()
+    return pipeline.delivered / seconds, snapshot, pipeline.dropped
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--callback-ms", type=float, default=15.0)
+    args = parser.parse_args()
+    callback_s = args.callback_ms / 1e3
+
+    fps, latencies = run_serial(args.seconds, callback_s)
+    print(f"camera 30 fps, callback {args.callback_ms:.0f} ms, {args.seconds:.0f} s")
+    print(f"  serial loop     {fps:5.1f} fps   compose..callback p50 "
+          f"{statistics.median(latencies) * 1e3:6.1f} ms (+30 ms sleep)")
+
+    fps, snapshot, dropped = run_pipeline(args.seconds, callback_s)
+    print(f"  FramePipeline   {fps:5.1f} fps   capture..callback avg {snapshot['latency']['avg_ms']:6.1f} ms")
+    for stage in FramePipeline.STAGES:
+        entry = snapshot.get(stage)
+        if entry:
+            print(f"    {stage:<8} avg {entry['avg_ms']:6.2f} ms over {entry['count']} frames")
+    print(f"    dropped {dropped}")
+
+
+if __name__ == "__main__":
+    main()
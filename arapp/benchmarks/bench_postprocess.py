@@ -0,0 +1,65 @@
+"""
+Route post-processing: list-comprehension pipeline vs NumPy in metres
+
+Runs both on a synthetic 5,000-point walking polyline.
+
+    python benchmarks/bench_postprocess.py [--points 5000] [--runs 200]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+import numpy as np
+from simplification.cutil import simplify_coords
+
+ARAPP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ARAPP_DIR)
+
+from src.ar_navigation.polyline import postprocess_route
+
+
+def _synthetic_route(n, seed=7):
+    # A wandering ~1 m-step walk around campus, as (lon, lat) like ORS decodes
+    rng = np.random.default_rng(seed)
+    heading = np.cumsum(rng.normal(0, 0.15, n))
+    step_deg = 1.0 / 111_320
+    lat = 13.4056 + np.cumsum(np.cos(heading)) * step_deg
+    lon = 123.3760 + np.cumsum(np.sin(heading)) * step_deg
+    return np.column_stack([lon, lat]).tolist()
+
+
+def legacy_pipeline(lonlat_coords, simplify_tol=0.00005):
+    # get_route before the NumPy rewrite
+    full_coords = [(c[1], c[0]) for c in lonlat_coords]
+    lonlat = [(c[1], c[0]) for c in full_coords]
+    simplified_lonlat = simplify_coords(lonlat, simplify_tol)
+    return [(c[1], c[0]) for c in simplified_lonlat]
+
+
+def numpy_pipeline(lonlat_coords, simplify_tol_m=5.0, resample_m=None):
+    latlon = np.asarray(lonlat_coords, dtype=np.float64)[:, ::-1]
+    return postprocess_route(latlon, simplify_tol_m, resample_m)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, default=5000)
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+
+    coords = _synthetic_route(args.points)
+    cases = {
+        "legacy lists (deg tol)": lambda: legacy_pipeline(coords),
+        "numpy (5 m tol)": lambda: numpy_pipeline(coords),
+        "numpy (5 m tol, 8 m resample)": lambda: numpy_pipeline(coords, resample_m=8.0),
+    }
+
+    print(f"{args.points}-point polyline, best of 5 x {args.runs} runs")
+    for name, fn in cases.items():
+        best = min(timeit.repeat(fn, number=args.runs, repeat=5)) / args.runs
+        print(f"  {name:<32} {best * 1e3:8.3f} ms/route   -> {len(fn())} points")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Cost of AR frame instrumentation: StageProfiler on, off, and its HUD
+
+A frame records ten stages (capture, four laps inside compose, the HUD
+lap, compose, encode, deliver, latency). This times that per-frame
+bookkeeping with a disabled profiler, an enabled one and the old
+StageTimings, then the on-demand percentiles() and the HUD blend
+(cached, and re-rendered) on a 640x480 frame.
+
+    python benchmarks/bench_profiler.py [--frames 20000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ARAPP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ARAPP_DIR)
+
+from src.ar_navigation.pipeline import StageTimings
+from src.ar_navigation.profiler import StageProfiler
+
+
+def _frame_bookkeeping(timings, frames):
+    lap = getattr(timings, "lap", lambda stage, since: since)
+    started = time.perf_counter()
+    for _ in range(frames):
+        timings.record("capture", 0.0003)
+        mark = time.perf_counter()
+        mark = lap("pose", mark)
+        mark = lap("navigation", mark)
+        mark = lap("banner", mark)
+        lap("arrow", mark)
+        lap("hud", mark)
+        timings.record("compose", 0.009)
+        timings.record("encode", 0.0014)
+        timings.record("deliver", 0.00001)
+        timings.record("latency", 0.011)
+    return (time.perf_counter() - started) / frames * 1e6
+
+
+def _time(fn, n):
+    started = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - started) / n * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"per-frame bookkeeping over {args.frames} frames (10 stages)")
+    print(f"  StageProfiler disabled   {_frame_bookkeeping(StageProfiler(enabled=False), args.frames):7.2f} us")
+    print(f"  StageProfiler enabled    {_frame_bookkeeping(StageProfiler(), args.frames):7.2f} us")
+    print(f"  StageTimings (EMA only)  {_frame_bookkeeping(StageTimings(), args.frames):7.2f} us")
+
+    profiler = StageProfiler()
+    _frame_bookkeeping(profiler, 2000)
+    frame = np.full((480, 640, 3), 90, dtype=np.uint8)
+    print("on demand")
+    print(f"  percentiles()            {_time(profiler.percentiles, 200):7.1f} us")
+    profiler.draw_hud(frame)
+    print(f"  HUD blend (cached)       {_time(lambda: profiler.draw_hud(frame), 500):7.1f} us")
+    profiler.refresh_s = 0.0
+    print(f"  HUD re-render + blend    {_time(lambda: profiler.draw_hud(frame), 200):7.1f} us")
+
+
+if __name__ == "__main__":
+    main()
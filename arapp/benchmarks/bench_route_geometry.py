@@ -0,0 +1,94 @@
+"""
+Distance to go: per-call Python loop vs RouteGeometry built once
+
+The old compute_route_distance walked the route in Python every call,
+so "metres left from here" meant a full loop per question. RouteGeometry
+computes segment lengths, cumulative distances and bearings once in
+NumPy; after projecting a position onto the route, remaining metres and
+ETA are array lookups. Reports build cost, cost per query (from a known
+segment, and with a full projection), and agreement with the loop.
+
+    python benchmarks/bench_route_geometry.py [--points 400] [--queries 5000]
+"""
+import argparse
+import os
+import sys
+import time
+from math import asin, cos, radians, sin, sqrt
+
+import numpy as np
+
+ARAPP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ARAPP_DIR)
+
+from src.utils.route_utils import RouteGeometry, compute_route_distance
+
+
+def legacy_compute_route_distance(route_points):
+    # The per-call loop compute_route_distance used to run
+    def haversine_m(a_lat, a_lon, b_lat, b_lon):
+        dlat = radians(b_lat - a_lat)
+        dlon = radians(b_lon - a_lon)
+        a = sin(dlat / 2) ** 2 + cos(radians(a_lat)) * cos(radians(b_lat)) * sin(dlon / 2) ** 2
+        return 6371000 * 2 * asin(sqrt(a))
+
+    cumulative = [0.0]
+    total = 0.0
+    for i in range(1, len(route_points)):
+        total += haversine_m(route_points[i - 1][0], route_points[i - 1][1], route_points[i][0], route_points[i][1])
+        cumulative.append(total)
+    return total, cumulative
+
+
+def _route(points, rng):
+    # A meandering walk with ~8 m spacing, like a resampled AR route
+    heading = np.cumsum(rng.normal(0, 0.3, points))
+    step = 8.0 / 111320.0
+    lat = 13.6210 + np.cumsum(step * np.cos(heading))
+    lon = 123.1940 + np.cumsum(step * np.sin(heading))
+    return list(zip(lat.tolist(), lon.tolist()))
+
+
+def _per_call_us(fn, n):
+    started = time.perf_counter()
+    for i in range(n):
+        fn(i)
+    return (time.perf_counter() - started) / n * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, default=400)
+    parser.add_argument("--queries", type=int, default=5000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    route = _route(args.points, rng)
+    segments = rng.integers(0, args.points - 1, args.queries).tolist()
+    ts = rng.random(args.queries).tolist()
+
+    total, cumulative = legacy_compute_route_distance(route)
+    new_total, new_cumulative = compute_route_distance(route)
+    print(f"{args.points} points, {total:.1f} m; "
+          f"max cumulative difference {max(abs(a - b) for a, b in zip(cumulative, new_cumulative)):.2e} m")
+
+    def legacy_remaining(i):
+        _, cum = legacy_compute_route_distance(route)
+        seg, t = segments[i], ts[i]
+        return cum[-1] - (cum[seg] + t * (cum[seg + 1] - cum[seg]))
+
+    geometry = RouteGeometry(route)
+    print(f"{'build RouteGeometry':<34} {_per_call_us(lambda i: RouteGeometry(route), 200):9.1f} us")
+    print(f"{'remaining m, Python loop per call':<34} {_per_call_us(legacy_remaining, args.queries // 10):9.1f} us")
+    print(f"{'remaining m + ETA, RouteGeometry':<34} "
+          f"{_per_call_us(lambda i: (geometry.remaining_m(segments[i], ts[i]), geometry.eta_s(segments[i], ts[i])), args.queries):9.2f} us")
+
+    fixes = [route[s] for s in segments]
+    print(f"{'project + remaining + ETA':<34} "
+          f"{_per_call_us(lambda i: geometry.distance_to_go(*fixes[i]), args.queries):9.1f} us")
+    err = max(abs(legacy_remaining(i) - geometry.remaining_m(segments[i], ts[i])) for i in range(100))
+    print(f"max remaining-distance difference vs loop: {err:.2e} m")
+
+
+if __name__ == "__main__":
+    main()
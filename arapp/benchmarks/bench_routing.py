@@ -0,0 +1,103 @@
+"""
+Latency of the on-device campus router vs the ORS path
+
+ORS is replaced by a local stub that answers with a pre-encoded polyline
+after a configurable delay, so the comparison runs without network.
+
+    python benchmarks/bench_routing.py [--ors-latency-ms 0] [--runs 200]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ARAPP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ARAPP_DIR)
+os.environ.setdefault("ORS_KEY", "benchmark-stub")
+
+import asyncio
+
+from src.ar_navigation import routing
+from src.ar_navigation.async_runtime import submit
+from src.ar_navigation.route_cache import RouteCache
+from src.ar_navigation.local_router import get_graph, get_local_route
+from src.ar_navigation.route_table import encode_polyline, lookup_route
+
+
+class StubORSClient:
+    def __init__(self, latency_s):
+        self.latency_s = latency_s
+
+    async def directions(self, coords, profile="foot-walking", timeout_s=None):
+        (s_lon, s_lat), (e_lon, e_lat) = coords
+        # A plausible 40-vertex polyline between the two points
+        points = [
+            (s_lat + (e_lat - s_lat) * i / 39, s_lon + (e_lon - s_lon) * i / 39)
+            for i in range(40)
+        ]
+        if self.latency_s:
+            await asyncio.sleep(self.latency_s)
+        return {"routes": [{"geometry": encode_polyline(points, precision=5)}]}
+
+
+def _percentiles(samples_ms):
+    ordered = sorted(samples_ms)
+    p50 = statistics.median(ordered)
+    p99 = ordered[min(len(ordered) - 1, int(round(0.99 * (len(ordered) - 1))))]
+    return p50, p99
+
+
+def _time_calls(func, pairs, runs):
+    samples = []
+    for i in range(runs):
+        start, end = pairs[i % len(pairs)]
+        t0 = time.perf_counter()
+        func(start, end)
+        samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--ors-latency-ms", type=float, default=0.0,
+                        help="simulated network round trip for the ORS stub")
+    args = parser.parse_args()
+
+    with open(os.path.join(ARAPP_DIR, "src", "places_cache.json"), "r", encoding="utf-8") as f:
+        places = list(json.load(f).values())
+    pairs = [(a, b) for a in places for b in places if a != b]
+
+    t0 = time.perf_counter()
+    get_graph()
+    print(f"graph open: {(time.perf_counter() - t0) * 1000:.1f} ms (one-off)")
+
+    routing.ors = StubORSClient(args.ors_latency_ms / 1000.0)
+    routing.route_cache = RouteCache(cache_dir=tempfile.mkdtemp(prefix="route_cache_"))
+
+    def ors_path(start, end):
+        full = submit(routing._get_ors_route(start, end)).result()
+        return routing.postprocess_route(full, routing.SIMPLIFY_TOL_M)
+
+    results = {
+        "get_route (uncached)": _time_calls(
+            lambda s, e: submit(routing._compute_route(s, e, routing.SIMPLIFY_TOL_M)).result(), pairs, args.runs),
+        # A handful of popular trips, as in a real session
+        "get_route (cached)": _time_calls(routing.get_route, pairs[:16], args.runs),
+        "route table lookup": _time_calls(lookup_route, pairs, args.runs),
+        "local A* (no simplify)": _time_calls(get_local_route, pairs, args.runs),
+        "ORS stub": _time_calls(ors_path, pairs, args.runs),
+    }
+
+    print(f"{args.runs} routes, ORS stub latency {args.ors_latency_ms:.0f} ms")
+    for name, samples in results.items():
+        p50, p99 = _percentiles(samples)
+        print(f"  {name:<24} p50 {p50:8.3f} ms   p99 {p99:8.3f} ms")
+    print(f"route cache: {routing.route_cache.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Waypoint following: 5 m waypoint radius vs RouteTracker projection
+
+Walks a simulated user along a campus route with GPS noise, cutting
+one corner, and compares the old "advance when within 5 m of the next
+waypoint" logic with RouteTracker. Reports time per update, how often
+the arrow pointed backwards (more than 90 degrees off the walking
+direction), the banner distance error against the true distance left,
+and whether arrival was detected.
+
+    python benchmarks/bench_tracker.py [--noise-m 5] [--seed 0]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ARAPP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ARAPP_DIR)
+
+from src.ar_navigation.ar_camera import haversine_m
+from src.ar_navigation.bearing import bearing_to_target
+from src.ar_navigation.polyline import from_local_xy, postprocess_route, to_local_xy
+from src.ar_navigation.route_table import load_places, lookup_route
+from src.ar_navigation.route_tracker import RouteTracker
+
+
+def _walk(route, noise_m, rng, speed_mps=1.4, fps=30):
+    """Noisy fixes at frame rate, true remaining metres and heading per frame"""
+    xy, origin = to_local_xy(route)
+    seg = np.hypot(*np.diff(xy, axis=0).T)
+    cum = np.concatenate(([0.0], np.cumsum(seg)))
+    stations = np.arange(0.0, cum[-1], speed_mps / fps)
+    true_xy = np.column_stack([np.interp(stations, cum, xy[:, 0]), np.interp(stations, cum, xy[:, 1])])
+    # Cut the corner around the middle vertex: straight line across 30 m of path
+    mid = cum[len(cum) // 2]
+    cut = (stations > mid - 15) & (stations < mid + 15)
+    if cut.any():
+        i0, i1 = np.flatnonzero(cut)[[0, -1]]
+        f = np.linspace(0, 1, i1 - i0 + 1)[:, None]
+        true_xy[i0:i1 + 1] = true_xy[i0] * (1 - f) + true_xy[i1] * f
+    heading = np.degrees(np.arctan2(*np.gradient(true_xy, axis=0).T)) % 360
+    # GPS noise changes about once a second, like real fixes
+    noise = np.repeat(rng.normal(0, noise_m, (len(stations) // fps + 1, 2)), fps, axis=0)[:len(stations)]
+    fixes = from_local_xy(true_xy + noise, origin)
+    return fixes.tolist(), cum[-1] - stations, heading
+
+
+def old_logic(route):
+    state = {"i": 0}
+
+    def update(lat, lon):
+        i = state["i"]
+        tx, ty = route[i]
+        dist = haversine_m(lat, lon, tx, ty)
+        if dist < 5.0 and i < len(route) - 1:
+            i = state["i"] = i + 1
+            tx, ty = route[i]
+            dist = haversine_m(lat, lon, tx, ty)
+        return (tx, ty), dist, False
+
+    return update
+
+
+def tracker_logic(route):
+    tracker = RouteTracker(route)
+
+    def update(lat, lon):
+        pos = tracker.update(lat, lon)
+        return pos.target, pos.remaining_m, pos.arrived
+
+    return update
+
+
+def _evaluate(update, fixes, true_remaining, heading):
+    backwards, errors, arrived_at = 0, [], None
+    t0 = time.perf_counter()
+    for k, (lat, lon) in enumerate(fixes):
+        (tx, ty), shown_m, arrived = update(lat, lon)
+        if arrived and arrived_at is None:
+            arrived_at = true_remaining[k]
+        diff = abs((bearing_to_target(lat, lon, tx, ty) - heading[k] + 180) % 360 - 180)
+        backwards += diff > 90
+        errors.append(abs(shown_m - true_remaining[k]))
+    per_update = (time.perf_counter() - t0) / len(fixes)
+    return per_update, backwards, float(np.median(errors)), arrived_at
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--noise-m", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    places = load_places()
+    names = list(places)
+    full = lookup_route(places[names[0]], places[names[-1]])
+    route = postprocess_route(full, simplify_tol_m=5.0, resample_m=8.0)
+    fixes, true_remaining, heading = _walk(route, args.noise_m, np.random.default_rng(args.seed))
+
+    print(f"{names[0]} -> {names[-1]}: {len(route)} waypoints, {true_remaining[0]:.0f} m, "
+          f"{len(fixes)} frames, GPS noise {args.noise_m:g} m, one corner cut")
+    for name, make in (("5 m waypoint radius", old_logic), ("RouteTracker", tracker_logic)):
+        per_update, backwards, err, arrived_at = _evaluate(make(route), fixes, true_remaining, heading)
+        arrival = f"arrived with {arrived_at:.1f} m left" if arrived_at is not None else "never arrived"
+        print(f"  {name:<20} {per_update * 1e6:6.1f} us/update   arrow backwards {backwards:5d} frames   "
+              f"banner error p50 {err:6.1f} m   {arrival}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+AR frame transport: base64 + page.update vs the local MJPEG FrameServer
+
+Ships the same pre-encoded JPEG frames both ways and reports bytes per
+frame and the sending side's CPU time per frame on top of the JPEG
+encode, which both paths share. The page.update cost is
+approximated by serialising the control patch Flet sends for a changed
+src_base64 (JSON); the real diff also walks the control tree, so this
+understates the base64 path. The MJPEG client runs in a separate
+process, so its CPU is not counted.
+
+    python benchmarks/bench_transport.py [--frames 300]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+import urllib.request
+
+import cv2
+import numpy as np
+
+ARAPP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ARAPP_DIR)
+
+import base64
+
+from src.ar_navigation.ar_camera import _arrow_img, _encode_frame_to_jpeg
+from src.ar_navigation.arrow_atlas import ArrowAtlas
+from src.ar_navigation.frame_server import FrameServer
+
+
+def _read_stream(url, frames, done):
+    received = 0
+    with urllib.request.urlopen(url) as stream:
+        while received < frames:
+            line = stream.readline()
+            if line.startswith(b"Content-Length:"):
+                length = int(line.split(b":")[1])
+                stream.readline()
+                stream.read(length)
+                received += 1
+    done.set()
+
+
+def _frames(count):
+    rng = np.random.default_rng(0)
+    scene = cv2.GaussianBlur(rng.integers(0, 256, (480, 640, 3), dtype=np.uint8), (0, 0), 2)
+    atlas = ArrowAtlas(_arrow_img)
+    out = []
+    for i in range(count):
+        frame = np.roll(scene, i * 3, axis=1)
+        out.append(atlas.draw(frame, i % 360, 0.5))
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=300)
+    args = parser.parse_args()
+    jpegs = [_encode_frame_to_jpeg(frame) for frame in _frames(args.frames)]
+
+    # base64 + a stand-in for the page.update patch
+    sizes = []
+    cpu0 = time.process_time()
+    for jpeg in jpegs:
+        b64 = base64.b64encode(jpeg).decode('utf-8')
+        patch = json.dumps([{"i": "_42", "p": {"src_base64": b64}}])
+        sizes.append(len(patch))
+    b64_cpu = (time.process_time() - cpu0) / len(jpegs)
+    b64_bytes = sum(sizes) / len(sizes)
+
+    # Raw JPEG through the MJPEG endpoint to an out-of-process client
+    server = FrameServer().start()
+    done = multiprocessing.Event()
+    client = multiprocessing.Process(target=_read_stream, args=(server.stream_url, args.frames, done))
+    client.start()
+    while server.stats["clients"] == 0:
+        time.sleep(0.01)
+
+    # Paced like a 60 fps camera so every frame is sent; sleeping costs no CPU
+    cpu0 = time.process_time()
+    for jpeg in jpegs:
+        server.publish(jpeg)
+        time.sleep(1 / 60)
+    done.wait(5)
+    mjpeg_cpu = (time.process_time() - cpu0) / len(jpegs)
+    client.join(5)
+    mjpeg_bytes = server.stats["bytes_sent"] / max(1, server.stats["sent"])
+    server.close()
+
+    print(f"640x480 JPEG q80, {args.frames} frames, CPU excludes the shared JPEG encode")
+    print(f"  base64 + page.update patch   {b64_bytes / 1024:6.1f} KB/frame   {b64_cpu * 1e3:6.2f} ms CPU/frame")
+    print(f"  MJPEG FrameServer            {mjpeg_bytes / 1024:6.1f} KB/frame   {mjpeg_cpu * 1e3:6.2f} ms CPU/frame")
+    print(f"  ({server.stats['sent']} frames streamed)")
+
+
+if __name__ == "__main__":
+    main()
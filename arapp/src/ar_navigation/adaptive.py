@@ -0,0 +1,130 @@
+"""Adaptive frame rate, resolution and JPEG quality for the AR stream"""
+import threading
+import time
+
+# (fps, (width, height), jpeg quality), best first; level 0 is the old fixed setup
+STREAM_LEVELS = (
+    (30, (640, 480), 80),
+    (30, (640, 480), 70),
+    (24, (640, 480), 65),
+    (24, (480, 360), 65),
+    (20, (480, 360), 55),
+    (15, (320, 240), 50),
+    (10, (320, 240), 45),
+)
+
+
+class AdaptiveController:
+    """
+    Keeps capture-to-display latency inside a budget by trading quality
+
+    observe() takes each delivered frame's end-to-end latency (capture
+    through frame_callback, which includes page.update) and how many
+    frames were dropped since the previous one. The pipeline drops old
+    frames rather than queueing them, so a slow UI shows up as drops as
+    much as latency; either one over its limit counts as pressure.
+
+    Pressure for degrade_after frames steps down a level. Stepping back up
+    needs latency under upgrade_ratio * budget and no drops for
+    upgrade_after frames, doubled each time that level has been left
+    under pressure soon after being entered. After any change it waits
+    cooldown_s so the new level's numbers drive the next decision.
+    """
+
+    def __init__(self, latency_budget_ms=120.0, levels=STREAM_LEVELS, start_level=0,
+                 max_drop_rate=0.2, degrade_after=10, upgrade_after=90, upgrade_ratio=0.6,
+                 cooldown_s=2.0, probation_s=15.0, smoothing=0.1):
+        self.latency_budget_ms = latency_budget_ms
+        self.levels = levels
+        self.level = start_level
+        self.max_drop_rate = max_drop_rate
+        self.degrade_after = degrade_after
+        self.upgrade_after = upgrade_after
+        self.upgrade_ratio = upgrade_ratio
+        self.cooldown_s = cooldown_s
+        self.probation_s = probation_s
+        self.smoothing = smoothing
+        self.latency_ms = None
+        self.drop_rate = 0.0
+        self._dropped_avg = 0.0
+        self.changes = 0
+        self._failed_upgrades = [0] * len(levels)
+        self._upgraded = False
+        self._over = 0
+        self._under = 0
+        self._changed_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def fps(self):
+        return self.levels[self.level][0]
+
+    @property
+    def resolution(self):
+        return self.levels[self.level][1]
+
+    @property
+    def jpeg_quality(self):
+        return self.levels[self.level][2]
+
+    @property
+    def settings(self):
+        """Current level as a dict, for the debug overlay"""
+        fps, (width, height), quality = self.levels[self.level]
+        return {
+            "level": self.level,
+            "fps": fps,
+            "width": width,
+            "height": height,
+            "jpeg_quality": quality,
+            "latency_ms": self.latency_ms,
+            "drop_rate": self.drop_rate,
+            "budget_ms": self.latency_budget_ms,
+        }
+
+    def observe(self, latency_s, dropped=0):
+        """
+        Feed one delivered frame's latency and the frames dropped before it
+
+        Returns:
+            bool: True if the level changed
+        """
+        ms = latency_s * 1e3
+        with self._lock:
+            if self.latency_ms is None:
+                self.latency_ms = ms
+            else:
+                self.latency_ms += self.smoothing * (ms - self.latency_ms)
+            # Share of captured frames that never reached the screen
+            self._dropped_avg += self.smoothing * (dropped - self._dropped_avg)
+            self.drop_rate = self._dropped_avg / (self._dropped_avg + 1.0)
+
+            if time.monotonic() - self._changed_at < self.cooldown_s:
+                return False
+
+            if self.latency_ms > self.latency_budget_ms or self.drop_rate > self.max_drop_rate:
+                self._over += 1
+                self._under = 0
+            elif self.latency_ms < self.latency_budget_ms * self.upgrade_ratio and self.drop_rate < 0.01:
+                self._under += 1
+                self._over = 0
+            else:
+                self._over = self._under = 0
+
+            if self._over >= self.degrade_after and self.level < len(self.levels) - 1:
+                if self._upgraded and time.monotonic() - self._changed_at < self.probation_s:
+                    self._failed_upgrades[self.level] += 1
+                return self._set_level(self.level + 1, upgraded=False)
+            if self.level > 0 and self._under >= self.upgrade_after << self._failed_upgrades[self.level - 1]:
+                return self._set_level(self.level - 1, upgraded=True)
+            return False
+
+    def _set_level(self, level, upgraded):
+        self.level = level
+        self._upgraded = upgraded
+        self.changes += 1
+        self._over = self._under = 0
+        self._changed_at = time.monotonic()
+        # Latency measured at the old level says little about the new one
+        self.latency_ms = None
+        return True
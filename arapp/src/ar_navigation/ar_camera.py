@@ -2,10 +2,20 @@
 import cv2
 import numpy as np
 import base64
-import time
 import os
+import time
 from math import sqrt, radians, sin, cos, asin
+from .adaptive import AdaptiveController
+from .arrow_atlas import ArrowAtlas
 from .bearing import bearing_to_target
+from .frame_source import CameraSource
+from .banner import BannerRenderer
+from .blend import blend_premultiplied, premultiply
+from .pipeline import FramePipeline, FramePool
+from .pose_filter import PoseFilter
+from .rerouter import Rerouter
+from .route_tracker import RouteTracker
+from .route_geometry import format_eta
 
 # --- FIX: Dynamic Path Finding ---
 # Current file is in: src/ar_navigation/ar_camera.py
@@ -32,15 +42,21 @@ if _arrow_img is None:
     pts = np.array([[50, 10], [10, 90], [90, 90]], np.int32)
     cv2.fillPoly(_arrow_img, [pts], (0, 0, 255, 255)) # Red color, Full Alpha
 
-def _encode_frame_to_base64(frame):
-    _, buf = cv2.imencode('.jpg', frame, [int(cv2.IMWRITE_JPEG_QUALITY), 80])
-    return base64.b64encode(buf).decode('utf-8')
+def _encode_frame_to_jpeg(frame, quality=80):
+    # The uint8 array imencode returns is bytes-like; no tobytes() copy
+    _, buf = cv2.imencode('.jpg', frame, [int(cv2.IMWRITE_JPEG_QUALITY), quality])
+    return buf
+
+def _encode_frame_to_base64(frame, quality=80):
+    return base64.b64encode(_encode_frame_to_jpeg(frame, quality)).decode('ascii')
 
 def _rotate_image(img, angle):
     h, w = img.shape[:2]
     M = cv2.getRotationMatrix2D((w//2, h//2), -angle, 1.0)
     return cv2.warpAffine(img, M, (w, h), borderMode=cv2.BORDER_TRANSPARENT)
 
+# Legacy per-frame path (rotate, resize and premultiply every call); the app
+# draws through ArrowAtlas now, this is only the benchmarks' reference
 def _overlay_perspective_arrow(frame, arrow_rgba, angle_deg, scale=1.0):
     # Rotate
     arrow_rot = _rotate_image(arrow_rgba, angle_deg)
@@ -73,30 +89,9 @@ def _overlay_perspective_arrow(frame, arrow_rgba, angle_deg, scale=1.0):
     if actual_w <= 0 or actual_h <= 0:
         return frame
 
-    # Crop the arrow to the part that fits
-    arrow_to_use = arrow_resized[:actual_h, :actual_w]
-
-    # Extract ROI from frame (guaranteed to be same size)
-    roi = frame[y:y+actual_h, x:x+actual_w]
-
-    # Alpha blending
-    if arrow_to_use.shape[2] == 4:
-        b, g, r, a = cv2.split(arrow_to_use)
-        arrow_rgb = cv2.merge((b, g, r))
-        mask = a.astype(float) / 255.0
-        mask = np.stack([mask, mask, mask], axis=-1)  # Shape: (H, W, 3)
-    else:
-        arrow_rgb = arrow_to_use.astype(float)
-        mask = np.ones_like(arrow_rgb)
-
-    # Ensure types
-    roi = roi.astype(float)
-    arrow_rgb = arrow_rgb.astype(float)
-
-    # Blend
-    blended = (roi * (1 - mask) + arrow_rgb * mask).astype(np.uint8)
-    frame[y:y+actual_h, x:x+actual_w] = blended
-    return frame
+    # Crop the arrow to the part that fits and blend (fixed-point, in place)
+    premul, inv_alpha = premultiply(arrow_resized[:actual_h, :actual_w])
+    return blend_premultiplied(frame, x, y, premul, inv_alpha)
 
 def haversine_m(a_lat, a_lon, b_lat, b_lon):
     R = 6371000
@@ -106,28 +101,43 @@ def haversine_m(a_lat, a_lon, b_lat, b_lon):
     c = 2*asin(min(1, sqrt(a)))
     return R*c
 
-def generate_frames(route_points, frame_callback, get_user_location_func, get_user_heading_func, stop_flag):
-    cap = None
-    # Try different camera indices (0 is usually back cam on phones, 1/2 on PC)
-    for camera_index in [1, 2]:
-        cap = cv2.VideoCapture(camera_index, cv2.CAP_DSHOW)
-        if not cap.isOpened():
-            cap = cv2.VideoCapture(camera_index)
-        
-        if cap.isOpened():
-            ret, _ = cap.read()
-            if ret:
-                break
-            cap.release()
-            cap = None
-            
-    if cap is None:
+def _no_lap(stage, since):
+    return since
+
+
+def generate_frames(route_points, frame_callback, get_user_location_func, get_user_heading_func, stop_flag,
+                    timings=None, controller=None, raw_jpeg=False, source=None, on_position=None,
+                    on_pipeline=None):
+    """
+    Stream AR frames to frame_callback until stop_flag is set
+
+    get_user_location_func returns (lat, lon), optionally followed by
+    accuracy_m and a time.monotonic() timestamp (LocationService.reading).
+
+    Capture, compose (navigation + overlays), JPEG/base64 encode and the
+    callback run as separate pipeline stages; pass a StageTimings as
+    timings to read per-stage costs while it runs, or a StageProfiler to
+    also time pose, navigation, banner and arrow inside compose (and
+    draw its HUD while profiler.hud is set). Frame rate, capture size
+    and JPEG quality follow controller (an AdaptiveController, created
+    here if not given). With raw_jpeg, frame_callback gets JPEG bytes
+    (e.g. FrameServer.publish) instead of a base64 string.
+
+    Frames come from source (a FrameSource; the device camera by
+    default). on_position, if given, is called from the compose stage
+    with each frame's TrackPosition, e.g. to report progress in a replay.
+    on_pipeline, if given, is called with the FramePipeline before it
+    starts, so the caller can read its delivered/dropped counts; frames
+    the UI was too slow for are dropped there, not in frame_callback.
+    """
+    if source is None:
+        source = CameraSource()
+    if not source.open():
         print("Error: Could not open any camera.")
         return
 
-    # Optimization: Lower resolution for speed
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+    if controller is None:
+        controller = AdaptiveController()
 
     # Prepare arrow image
     arrow_rgba = _arrow_img.copy()
@@ -136,102 +146,107 @@ def generate_frames(route_points, frame_callback, get_user_location_func, get_us
         alpha = np.full(b.shape, 255, dtype=np.uint8)
         arrow_rgba = cv2.merge([b,g,r,alpha])
 
-    waypoint_index = 0
+    # Rotated/scaled arrow poses are rendered once per 3 deg / 0.1 bucket, within
+    # the atlas's memory budget; the source only needs the largest size drawn (0.8
+    # at the tallest stream level, see overlay)
+    max_height = max(size[1] for _, size, _ in controller.levels)
+    arrow_atlas = ArrowAtlas(arrow_rgba, max_scale=0.8 * max_height / 480.0)
+    banner = BannerRenderer()
+
+    tracker = RouteTracker(route_points)
+    pose = PoseFilter()
     last_scale = 1.0
+    rerouter = Rerouter()
 
-    while not stop_flag.is_set():
-        ret, frame = cap.read()
-        if not ret:
-            time.sleep(0.02)
-            continue
+    def capture(buf):
+        width, height = controller.resolution
+        if source.size != (width, height):
+            source.set_size(width, height)
+        return source.read(buf)
 
-        user_lat, user_lon = get_user_location_func()
-        user_heading = get_user_heading_func() or 0.0
+    encode_fn = _encode_frame_to_jpeg if raw_jpeg else _encode_frame_to_base64
+
+    def encode(frame):
+        return encode_fn(frame, controller.jpeg_quality)
+
+    # Sub-stage timings inside compose when timings is a StageProfiler
+    lap = getattr(timings, "lap", _no_lap)
+
+    def overlay(frame):
+        # Runs on the single compose thread, which owns the navigation state
+        nonlocal route_points, tracker, last_scale
+
+        mark = time.perf_counter()
+        reading = get_user_location_func()
+        # Overlays are laid out for 480 px high frames; keep their share of smaller ones
+        ui_scale = frame.shape[0] / 480.0
 
         # --- VISUAL DEBUG: Check if GPS is the issue ---
-        if user_lat is None:
-            cv2.putText(frame, "Waiting for GPS...", (30, 50), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
-            b64 = _encode_frame_to_base64(frame)
-            frame_callback(b64)
-            time.sleep(0.1)
-            continue
-
-        if waypoint_index >= len(route_points):
-            cv2.putText(frame, "Arrived!", (30, 50), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-            b64 = _encode_frame_to_base64(frame)
-            frame_callback(b64)
-            time.sleep(0.1)
-            continue
-
-        # Navigation Logic
-        tx, ty = route_points[waypoint_index][0], route_points[waypoint_index][1]
-        dist = haversine_m(user_lat, user_lon, tx, ty)
-
-        if dist < 5.0 and waypoint_index < len(route_points)-1:
-            waypoint_index += 1
-            tx, ty = route_points[waypoint_index][0], route_points[waypoint_index][1]
-            dist = haversine_m(user_lat, user_lon, tx, ty)
+        if reading[0] is None:
+            cv2.putText(frame, "Waiting for GPS...", (round(30 * ui_scale), round(50 * ui_scale)),
+                       cv2.FONT_HERSHEY_SIMPLEX, ui_scale, (0, 0, 255), max(1, round(2 * ui_scale)))
+            return frame
+
+        # ~1 Hz noisy fixes in, a smooth pose for this frame out
+        pose.observe(*reading)
+        user_lat, user_lon = pose.position()
+        user_heading = pose.heading(get_user_heading_func())
+        mark = lap("pose", mark)
+
+        # Swap in a re-computed route once the background worker has one
+        new_route = rerouter.poll()
+        if new_route:
+            route_points = new_route
+            tracker = RouteTracker(route_points)
+
+        # Navigation Logic: project onto the route, aim a few metres ahead
+        pos = tracker.update(user_lat, user_lon)
+        if on_position is not None:
+            on_position(pos)
+        if pos.arrived:
+            cv2.putText(frame, "Arrived!", (round(30 * ui_scale), round(50 * ui_scale)),
+                       cv2.FONT_HERSHEY_SIMPLEX, ui_scale, (0, 255, 0), max(1, round(2 * ui_scale)))
+            return frame
+
+        tx, ty = pos.target
+
+        # Off-route check on the tracker's projection (re-routes off-thread)
+        rerouter.update(user_lat, user_lon, pos.off_route_m, route_points[-1])
 
         bearing = bearing_to_target(user_lat, user_lon, tx, ty)
         angle_to_draw = (bearing - user_heading + 360) % 360
 
-        # Smoother, smaller arrow: 0.3 (far) to 0.8 (very close)
-        scale = max(0.3, min(0.8, 0.8 - (dist / 70.0)))
+        # Smoother, smaller arrow: 0.3 (far from the next turn) to 0.8 (at it)
+        scale = max(0.3, min(0.8, 0.8 - (pos.to_vertex_m / 70.0)))
         last_scale = 0.9 * last_scale + 0.1 * scale
+        mark = lap("navigation", mark)
 
-        # --- NEW: Elegant Navy Blue Transparent Banner ---
-        banner_text = f"Destination: {int(dist)} m"
-        font = cv2.FONT_HERSHEY_SIMPLEX
-        font_scale = 0.65   # Clean, not too big
-        thickness = 1       # Thin stroke for elegance
+        # Navy blue (#002A7A) banner at 70% opacity with the walking distance
+        # and time left, sized to the frame; the sprite is only re-rendered when it changes
+        banner.draw(frame, f"Destination: {int(pos.remaining_m)} m ({format_eta(pos.eta_s)})")
+        mark = lap("banner", mark)
 
-        # Get text size
-        (text_w, text_h), baseline = cv2.getTextSize(banner_text, font, font_scale, thickness)
-        
-        # Add generous padding
-        pad_x, pad_y = 25, 15
-        banner_w = text_w + 2 * pad_x
-        banner_h = text_h + baseline + 2 * pad_y
-
-        # Position: top center
-        fh, fw = frame.shape[:2]
-        x0 = (fw - banner_w) // 2
-        y0 = 25
-
-        # Ensure on-screen
-        x0 = max(0, min(x0, fw - banner_w))
-        y0 = max(0, min(y0, fh - banner_h))
-
-        # Create overlay with deep navy blue (#002A7A → BGR: 122, 42, 0)
-        overlay = frame.copy()
-        alpha = 0.7  # 70% opacity — tweak as needed
-        cv2.rectangle(overlay, (x0, y0), (x0 + banner_w, y0 + banner_h), (122, 42, 0), -1)  # Navy blue
-
-        # Blend with original frame
-        cv2.addWeighted(overlay, alpha, frame, 1 - alpha, 0, frame)
-
-        # Draw smooth, anti-aliased soft white text
-        text_x = x0 + pad_x
-        text_y = y0 + pad_y + text_h
-        cv2.putText(
-            frame,
-            banner_text,
-            (text_x, text_y),
-            font,
-            font_scale,
-            (240, 240, 240),  # Soft white for contrast
-            thickness,
-            cv2.LINE_AA  # ← Smooth, no pixelation!
-        )
-
-        # Draw Arrow (unchanged)
-        frame = _overlay_perspective_arrow(frame, arrow_rgba, angle_to_draw, scale)  # or last_scale
-
-        b64 = _encode_frame_to_base64(frame)
-        frame_callback(b64)
-
-        time.sleep(0.03)
-
-    cap.release()
\ No newline at end of file
+        # Draw Arrow: atlas lookup plus blend, sized to the frame like the banner
+        frame = arrow_atlas.draw(frame, angle_to_draw, scale * ui_scale)  # or last_scale
+        lap("arrow", mark)
+        return frame
+
+    def compose(frame):
+        frame = overlay(frame)
+        if getattr(timings, "hud", False):
+            mark = time.perf_counter()
+            stream = controller.settings
+            timings.draw_hud(frame, f"{stream['width']}x{stream['height']} @{stream['fps']} fps "
+                                    f"q{stream['jpeg_quality']}")
+            lap("hud", mark)
+        return frame
+
+    # The controller paces capture; no fixed sleep between frames
+    pipeline = FramePipeline(capture, compose, encode, frame_callback, stop_flag,
+                             timings=timings, controller=controller, pool=FramePool())
+    if on_pipeline is not None:
+        on_pipeline(pipeline)
+    try:
+        pipeline.run()
+    finally:
+        source.close()
@@ -0,0 +1,206 @@
+"""Pre-rotated, pre-scaled arrow sprites for the AR overlay"""
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+from .blend import blend_premultiplied, premultiply
+
+
+class Sprite:
+    """
+    One premultiplied arrow pose, cropped to its visible pixels
+
+    premul is BGR already multiplied by alpha and inv_alpha is 255 - alpha,
+    as blend_premultiplied takes them; (dx, dy) is the crop's offset inside
+    the box_w x box_h square the uncropped arrow would occupy.
+    """
+
+    __slots__ = ("premul", "inv_alpha", "dx", "dy", "box_w", "box_h")
+
+    def __init__(self, premul, inv_alpha, dx, dy, box_w, box_h):
+        self.premul = premul
+        self.inv_alpha = inv_alpha
+        self.dx = dx
+        self.dy = dy
+        self.box_w = box_w
+        self.box_h = box_h
+
+    @property
+    def nbytes(self):
+        return self.premul.nbytes + self.inv_alpha.nbytes
+
+
+# Default sprite memory: a full ring at the app's largest arrow fits with room to spare
+DEFAULT_BUDGET_BYTES = 16 * 1024 * 1024
+
+
+def _turn_quarter(sprite, quarters):
+    """
+    sprite rotated a further quarters x 90 degrees clockwise about its box
+    centre; the arrays are np.rot90 views, so this costs no pixel copies
+    """
+    premul, inv_alpha = sprite.premul, sprite.inv_alpha
+    dx, dy = sprite.dx, sprite.dy
+    cx, cy = sprite.box_w // 2, sprite.box_h // 2
+    for _ in range(quarters):
+        h, w = premul.shape[:2]
+        # Pixel (x, y) goes to (cx + cy - y, x - cx + cy), turning about warpAffine's centre
+        dx, dy = cx + cy - dy - h + 1, dx - cx + cy
+        premul = np.rot90(premul, -1)
+        inv_alpha = np.rot90(inv_alpha, -1)
+    return Sprite(premul, inv_alpha, dx, dy, sprite.box_w, sprite.box_h)
+
+
+class ArrowAtlas:
+    """
+    Arrow sprites at quantized angles and scales, rendered on first use
+
+    Rotation and resizing happen once per (angle, scale) bucket instead of
+    every frame. Each scale bucket first shrinks the source arrow to its
+    size once, so a sprite is a single rotation at the drawn size. Pass
+    max_scale (the largest scale ever drawn) to shrink the source itself
+    up front.
+
+    Only the first quarter turn is rendered: the other three are the same
+    sprites turned by np.rot90, which stores nothing and matches a direct
+    render except for a few edge pixels. Sprites
+    live in an LRU bounded by budget_bytes (source copies included), so a
+    user spinning in place cannot grow the atlas without limit. A walk
+    sweeps the angle far more than the scale, so when a scale bucket's
+    quarter ring of cropped sprites would not fit in budget_bytes /
+    ring_headroom, that scale uses coarser angle buckets (a multiple of
+    angle_step) instead of evicting its own ring as fast as it fills.
+    """
+
+    def __init__(self, arrow_rgba, angle_step=3.0, scale_step=0.1, budget_bytes=DEFAULT_BUDGET_BYTES,
+                 min_size=10, ring_headroom=1.25, max_scale=None):
+        self.full_h, self.full_w = arrow_rgba.shape[:2]
+        if max_scale is not None and max_scale < 1.0:
+            size = (max(1, int(self.full_w * max_scale)), max(1, int(self.full_h * max_scale)))
+            arrow_rgba = cv2.resize(arrow_rgba, size, interpolation=cv2.INTER_AREA)
+        self.arrow_rgba = arrow_rgba
+        self.angle_step = angle_step
+        self.scale_step = scale_step
+        self.budget_bytes = budget_bytes
+        self.min_size = min_size
+        self.ring_headroom = ring_headroom
+        self._sources = {}
+        self._source_bytes = 0
+        self._strides = {}
+        self._sprites = OrderedDict()
+        self.bytes_used = 0
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    @property
+    def angle_buckets(self):
+        return int(round(360.0 / self.angle_step))
+
+    @property
+    def quarter_buckets(self):
+        """Angle buckets per 90 degrees, or None when they do not divide a quarter turn"""
+        n = self.angle_buckets
+        return n // 4 if n % 4 == 0 else None
+
+    @property
+    def hit_rate(self):
+        total = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / total if total else 0.0
+
+    def angle_stride(self, scale):
+        """Angle buckets per sprite at scale (1 until the bucket's first render)"""
+        return self._strides.get(int(round(scale / self.scale_step)), 1)
+
+    def _bucket(self, angle_deg, stride):
+        step = self.angle_step * stride
+        return (int(round(angle_deg / step)) * stride) % self.angle_buckets
+
+    def _choose_stride(self, sprite_bytes):
+        """Smallest stride whose quarter ring fits budget_bytes / ring_headroom"""
+        ring = self.quarter_buckets or self.angle_buckets
+        room = (self.budget_bytes - self._source_bytes) / self.ring_headroom
+        for stride in range(1, ring + 1):
+            if ring % stride == 0 and (ring // stride) * sprite_bytes <= room:
+                return stride
+        return ring
+
+    def _lookup(self, key):
+        sprite = self._sprites.get(key, False)
+        if sprite is not False:
+            self._sprites.move_to_end(key)
+            self.stats["hits"] += 1
+            return sprite
+
+        self.stats["misses"] += 1
+        sprite = self._sprites[key] = self._render(key[0] * self.angle_step, key[1] * self.scale_step)
+        if sprite is not None:
+            self.bytes_used += sprite.nbytes
+        while self.bytes_used + self._source_bytes > self.budget_bytes and len(self._sprites) > 1:
+            _, old = self._sprites.popitem(last=False)
+            if old is not None:
+                self.bytes_used -= old.nbytes
+            self.stats["evictions"] += 1
+        return sprite
+
+    def get(self, angle_deg, scale):
+        """Sprite for the nearest bucket, or None if the arrow would be under min_size"""
+        si = int(round(scale / self.scale_step))
+        stride = self._strides.get(si)
+        k = self._bucket(angle_deg, stride or 1)
+        quarter = self.quarter_buckets
+        turns, base = divmod(k, quarter) if quarter else (0, k)
+
+        sprite = self._lookup((base, si))
+        if stride is None and sprite is not None:
+            # First sprite at this scale: size the ring from its cropped bytes
+            stride = self._strides[si] = self._choose_stride(max(sprite.nbytes, 1))
+            if stride > 1:
+                k = self._bucket(angle_deg, stride)
+                turns, base = divmod(k, quarter) if quarter else (0, k)
+                sprite = self._lookup((base, si))
+        if sprite is None or not turns:
+            return sprite
+        return _turn_quarter(sprite, turns)
+
+    def _source(self, target_w, target_h):
+        """The arrow resized to the drawn size, once per scale bucket"""
+        src = self._sources.get((target_w, target_h))
+        if src is None:
+            src = self._sources[(target_w, target_h)] = cv2.resize(
+                self.arrow_rgba, (target_w, target_h), interpolation=cv2.INTER_AREA)
+            self._source_bytes += src.nbytes
+        return src
+
+    def _render(self, angle_deg, scale):
+        target_w = int(self.full_w * scale)
+        target_h = int(self.full_h * scale)
+        if target_w < self.min_size or target_h < self.min_size:
+            return None
+
+        M = cv2.getRotationMatrix2D((target_w // 2, target_h // 2), -angle_deg, 1.0)
+        resized = cv2.warpAffine(self._source(target_w, target_h), M, (target_w, target_h),
+                                 borderMode=cv2.BORDER_CONSTANT, borderValue=0)
+
+        x0, y0, w, h = cv2.boundingRect(resized[:, :, 3])
+        if w == 0 or h == 0:
+            return Sprite(np.zeros((0, 0, 3), np.uint8), np.zeros((0, 0, 1), np.uint8), 0, 0, target_w, target_h)
+
+        premul, inv_alpha = premultiply(resized[y0:y0 + h, x0:x0 + w])
+        return Sprite(premul, inv_alpha, int(x0), int(y0), target_w, target_h)
+
+    def draw(self, frame, angle_deg, scale):
+        """
+        Blend the arrow into frame in place, bottom centre like
+        _overlay_perspective_arrow
+
+        Returns:
+            frame
+        """
+        sprite = self.get(angle_deg, scale)
+        if sprite is None or sprite.premul.size == 0:
+            return frame
+
+        fh, fw = frame.shape[:2]
+        box_x = max(0, min(fw // 2 - sprite.box_w // 2, fw - 1))
+        box_y = max(0, min(int(fh * 0.75) - sprite.box_h // 2, fh - 1))
+        return blend_premultiplied(frame, box_x + sprite.dx, box_y + sprite.dy, sprite.premul, sprite.inv_alpha)
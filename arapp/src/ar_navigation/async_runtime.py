@@ -0,0 +1,42 @@
+"""Process-wide background event loop for network-bound navigation work"""
+import asyncio
+import threading
+
+_loop = None
+_thread = None
+_lock = threading.Lock()
+
+
+def get_loop():
+    """Start the shared loop on a daemon thread the first time it is needed"""
+    global _loop, _thread
+    if _loop is None:
+        with _lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def run():
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(ready.set)
+                    loop.run_forever()
+
+                _thread = threading.Thread(target=run, name="nav-async", daemon=True)
+                _thread.start()
+                ready.wait()
+                _loop = loop
+    return _loop
+
+
+def submit(coro):
+    """
+    Schedule a coroutine on the shared loop from any thread
+
+    Returns:
+        concurrent.futures.Future; cancelling it cancels the coroutine
+    """
+    return asyncio.run_coroutine_threadsafe(coro, get_loop())
+
+
+def in_loop_thread():
+    return _thread is not None and threading.current_thread() is _thread
@@ -0,0 +1,101 @@
+"""Translucent distance banner rendered once per distinct string"""
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+from .blend import blend_premultiplied
+
+
+class BannerRenderer:
+    """
+    Navy "Destination: N m" banner as cached premultiplied sprites
+
+    Text metrics and the anti-aliased glyph coverage are computed once per
+    string and folded together with the translucent fill into one sprite,
+    so a frame costs a single ROI blend. Distances repeat a lot while
+    walking, so sprites are kept in a small LRU keyed by the text and scale.
+
+    font_scale, thickness, pad and top are for ref_height (480 px) frames;
+    draw() scales them with the frame height, so the banner keeps the same
+    share of the picture when the adaptive controller drops to 320x240.
+    """
+
+    def __init__(self, fill_bgr=(122, 42, 0), fill_alpha=0.7, text_bgr=(240, 240, 240),
+                 font=cv2.FONT_HERSHEY_SIMPLEX, font_scale=0.65, thickness=1,
+                 pad=(25, 15), top=25, max_entries=64, ref_height=480):
+        self.fill_bgr = fill_bgr
+        self.fill_alpha = fill_alpha
+        self.text_bgr = text_bgr
+        self.font = font
+        self.font_scale = font_scale
+        self.thickness = thickness
+        self.pad = pad
+        self.top = top
+        self.max_entries = max_entries
+        self.ref_height = ref_height
+        self._sprites = OrderedDict()
+        self._last_key = None
+        self._last_sprite = None
+        self.stats = {"hits": 0, "misses": 0, "redraws": 0}
+
+    def _render(self, text, scale):
+        font_scale = self.font_scale * scale
+        thickness = max(1, round(self.thickness * scale))
+        (text_w, text_h), baseline = cv2.getTextSize(text, self.font, font_scale, thickness)
+        pad_x, pad_y = round(self.pad[0] * scale), round(self.pad[1] * scale)
+        # +1 keeps the size of the inclusive cv2.rectangle this replaces
+        w = text_w + 2 * pad_x + 1
+        h = text_h + baseline + 2 * pad_y + 1
+
+        coverage = np.zeros((h, w), dtype=np.uint8)
+        cv2.putText(coverage, text, (pad_x, pad_y + text_h), self.font, font_scale, 255,
+                    thickness, cv2.LINE_AA)
+
+        # Text over fill, premultiplied: alpha = c + (1 - c) * a_fill
+        c = coverage[:, :, None].astype(np.float32) / 255.0
+        fill = np.array(self.fill_bgr, np.float32) * self.fill_alpha
+        premul = np.array(self.text_bgr, np.float32) * c + fill * (1.0 - c)
+        inv_alpha = (1.0 - c) * (1.0 - self.fill_alpha) * 255.0
+        return (np.rint(premul).astype(np.uint8), np.rint(inv_alpha).astype(np.uint8))
+
+    def scale_for(self, frame_height):
+        """Size factor for a frame frame_height px high, in steps of 0.05"""
+        return max(0.25, round(frame_height / self.ref_height * 20) / 20)
+
+    def sprite(self, text, scale=1.0):
+        """(premul, inv_alpha) for text at scale, rendered on first use"""
+        key = (text, scale)
+        if key == self._last_key:
+            return self._last_sprite
+        self.stats["redraws"] += 1
+
+        sprite = self._sprites.get(key)
+        if sprite is not None:
+            self._sprites.move_to_end(key)
+            self.stats["hits"] += 1
+        else:
+            self.stats["misses"] += 1
+            sprite = self._sprites[key] = self._render(text, scale)
+            while len(self._sprites) > self.max_entries:
+                self._sprites.popitem(last=False)
+
+        self._last_key, self._last_sprite = key, sprite
+        return sprite
+
+    def draw(self, frame, text):
+        """
+        Blend the banner top centre, over its own rectangle only, sized
+        for the frame's height
+
+        Returns:
+            frame
+        """
+        fh, fw = frame.shape[:2]
+        scale = self.scale_for(fh)
+        premul, inv_alpha = self.sprite(text, scale)
+        h, w = premul.shape[:2]
+        # Placed by the rectangle size without the +1, as before
+        x0 = max(0, min((fw - w + 1) // 2, fw - w + 1))
+        y0 = max(0, min(round(self.top * scale), fh - h + 1))
+        return blend_premultiplied(frame, x0, y0, premul, inv_alpha)
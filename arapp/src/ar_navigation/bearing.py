@@ -1,6 +1,8 @@
 
 import math
 
+import numpy as np
+
 def bearing_to_target(lat1, lon1, lat2, lon2):
     # Returns bearing from (lat1,lon1) to (lat2,lon2) in degrees (0 = N, 90 = E)
     lat1 = math.radians(lat1)
@@ -13,4 +15,14 @@ def bearing_to_target(lat1, lon1, lat2, lon2):
     y = math.cos(lat1) * math.sin(lat2) - math.sin(lat1) * math.cos(lat2) * math.cos(dlon)
     initial = math.atan2(x, y)
     initial = math.degrees(initial)
-    return (initial + 360) % 360
\ No newline at end of file
+    return (initial + 360) % 360
+
+
+def bearing_to_target_array(lat1, lon1, lat2, lon2):
+    # bearing_to_target over NumPy arrays of degrees, element-wise
+    lat1 = np.radians(lat1)
+    lat2 = np.radians(lat2)
+    dlon = np.radians(lon2) - np.radians(lon1)
+    x = np.sin(dlon) * np.cos(lat2)
+    y = np.cos(lat1) * np.sin(lat2) - np.sin(lat1) * np.cos(lat2) * np.cos(dlon)
+    return np.degrees(np.arctan2(x, y)) % 360
@@ -0,0 +1,170 @@
+"""Camera discovery, persistence and warm hand-off for the AR view"""
+import json
+import os
+import threading
+import time
+
+import cv2
+
+from .campus_graph import SRC_DIR
+
+CAMERA_FILE = os.path.join(os.path.dirname(SRC_DIR), "storage", "camera.json")
+
+# Same order generate_frames used to try on every visit:
+# 0 is usually the back camera on phones, 1/2 on PC; DirectShow first on Windows
+PROBE_ORDER = ((1, cv2.CAP_DSHOW), (1, cv2.CAP_ANY), (2, cv2.CAP_DSHOW), (2, cv2.CAP_ANY))
+
+
+class CameraManager:
+    """
+    Finds a working camera once and hands out an open capture quickly
+
+    probe_async() runs at app start: it tries the saved (index, backend)
+    from CAMERA_FILE, else walks PROBE_ORDER, and saves whatever reads a
+    frame. The probe releases the device so the camera is not held while
+    the user is elsewhere in the app.
+
+    acquire() (blocking; call it off the UI thread) returns the warm
+    handle if there is one, otherwise opens the known device. release()
+    does not close the device right away but after grace_s, so leaving
+    AR and coming straight back skips the open altogether.
+
+    Args:
+        open_fn: (index, backend) -> capture; cv2.VideoCapture by default
+    """
+
+    def __init__(self, camera_file=CAMERA_FILE, probe_order=PROBE_ORDER, grace_s=30.0, open_fn=None):
+        self.camera_file = camera_file
+        self.probe_order = probe_order
+        self.grace_s = grace_s
+        self.open_fn = open_fn or cv2.VideoCapture
+        self.device = None
+        self._warm = None
+        self._release_timer = None
+        self._probed = threading.Event()
+        self._probe_started = False
+        self._lock = threading.Lock()
+        self.stats = {"probes": 0, "opens": 0, "warm_hits": 0, "released": 0}
+
+    def _load(self):
+        try:
+            with open(self.camera_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return int(data["index"]), int(data["backend"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _save(self, device):
+        try:
+            os.makedirs(os.path.dirname(self.camera_file), exist_ok=True)
+            tmp_path = self.camera_file + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"index": device[0], "backend": device[1], "probed_at": time.time()}, f)
+            os.replace(tmp_path, self.camera_file)
+        except OSError as e:
+            print(f"Could not save camera choice: {e}")
+
+    def _try_open(self, device):
+        cap = self.open_fn(*device)
+        if cap.isOpened():
+            ret, _ = cap.read()
+            if ret:
+                return cap
+        cap.release()
+        return None
+
+    def _discover(self):
+        """Open the first working device, saved choice first; None if there is none"""
+        saved = self._load()
+        candidates = ([saved] if saved else []) + [d for d in self.probe_order if d != saved]
+        for device in candidates:
+            self.stats["probes"] += 1
+            cap = self._try_open(device)
+            if cap is not None:
+                if device != saved:
+                    self._save(device)
+                self.device = device
+                return cap
+        self.device = None
+        return None
+
+    def _probe(self):
+        try:
+            cap = self._discover()
+            if cap is not None:
+                cap.release()
+        except Exception as e:
+            print(f"Camera probe failed: {e}")
+        finally:
+            self._probed.set()
+
+    def probe_async(self):
+        """Start the background probe (once); returns immediately"""
+        with self._lock:
+            if self._probe_started:
+                return
+            self._probe_started = True
+        threading.Thread(target=self._probe, name="camera-probe", daemon=True).start()
+
+    def acquire(self, timeout=10.0):
+        """
+        An open capture, or None if no camera works
+
+        Waits up to timeout for a running probe rather than racing it for
+        the device.
+        """
+        with self._lock:
+            if self._release_timer is not None:
+                self._release_timer.cancel()
+                self._release_timer = None
+            if self._warm is not None:
+                cap, self._warm = self._warm, None
+                self.stats["warm_hits"] += 1
+                return cap
+
+        if self._probe_started:
+            self._probed.wait(timeout)
+
+        cap = None
+        if self.device is not None:
+            cap = self._try_open(self.device)
+        if cap is None:
+            # Unplugged, or taken by another app since the probe: look again
+            cap = self._discover()
+        if cap is not None:
+            self.stats["opens"] += 1
+        return cap
+
+    def release(self, cap):
+        """Keep cap open for grace_s in case AR is re-entered, then close it"""
+        with self._lock:
+            if self._warm is not None and self._warm is not cap:
+                self._warm.release()
+            self._warm = cap
+            if self._release_timer is not None:
+                self._release_timer.cancel()
+            self._release_timer = threading.Timer(self.grace_s, self._expire, args=(cap,))
+            self._release_timer.daemon = True
+            self._release_timer.start()
+
+    def _expire(self, cap):
+        with self._lock:
+            if self._warm is not cap:
+                return
+            self._warm = None
+            self._release_timer = None
+        cap.release()
+        self.stats["released"] += 1
+
+    def close(self):
+        """Release the warm handle now (app exit)"""
+        with self._lock:
+            cap, self._warm = self._warm, None
+            if self._release_timer is not None:
+                self._release_timer.cancel()
+                self._release_timer = None
+        if cap is not None:
+            cap.release()
+
+
+camera_manager = CameraManager()
@@ -0,0 +1,313 @@
+"""Build a pedestrian graph of the campus from the cached Overpass data"""
+import glob
+import json
+import os
+import sys
+from math import sqrt, radians, sin, cos, asin
+
+import numpy as np
+
+# Current file is in: src/ar_navigation/campus_graph.py
+_current_dir = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.abspath(os.path.join(_current_dir, ".."))
+CACHE_DIR = os.path.join(SRC_DIR, "cache")
+
+# Compiled graph, kept next to places_cache.json
+GRAPH_FILE = os.path.join(SRC_DIR, "campus_graph.npy")
+
+# File layout: one flat int64 array; float sections are stored bit-for-bit
+# and viewed back as float64, so every section stays a zero-copy view
+#   [MAGIC, n_nodes, n_edges, lat[n], lon[n], offsets[n+1], targets[m], lengths[m]]
+GRAPH_MAGIC = 0x5A4E01
+_HEADER_LEN = 3
+
+# OSM ways a pedestrian can follow
+WALKABLE_HIGHWAYS = {
+    "footway", "path", "pedestrian", "steps", "corridor", "living_street",
+    "residential", "service", "unclassified", "tertiary", "secondary", "primary", "track",
+}
+
+# Open-space linking: the campus dump only contains building footprints, so
+# corners that can see each other within this radius become walkable edges.
+LINK_RADIUS_M = 60.0
+
+EARTH_RADIUS_M = 6371000
+
+
+def haversine_m(a_lat, a_lon, b_lat, b_lon):
+    dlat = radians(b_lat - a_lat)
+    dlon = radians(b_lon - a_lon)
+    a = sin(dlat/2)**2 + cos(radians(a_lat))*cos(radians(b_lat))*sin(dlon/2)**2
+    c = 2*asin(min(1, sqrt(a)))
+    return EARTH_RADIUS_M*c
+
+
+def haversine_m_array(a_lat, a_lon, b_lat, b_lon):
+    """haversine_m over NumPy arrays of degrees, element-wise"""
+    a_lat, b_lat = np.radians(a_lat), np.radians(b_lat)
+    dlat = b_lat - a_lat
+    dlon = np.radians(b_lon) - np.radians(a_lon)
+    a = np.sin(dlat / 2) ** 2 + np.cos(a_lat) * np.cos(b_lat) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def load_overpass_elements(cache_dir=CACHE_DIR):
+    """
+    Collect the Overpass elements osmnx cached as JSON
+
+    Args:
+        cache_dir: directory holding the osmnx request cache
+
+    Returns:
+        list of Overpass element dicts (nodes and ways)
+    """
+    elements = []
+    for path in sorted(glob.glob(os.path.join(cache_dir, "*.json"))):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Skipping unreadable cache file {path}: {e}")
+            continue
+        # Nominatim responses are lists; Overpass responses carry "elements"
+        if isinstance(data, dict) and "elements" in data:
+            elements.extend(data["elements"])
+    return elements
+
+
+def _to_local_xy(lat, lon, lat0, lon0):
+    # Equirectangular projection, plenty accurate at campus scale
+    x = radians(lon - lon0) * EARTH_RADIUS_M * cos(radians(lat0))
+    y = radians(lat - lat0) * EARTH_RADIUS_M
+    return x, y
+
+
+def _cross(o, a, b):
+    return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+
+def _segments_cross(p1, p2, q1, q2):
+    # Proper intersection only; touching at a shared corner is allowed
+    d1 = _cross(q1, q2, p1)
+    d2 = _cross(q1, q2, p2)
+    d3 = _cross(p1, p2, q1)
+    d4 = _cross(p1, p2, q2)
+    return d1 * d2 < 0 and d3 * d4 < 0
+
+
+def _point_in_polygon(pt, poly):
+    x, y = pt
+    inside = False
+    j = len(poly) - 1
+    for i in range(len(poly)):
+        xi, yi = poly[i]
+        xj, yj = poly[j]
+        if (yi > y) != (yj > y) and x < (xj - xi) * (y - yi) / (yj - yi) + xi:
+            inside = not inside
+        j = i
+    return inside
+
+
+def _blocked(a, b, footprints):
+    min_x, max_x = min(a[0], b[0]), max(a[0], b[0])
+    min_y, max_y = min(a[1], b[1]), max(a[1], b[1])
+    mid = ((a[0] + b[0]) / 2, (a[1] + b[1]) / 2)
+    for poly, (px0, py0, px1, py1) in footprints:
+        if max_x < px0 or min_x > px1 or max_y < py0 or min_y > py1:
+            continue
+        if _point_in_polygon(mid, poly):
+            return True
+        for i in range(len(poly) - 1):
+            if _segments_cross(a, b, poly[i], poly[i + 1]):
+                return True
+    return False
+
+
+def _add_edge(adjacency, u, v, length):
+    adjacency.setdefault(u, []).append((v, length))
+    adjacency.setdefault(v, []).append((u, length))
+
+
+def build_campus_graph(cache_dir=CACHE_DIR):
+    """
+    Build the walking graph from the cached Overpass dump
+
+    Walkable highway ways are used when the dump has them. Otherwise the
+    graph is the open space between building footprints: every footprint
+    corner is linked to the corners it can reach in a straight line
+    without cutting through a building.
+
+    Args:
+        cache_dir: directory holding the osmnx request cache
+
+    Returns:
+        tuple: (nodes: {id: (lat, lon)}, adjacency: {id: [(id, length_m), ...]})
+    """
+    elements = load_overpass_elements(cache_dir)
+    coords = {e["id"]: (e["lat"], e["lon"]) for e in elements if e["type"] == "node"}
+    ways = [e for e in elements if e["type"] == "way"]
+
+    nodes = {}
+    adjacency = {}
+
+    walkways = [w for w in ways if w.get("tags", {}).get("highway") in WALKABLE_HIGHWAYS]
+    if walkways:
+        for way in walkways:
+            refs = [n for n in way["nodes"] if n in coords]
+            for u, v in zip(refs, refs[1:]):
+                nodes[u], nodes[v] = coords[u], coords[v]
+                _add_edge(adjacency, u, v, haversine_m(*coords[u], *coords[v]))
+        return nodes, adjacency
+
+    buildings = [w for w in ways if "building" in w.get("tags", {})]
+    if not coords or not buildings:
+        return nodes, adjacency
+
+    lat0 = sum(c[0] for c in coords.values()) / len(coords)
+    lon0 = sum(c[1] for c in coords.values()) / len(coords)
+
+    footprints = []
+    corner_ids = []
+    for way in buildings:
+        refs = [n for n in way["nodes"] if n in coords]
+        if len(refs) < 3:
+            continue
+        poly = [_to_local_xy(*coords[n], lat0, lon0) for n in refs]
+        xs = [p[0] for p in poly]
+        ys = [p[1] for p in poly]
+        footprints.append((poly, (min(xs), min(ys), max(xs), max(ys))))
+        corner_ids.extend(refs)
+
+    corner_ids = list(dict.fromkeys(corner_ids))
+    xy = {n: _to_local_xy(*coords[n], lat0, lon0) for n in corner_ids}
+    for n in corner_ids:
+        nodes[n] = coords[n]
+        adjacency.setdefault(n, [])
+
+    for i, u in enumerate(corner_ids):
+        ux, uy = xy[u]
+        for v in corner_ids[i + 1:]:
+            vx, vy = xy[v]
+            if (ux - vx) ** 2 + (uy - vy) ** 2 > LINK_RADIUS_M ** 2:
+                continue
+            if _blocked(xy[u], xy[v], footprints):
+                continue
+            _add_edge(adjacency, u, v, haversine_m(*coords[u], *coords[v]))
+
+    # Corners boxed in by neighbouring walls are unreachable; drop them so
+    # snapping never lands on a dead end
+    for n in [n for n, edges in adjacency.items() if not edges]:
+        del adjacency[n]
+        del nodes[n]
+
+    return nodes, adjacency
+
+
+class CampusGraph:
+    """
+    Walking graph in CSR form
+
+    Neighbours of node i are targets[offsets[i]:offsets[i+1]] with matching
+    lengths (metres). When loaded from GRAPH_FILE every array is a view into
+    one read-only memory map, so opening it costs almost nothing and the
+    pages are shared by every session in the process.
+    """
+
+    def __init__(self, lat, lon, offsets, targets, lengths):
+        self.lat = lat
+        self.lon = lon
+        self.offsets = offsets
+        self.targets = targets
+        self.lengths = lengths
+
+    @property
+    def node_count(self):
+        return len(self.lat)
+
+    @property
+    def edge_count(self):
+        return len(self.targets)
+
+    def neighbours(self, i):
+        lo, hi = int(self.offsets[i]), int(self.offsets[i + 1])
+        return zip(self.targets[lo:hi].tolist(), self.lengths[lo:hi].tolist())
+
+    def coords(self, i):
+        return float(self.lat[i]), float(self.lon[i])
+
+
+def to_csr(nodes, adjacency):
+    """Pack the dict graph from build_campus_graph into a CampusGraph"""
+    ids = sorted(nodes)
+    index = {node_id: i for i, node_id in enumerate(ids)}
+
+    lat = np.array([nodes[n][0] for n in ids], dtype=np.float64)
+    lon = np.array([nodes[n][1] for n in ids], dtype=np.float64)
+    offsets = np.zeros(len(ids) + 1, dtype=np.int64)
+    targets, lengths = [], []
+    for i, node_id in enumerate(ids):
+        edges = sorted(adjacency.get(node_id, ()))
+        targets.extend(index[v] for v, _ in edges)
+        lengths.extend(length for _, length in edges)
+        offsets[i + 1] = len(targets)
+
+    return CampusGraph(
+        lat, lon, offsets,
+        np.array(targets, dtype=np.int64),
+        np.array(lengths, dtype=np.float64),
+    )
+
+
+def write_graph_file(path=GRAPH_FILE, cache_dir=CACHE_DIR):
+    """
+    Regenerate the compiled graph file from the Overpass dump
+
+    Returns:
+        CampusGraph that was written
+    """
+    graph = to_csr(*build_campus_graph(cache_dir))
+    header = np.array([GRAPH_MAGIC, graph.node_count, graph.edge_count], dtype=np.int64)
+    flat = np.concatenate([
+        header,
+        graph.lat.view(np.int64),
+        graph.lon.view(np.int64),
+        graph.offsets,
+        graph.targets,
+        graph.lengths.view(np.int64),
+    ])
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, flat, allow_pickle=False)
+    os.replace(tmp_path, path)
+    return graph
+
+
+def load_graph_file(path=GRAPH_FILE):
+    """
+    Open the compiled graph as a read-only memory map
+
+    Raises:
+        ValueError: if the file is not a compiled campus graph
+    """
+    flat = np.load(path, mmap_mode="r", allow_pickle=False)
+    if flat.ndim != 1 or flat.dtype != np.int64 or len(flat) < _HEADER_LEN or int(flat[0]) != GRAPH_MAGIC:
+        raise ValueError(f"{path} is not a campus graph file")
+
+    n, m = int(flat[1]), int(flat[2])
+    pos = _HEADER_LEN
+    sections = []
+    for size in (n, n, n + 1, m, m):
+        sections.append(flat[pos:pos + size])
+        pos += size
+    if pos != len(flat):
+        raise ValueError(f"{path} is truncated or corrupt")
+
+    lat, lon, offsets, targets, lengths = sections
+    return CampusGraph(lat.view(np.float64), lon.view(np.float64), offsets, targets, lengths.view(np.float64))
+
+
+if __name__ == "__main__":
+    # python -m src.ar_navigation.campus_graph [output.npy]
+    out_path = sys.argv[1] if len(sys.argv) > 1 else GRAPH_FILE
+    g = write_graph_file(out_path)
+    print(f"Wrote {g.node_count} nodes / {g.edge_count} directed edges to {out_path}")
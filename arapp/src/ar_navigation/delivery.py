@@ -0,0 +1,71 @@
+"""Latest-frame delivery of AR frames into a single Flet control"""
+import threading
+
+
+class FrameDelivery:
+    """
+    Pushes frames into one image control, never more than one at a time
+
+    submit() may be called from any thread. If no send is in flight the
+    caller sends right away (set src_base64, then control.update(), which
+    refreshes only that control instead of diffing the whole page). If a
+    send is in flight the frame is parked in a one-slot mailbox and the
+    call returns at once; a newer frame replaces a parked one, which counts
+    as dropped. Whoever finishes a send picks up the parked frame, so at
+    most one frame is ever waiting, however slow the UI is.
+
+    Args:
+        control: object with src_base64 and update(), e.g. ft.Image
+        on_error: called with the exception if an update fails (the view
+                  was closed, the session dropped); delivery stops after it
+    """
+
+    def __init__(self, control, on_error=None):
+        self.control = control
+        self.on_error = on_error
+        self._lock = threading.Lock()
+        self._pending = None
+        self._busy = False
+        self.closed = False
+        self.stats = {"delivered": 0, "dropped": 0, "errors": 0}
+
+    @property
+    def dropped(self):
+        return self.stats["dropped"]
+
+    def submit(self, b64):
+        """Deliver b64 now, or park it if another send is in flight"""
+        with self._lock:
+            if self.closed:
+                return
+            if self._busy:
+                if self._pending is not None:
+                    self.stats["dropped"] += 1
+                self._pending = b64
+                return
+            self._busy = True
+
+        while b64 is not None:
+            self._send(b64)
+            with self._lock:
+                b64, self._pending = self._pending, None
+                if b64 is None or self.closed:
+                    self._busy = False
+                    return
+
+    def _send(self, b64):
+        try:
+            self.control.src_base64 = b64
+            self.control.update()
+            self.stats["delivered"] += 1
+        except Exception as e:
+            self.stats["errors"] += 1
+            self.close()
+            if self.on_error is not None:
+                self.on_error(e)
+
+    def close(self):
+        """Stop delivering and release any parked frame"""
+        with self._lock:
+            self.closed = True
+            self._pending = None
@@ -0,0 +1,117 @@
+"""One-to-many walking distances from the user to every campus place"""
+import heapq
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from .campus_graph import haversine_m
+from .local_router import MAX_SNAP_M, get_graph, nearest_node
+from .route_cache import snap_to_grid
+
+# Shortest-path trees kept per ~5 m origin cell
+MAX_CACHED_ORIGINS = 64
+
+_trees = OrderedDict()
+_place_nodes = {}
+_lock = threading.Lock()
+stats = {"hits": 0, "misses": 0}
+
+
+def dijkstra_all(graph, source):
+    """
+    Single-source Dijkstra over the CSR graph
+
+    Returns:
+        float64 array of walking metres from source to every node (inf if unreachable)
+    """
+    dist = np.full(graph.node_count, np.inf)
+    dist[source] = 0.0
+    best = {source: 0.0}
+    heap = [(0.0, source)]
+    done = set()
+    while heap:
+        d, u = heapq.heappop(heap)
+        if u in done:
+            continue
+        done.add(u)
+        dist[u] = d
+        for v, length in graph.neighbours(u):
+            nd = d + length
+            if nd < best.get(v, float("inf")):
+                best[v] = nd
+                heapq.heappush(heap, (nd, v))
+    return dist
+
+
+def _shortest_path_tree(graph, lat, lon):
+    cell = snap_to_grid(lat, lon)
+    with _lock:
+        tree = _trees.get(cell)
+        if tree is not None:
+            _trees.move_to_end(cell)
+            stats["hits"] += 1
+            return tree
+        stats["misses"] += 1
+
+    source, snap_d = nearest_node(graph, lat, lon)
+    # Off campus there is nothing to walk; callers fall back to straight lines
+    tree = (snap_d, dijkstra_all(graph, source) if snap_d <= MAX_SNAP_M else None)
+    with _lock:
+        _trees[cell] = tree
+        while len(_trees) > MAX_CACHED_ORIGINS:
+            _trees.popitem(last=False)
+    return tree
+
+
+def _place_node(graph, coords):
+    coords = (coords[0], coords[1])
+    node = _place_nodes.get(coords)
+    if node is None:
+        node = _place_nodes[coords] = nearest_node(graph, coords[0], coords[1])
+    return node
+
+
+def walking_distances(origin, places):
+    """
+    Walking metres from origin to every place, from one Dijkstra run
+
+    Off campus (origin farther than MAX_SNAP_M from the graph) the
+    straight-line distance is returned instead, so sorting still works.
+
+    Args:
+        origin: (lat, lon) of the user
+        places: {name: (lat, lon)}, e.g. PLACES
+
+    Returns:
+        dict: {name: metres}; unreachable places map to inf
+    """
+    graph = get_graph()
+    lat, lon = origin
+    dist = None
+    if graph.node_count:
+        snap_d, dist = _shortest_path_tree(graph, lat, lon)
+    if dist is None:
+        return {name: haversine_m(lat, lon, c[0], c[1]) for name, c in places.items()}
+
+    result = {}
+    for name, coords in places.items():
+        node, place_snap_d = _place_node(graph, coords)
+        result[name] = snap_d + float(dist[node]) + place_snap_d
+    return result
+
+
+def nearest_places(origin, places, names=None, limit=1):
+    """
+    Closest places by walking distance
+
+    Args:
+        names: optional iterable restricting the candidates
+               (e.g. every name containing "Restroom")
+
+    Returns:
+        list of (name, metres), nearest first
+    """
+    candidates = places if names is None else {n: places[n] for n in names if n in places}
+    distances = walking_distances(origin, candidates)
+    return sorted(distances.items(), key=lambda item: item[1])[:limit]
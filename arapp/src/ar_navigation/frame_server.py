@@ -0,0 +1,136 @@
+"""Local MJPEG endpoint serving AR frames as raw JPEG bytes"""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BOUNDARY = "sarinaframe"
+
+_PAGE = b"""<!DOCTYPE html>
+<html><head><meta name="viewport" content="width=device-width, initial-scale=1.0">
+<style>html,body{margin:0;height:100%;background:#000;overflow:hidden}
+img{width:100%;height:100%;object-fit:cover}</style></head>
+<body><img src="/stream.mjpg"></body></html>"""
+
+
+class FrameServer:
+    """
+    Serves the newest AR frame over HTTP on localhost
+
+    GET /stream.mjpg is multipart/x-mixed-replace MJPEG, GET /frame.jpg the
+    latest frame alone, and GET / a full-screen page showing the stream for
+    a WebView. publish() only swaps a reference and wakes the client
+    threads, so the frame loop pays nothing per viewer. A client that
+    falls behind skips straight to the newest frame.
+
+    Args:
+        host: bind address; keep it on loopback
+        port: 0 picks a free port; see url once started
+    """
+
+    def __init__(self, host="127.0.0.1", port=0):
+        self.host = host
+        self.port = port
+        self._frame = None
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._closed = False
+        self._httpd = None
+        self.stats = {"published": 0, "sent": 0, "bytes_sent": 0, "clients": 0}
+
+    @property
+    def url(self):
+        """Page URL for a WebView (None until started)"""
+        return f"http://{self.host}:{self.port}/" if self._httpd else None
+
+    @property
+    def stream_url(self):
+        return f"http://{self.host}:{self.port}/stream.mjpg" if self._httpd else None
+
+    def publish(self, jpeg):
+        """Make jpeg (bytes) the current frame; usable as a frame_callback"""
+        with self._cond:
+            self._frame = jpeg
+            self._seq += 1
+            self.stats["published"] += 1
+            self._cond.notify_all()
+
+    def wait_frame(self, after_seq, timeout=1.0):
+        """(seq, jpeg) newer than after_seq, or None on timeout/close"""
+        with self._cond:
+            if self._seq <= after_seq and not self._closed:
+                self._cond.wait(timeout)
+            if self._closed or self._seq <= after_seq:
+                return None
+            return self._seq, self._frame
+
+    def start(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                if self.path == "/stream.mjpg":
+                    self._stream()
+                elif self.path == "/frame.jpg":
+                    self._single()
+                elif self.path in ("/", "/index.html"):
+                    self._send(200, "text/html", _PAGE)
+                else:
+                    self._send(404, "text/plain", b"not found")
+
+            def _send(self, code, content_type, body):
+                self.send_response(code)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("Cache-Control", "no-store")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _single(self):
+                frame = server._frame
+                if frame is None:
+                    self._send(503, "text/plain", b"no frame yet")
+                else:
+                    self._send(200, "image/jpeg", frame)
+
+            def _stream(self):
+                self.send_response(200)
+                self.send_header("Content-Type", f"multipart/x-mixed-replace; boundary={BOUNDARY}")
+                self.send_header("Cache-Control", "no-store")
+                self.end_headers()
+                server.stats["clients"] += 1
+                seq = 0
+                try:
+                    while not server._closed:
+                        item = server.wait_frame(seq)
+                        if item is None:
+                            continue
+                        seq, frame = item
+                        head = (f"--{BOUNDARY}\r\nContent-Type: image/jpeg\r\n"
+                                f"Content-Length: {len(frame)}\r\n\r\n").encode("ascii")
+                        self.wfile.write(head)
+                        self.wfile.write(frame)
+                        self.wfile.write(b"\r\n")
+                        server.stats["sent"] += 1
+                        server.stats["bytes_sent"] += len(frame)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                finally:
+                    server.stats["clients"] -= 1
+
+        self._httpd = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        threading.Thread(target=self._httpd.serve_forever, name="ar-frame-server", daemon=True).start()
+        return self
+
+    def close(self):
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
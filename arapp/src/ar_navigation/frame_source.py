@@ -0,0 +1,161 @@
+"""Frame sources for the AR loop: live camera, video file, synthetic scene"""
+import cv2
+import numpy as np
+
+from .camera_manager import camera_manager
+
+
+class FrameSource:
+    """
+    Where generate_frames gets its frames from
+
+    open() runs once before the first read and may block (call it off
+    the UI thread); it returns False if there is nothing to read from.
+    read(buf) returns a BGR frame at the requested size, written into buf
+    when buf has that shape, or None if no frame is ready. set_size()
+    requests a new size; sources that cannot deliver it are resized to
+    fit. close() gives the device back.
+    """
+
+    def __init__(self):
+        self.size = None
+        self.stats = {"frames": 0, "resized": 0}
+
+    def open(self):
+        return True
+
+    def set_size(self, width, height):
+        self.size = (width, height)
+
+    def read(self, buf=None):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def _fit(self, frame, buf=None):
+        if frame is None:
+            return None
+        self.stats["frames"] += 1
+        if self.size is None or (frame.shape[1], frame.shape[0]) == self.size:
+            return frame
+        self.stats["resized"] += 1
+        width, height = self.size
+        dst = buf if buf is not None and buf.shape == (height, width, 3) else None
+        return cv2.resize(frame, self.size, dst=dst, interpolation=cv2.INTER_AREA)
+
+
+class CameraSource(FrameSource):
+    """The device camera, handed out (and kept warm) by CameraManager"""
+
+    def __init__(self, manager=camera_manager):
+        super().__init__()
+        self.manager = manager
+        self.cap = None
+
+    def open(self):
+        # Probed at app start; may hand back a handle still warm from the last visit
+        self.cap = self.manager.acquire()
+        if self.cap is None:
+            return False
+        # A warm handle already runs at the size the last visit settled on
+        self.size = (int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+        return True
+
+    def set_size(self, width, height):
+        if self.size != (width, height):
+            # Optimization: Lower resolution for speed
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        super().set_size(width, height)
+
+    def read(self, buf=None):
+        # Reads into a recycled pool buffer when its shape matches
+        ret, frame = self.cap.read(image=buf)
+        # Some backends ignore the requested size
+        return self._fit(frame if ret else None, buf)
+
+    def close(self):
+        if self.cap is not None:
+            self.manager.release(self.cap)
+            self.cap = None
+
+
+class VideoFileSource(FrameSource):
+    """
+    A recorded video, read one frame per call
+
+    The capture stage paces reads, so the clip plays at the pipeline's
+    frame rate rather than its own. At the end it starts over with
+    loop=True, otherwise read() returns None and ended is set.
+    """
+
+    def __init__(self, path, loop=True):
+        super().__init__()
+        self.path = path
+        self.loop = loop
+        self.cap = None
+        self.ended = False
+        self.stats["loops"] = 0
+
+    def open(self):
+        self.cap = cv2.VideoCapture(self.path)
+        if not self.cap.isOpened():
+            print(f"Error: Could not open video {self.path}")
+            return False
+        return True
+
+    def read(self, buf=None):
+        if self.ended:
+            return None
+        ret, frame = self.cap.read()
+        if not ret and self.loop:
+            self.stats["loops"] += 1
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read()
+        if not ret:
+            self.ended = True
+            return None
+        return self._fit(frame, buf)
+
+    def close(self):
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+
+class SyntheticSource(FrameSource):
+    """
+    Generated frames for running without a camera
+
+    A blurred noise texture twice the frame size pans slowly, so frames
+    change every read and compress like a real scene rather than a flat
+    colour (which would make encode look far cheaper than it is).
+    """
+
+    def __init__(self, size=(640, 480), seed=0):
+        super().__init__()
+        self.seed = seed
+        self._texture = None
+        self._tick = 0
+        self.set_size(*size)
+
+    def set_size(self, width, height):
+        if self.size == (width, height) and self._texture is not None:
+            return
+        super().set_size(width, height)
+        rng = np.random.default_rng(self.seed)
+        noise = rng.integers(0, 256, (height * 2, width * 2, 3), dtype=np.uint8)
+        self._texture = cv2.GaussianBlur(noise, (0, 0), 3)
+
+    def read(self, buf=None):
+        width, height = self.size
+        self._tick += 1
+        x = self._tick % width
+        y = (self._tick // 2) % height
+        window = self._texture[y:y + height, x:x + width]
+        self.stats["frames"] += 1
+        if buf is not None and buf.shape == window.shape:
+            np.copyto(buf, window)
+            return buf
+        return window.copy()
@@ -0,0 +1,137 @@
+"""Offline pedestrian routing over the campus walking graph"""
+import glob
+import heapq
+import os
+import threading
+
+import numpy as np
+
+from .campus_graph import (
+    CACHE_DIR, EARTH_RADIUS_M, GRAPH_FILE, build_campus_graph, haversine_m,
+    load_graph_file, to_csr, write_graph_file,
+)
+
+# Points farther than this from the campus graph are left to ORS
+MAX_SNAP_M = 150.0
+
+_graph = None
+_graph_lock = threading.Lock()
+
+
+def get_graph():
+    """
+    Open the campus graph once per process
+
+    The compiled CSR file is memory-mapped, so every Flet session in the
+    process shares the same pages. If the file is missing or stale it is
+    regenerated from the Overpass dump; if that cannot be written (read-only
+    install) the graph is kept in memory instead.
+    """
+    global _graph
+    if _graph is None:
+        with _graph_lock:
+            if _graph is None:
+                _graph = _open_graph()
+    return _graph
+
+
+def _graph_is_stale():
+    built = os.path.getmtime(GRAPH_FILE)
+    return any(os.path.getmtime(p) > built for p in glob.glob(os.path.join(CACHE_DIR, "*.json")))
+
+
+def _open_graph():
+    if os.path.exists(GRAPH_FILE) and not _graph_is_stale():
+        try:
+            return load_graph_file(GRAPH_FILE)
+        except (OSError, ValueError) as e:
+            print(f"Rebuilding campus graph: {e}")
+    try:
+        write_graph_file(GRAPH_FILE)
+        return load_graph_file(GRAPH_FILE)
+    except OSError as e:
+        print(f"Could not write {GRAPH_FILE}, keeping graph in memory: {e}")
+        return to_csr(*build_campus_graph())
+
+
+def nearest_node(graph, lat, lon):
+    """
+    Snap a position to the closest graph node
+
+    Returns:
+        tuple: (node index, distance in metres)
+    """
+    lat_r = np.radians(graph.lat)
+    dlat = lat_r - np.radians(lat)
+    dlon = np.radians(graph.lon) - np.radians(lon)
+    a = np.sin(dlat / 2) ** 2 + np.cos(np.radians(lat)) * np.cos(lat_r) * np.sin(dlon / 2) ** 2
+    d = 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+    best = int(np.argmin(d))
+    return best, float(d[best])
+
+
+def astar(graph, source, target):
+    """
+    A* shortest path with a haversine (straight-line) heuristic
+
+    Returns:
+        list of node indices from source to target, or None if unreachable
+    """
+    t_lat, t_lon = graph.coords(target)
+    g_score = {source: 0.0}
+    came_from = {}
+    open_heap = [(haversine_m(*graph.coords(source), t_lat, t_lon), 0.0, source)]
+    closed = set()
+
+    while open_heap:
+        _, g, u = heapq.heappop(open_heap)
+        if u == target:
+            path = [u]
+            while u in came_from:
+                u = came_from[u]
+                path.append(u)
+            path.reverse()
+            return path
+        if u in closed:
+            continue
+        closed.add(u)
+
+        for v, length in graph.neighbours(u):
+            if v in closed:
+                continue
+            tentative = g + length
+            if tentative < g_score.get(v, float("inf")):
+                g_score[v] = tentative
+                came_from[v] = u
+                h = haversine_m(*graph.coords(v), t_lat, t_lon)
+                heapq.heappush(open_heap, (tentative + h, tentative, v))
+
+    return None
+
+
+def get_local_route(start, end):
+    """
+    Walking route computed on-device
+
+    Args:
+        start: (lat, lon) of the user
+        end: (lat, lon) of the destination
+
+    Returns:
+        list of (lat, lon) from start to end, or None if the campus graph
+        is unavailable, either point is off campus, or there is no path
+    """
+    graph = get_graph()
+    if graph.node_count == 0:
+        return None
+
+    source, source_d = nearest_node(graph, start[0], start[1])
+    target, target_d = nearest_node(graph, end[0], end[1])
+    if source_d > MAX_SNAP_M or target_d > MAX_SNAP_M:
+        return None
+
+    path = astar(graph, source, target)
+    if path is None:
+        return None
+
+    return [tuple(start)] + [graph.coords(n) for n in path] + [tuple(end)]
@@ -0,0 +1,186 @@
+"""Background location updates for the AR frame loop"""
+import csv
+import json
+import threading
+import time
+
+from .bearing import bearing_to_target
+
+# Accuracy reported for the fallback position: a placeholder, not a fix
+FALLBACK_ACCURACY_M = 1000.0
+
+
+class Fix:
+    """One position fix; timestamp is time.monotonic() when it was published"""
+
+    __slots__ = ("lat", "lon", "accuracy_m", "timestamp")
+
+    def __init__(self, lat, lon, accuracy_m=None, timestamp=None):
+        self.lat = lat
+        self.lon = lon
+        self.accuracy_m = accuracy_m
+        self.timestamp = time.monotonic() if timestamp is None else timestamp
+
+    @property
+    def age_s(self):
+        return time.monotonic() - self.timestamp
+
+
+class LocationService:
+    """
+    Keeps the latest fix in a slot the frame loop can read for free
+
+    A daemon thread calls read_fn (e.g. the platform geolocator) every
+    interval_s and publishes the result; push-style sources (position
+    change events, a replay) can call publish() directly instead. The
+    slot is a single attribute holding an immutable Fix, so readers never
+    take a lock and never see a half-written fix.
+
+    Args:
+        read_fn: () -> (lat, lon) or (lat, lon, accuracy_m), or None when
+                 there is no fix; may block. None disables polling.
+        fallback: (lat, lon) position() returns until the first fix
+    """
+
+    def __init__(self, read_fn=None, interval_s=1.0, fallback=None):
+        self.read_fn = read_fn
+        self.interval_s = interval_s
+        self.fallback = fallback
+        self.latest = None
+        self.stats = {"fixes": 0, "errors": 0}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def publish(self, lat, lon, accuracy_m=None):
+        self.latest = Fix(lat, lon, accuracy_m)
+        self.stats["fixes"] += 1
+
+    def position(self):
+        """(lat, lon) of the latest fix, else fallback, else (None, None)"""
+        fix = self.latest
+        if fix is not None:
+            return fix.lat, fix.lon
+        return self.fallback if self.fallback is not None else (None, None)
+
+    def reading(self):
+        """
+        (lat, lon, accuracy_m, timestamp) of the latest fix, the fallback
+        with FALLBACK_ACCURACY_M, or (None, None) with neither
+        """
+        fix = self.latest
+        if fix is not None:
+            return fix.lat, fix.lon, fix.accuracy_m, fix.timestamp
+        if self.fallback is not None:
+            return self.fallback[0], self.fallback[1], FALLBACK_ACCURACY_M, None
+        return None, None
+
+    def _poll(self):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                reading = self.read_fn()
+                if reading:
+                    self.publish(*reading)
+            except Exception as e:
+                self.stats["errors"] += 1
+                if self.stats["errors"] == 1:
+                    print(f"Location read failed: {e}")
+            self._stop.wait(max(0.0, self.interval_s - (time.monotonic() - started)))
+
+    def start(self):
+        if self.read_fn is not None and self._thread is None:
+            self._thread = threading.Thread(target=self._poll, name="location", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+
+class ReplayLocationProvider:
+    """
+    Plays back a recorded trace as if it were the geolocator
+
+    read() returns the last trace fix at or before the elapsed time since
+    the first call (scaled by speed), so it can be handed to
+    LocationService as read_fn. Once the trace runs out it keeps
+    returning the final fix, or starts over with loop=True.
+
+    heading() stands in for the compass: the recorded heading of the
+    current fix if the trace has one, else the course walked from it to
+    the next fix.
+
+    Args:
+        trace: list of (t_s, lat, lon), (t_s, lat, lon, accuracy_m) or
+               (t_s, lat, lon, accuracy_m, heading_deg), t_s increasing
+               from the start of the recording; accuracy_m may be None
+    """
+
+    def __init__(self, trace, speed=1.0, loop=False, clock=time.monotonic):
+        # Stable sort on time only: rows can repeat t with accuracy None vs a float
+        self.trace = sorted((tuple(row) for row in trace), key=lambda row: row[0])
+        self.speed = speed
+        self.loop = loop
+        self.clock = clock
+        self._started = None
+        self._i = 0
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        """
+        Load a trace from JSON ([{"t", "lat", "lon", "accuracy"?, "heading"?}, ...])
+        or CSV with t,lat,lon[,accuracy][,heading] columns
+        """
+        if path.lower().endswith(".json"):
+            with open(path, "r", encoding="utf-8") as f:
+                rows = json.load(f)
+        else:
+            with open(path, "r", encoding="utf-8", newline="") as f:
+                rows = list(csv.DictReader(f))
+        trace = []
+        for row in rows:
+            entry = (float(row["t"]), float(row["lat"]), float(row["lon"]))
+            accuracy = row.get("accuracy")
+            accuracy = None if accuracy in (None, "") else float(accuracy)
+            heading = row.get("heading")
+            if heading not in (None, ""):
+                entry += (accuracy, float(heading))
+            elif accuracy is not None:
+                entry += (accuracy,)
+            trace.append(entry)
+        return cls(trace, **kwargs)
+
+    @property
+    def duration_s(self):
+        return self.trace[-1][0] - self.trace[0][0] if self.trace else 0.0
+
+    def _advance(self):
+        now = self.clock()
+        if self._started is None:
+            self._started = now
+        t = self.trace[0][0] + (now - self._started) * self.speed
+        if self.loop and self.duration_s > 0 and t > self.trace[-1][0]:
+            t = self.trace[0][0] + (t - self.trace[0][0]) % self.duration_s
+            self._i = 0
+        while self._i + 1 < len(self.trace) and self.trace[self._i + 1][0] <= t:
+            self._i += 1
+
+    def read(self):
+        if not self.trace:
+            return None
+        self._advance()
+        return self.trace[self._i][1:4]
+
+    def heading(self):
+        """Compass heading at the current trace time, or None without a trace"""
+        if not self.trace:
+            return None
+        self._advance()
+        row = self.trace[self._i]
+        if len(row) > 4 and row[4] is not None:
+            return row[4]
+        # Course over ground; look back at the end so it keeps the last course
+        a, b = (row, self.trace[self._i + 1]) if self._i + 1 < len(self.trace) else (self.trace[self._i - 1], row)
+        if a is b or (a[1], a[2]) == (b[1], b[2]):
+            return None
+        return bearing_to_target(a[1], a[2], b[1], b[2])
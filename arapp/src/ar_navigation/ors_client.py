@@ -0,0 +1,86 @@
+"""Async OpenRouteService client on a pooled httpx connection"""
+import asyncio
+import random
+
+import httpx
+
+ORS_BASE_URL = "https://api.openrouteservice.org"
+
+# Worth another try: rate limited or a transient server-side failure
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class AsyncORSClient:
+    """
+    Thin ORS directions client sharing one httpx.AsyncClient
+
+    The underlying client keeps connections alive between requests, so
+    repeated routing skips the TCP/TLS handshake. It binds to the event
+    loop it is first used on; use it from the shared loop in
+    async_runtime only.
+    """
+
+    def __init__(self, key, base_url=ORS_BASE_URL, timeout_s=8.0, connect_timeout_s=3.0,
+                 max_retries=2, backoff_s=0.25, max_connections=10):
+        self.key = key
+        self.base_url = base_url
+        self.timeout = httpx.Timeout(timeout_s, connect=connect_timeout_s)
+        self.max_retries = max_retries
+        self.backoff_s = backoff_s
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=60.0,
+        )
+        self._client = None
+
+    def _get_client(self):
+        if self._client is None:
+            if not self.key:
+                raise ValueError("ORS_KEY is not set; cannot route off campus")
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={"Authorization": self.key, "Accept": "application/json"},
+                timeout=self.timeout,
+                limits=self.limits,
+            )
+        return self._client
+
+    async def directions(self, coords, profile="foot-walking", timeout_s=None):
+        """
+        POST /v2/directions/{profile}/json
+
+        Args:
+            coords: ((lon, lat), (lon, lat))
+            profile: ORS routing profile
+            timeout_s: overall per-attempt timeout, defaults to the client's
+
+        Returns:
+            decoded JSON response
+
+        Raises:
+            httpx.HTTPError once retries are exhausted
+        """
+        client = self._get_client()
+        timeout = self.timeout if timeout_s is None else httpx.Timeout(timeout_s)
+        payload = {"coordinates": [list(c) for c in coords]}
+
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                # Full jitter so a burst of clients does not retry in lockstep
+                await asyncio.sleep(random.uniform(0, self.backoff_s * 2 ** attempt))
+            try:
+                resp = await client.post(f"/v2/directions/{profile}/json", json=payload, timeout=timeout)
+            except httpx.TransportError:
+                if attempt == self.max_retries:
+                    raise
+                continue
+            if resp.status_code in RETRY_STATUS and attempt < self.max_retries:
+                continue
+            resp.raise_for_status()
+            return resp.json()
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
@@ -0,0 +1,311 @@
+"""Staged capture -> compose -> encode -> deliver pipeline for the AR view"""
+import threading
+import time
+import traceback
+from collections import deque
+
+
+class Closed(Exception):
+    """Raised by LatestQueue.get once the queue is closed and drained"""
+
+
+class LatestQueue:
+    """
+    Bounded queue that drops the oldest item when full
+
+    put() never blocks, so a slow consumer costs dropped frames rather than
+    latency: whatever it picks up next is the newest the producer made.
+    on_drop, if given, is called with each item pushed out.
+    """
+
+    def __init__(self, maxsize=1, on_drop=None):
+        self._items = deque(maxlen=maxsize)
+        self._cond = threading.Condition()
+        self._closed = False
+        self.on_drop = on_drop
+        self.dropped = 0
+
+    def put(self, item):
+        with self._cond:
+            old = None
+            if len(self._items) == self._items.maxlen:
+                self.dropped += 1
+                old = self._items[0]
+            self._items.append(item)
+            self._cond.notify()
+        if old is not None and self.on_drop is not None:
+            self.on_drop(old)
+
+    def get(self, timeout=None):
+        """Oldest queued item; None on timeout, Closed once closed and empty"""
+        with self._cond:
+            if not self._items and not self._closed:
+                self._cond.wait(timeout)
+            if self._items:
+                return self._items.popleft()
+            if self._closed:
+                raise Closed()
+            return None
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+class FramePool:
+    """
+    Fixed set of frame buffers recycled through the pipeline
+
+    The capture stage takes a free slot and reads into its array
+    (cap.read(image=buf)); the slot comes back once the frame is encoded
+    or dropped. Whatever array the frame ended up in is kept for the next
+    read, so after a resolution change the slots settle on the new shape
+    after one pass. If every slot is in flight acquire() returns no slot
+    and that frame gets a fresh array (counted in stats["misses"]).
+    """
+
+    def __init__(self, count=8):
+        self._buffers = [None] * count
+        self._free = deque(range(count))
+        self._lock = threading.Lock()
+        self.stats = {"reused": 0, "misses": 0}
+
+    def acquire(self):
+        """(slot, array or None); slot is None when the pool is exhausted"""
+        with self._lock:
+            if not self._free:
+                self.stats["misses"] += 1
+                return None, None
+            slot = self._free.popleft()
+            buf = self._buffers[slot]
+            if buf is not None:
+                self.stats["reused"] += 1
+            return slot, buf
+
+    def release(self, slot, frame):
+        if slot is None:
+            return
+        with self._lock:
+            self._buffers[slot] = frame
+            self._free.append(slot)
+
+
+class StageTimings:
+    """
+    Per-stage wall time, as last value and exponential moving average
+
+    Written from the stage threads, read from anywhere (debug overlay,
+    benchmarks); a dict update per sample is atomic enough for that.
+    For percentiles use a StageProfiler (profiler.py) instead.
+    """
+
+    def __init__(self, smoothing=0.1):
+        self.smoothing = smoothing
+        self._stages = {}
+
+    def record(self, stage, seconds):
+        ms = seconds * 1e3
+        entry = self._stages.get(stage)
+        if entry is None:
+            self._stages[stage] = {"last_ms": ms, "avg_ms": ms, "count": 1}
+        else:
+            entry["last_ms"] = ms
+            entry["avg_ms"] += self.smoothing * (ms - entry["avg_ms"])
+            entry["count"] += 1
+
+    def snapshot(self):
+        """{stage: {"last_ms", "avg_ms", "count"}}"""
+        return {stage: dict(entry) for stage, entry in list(self._stages.items())}
+
+
+class FramePipeline:
+    """
+    Runs the AR frame loop as concurrent stages
+
+    capture (one thread) -> compose (one thread, owns navigation state)
+    -> encode (encode_workers threads; cv2.imencode releases the GIL)
+    -> deliver (one thread). Stages are joined by LatestQueues, so
+    throughput is set by the slowest stage instead of the sum of all of
+    them, and a stall anywhere drops old frames instead of queueing them.
+    Delivery never goes backwards: a frame that finished encoding after a
+    newer one is discarded.
+
+    If any stage raises, the error is printed and kept in self.error,
+    stop_flag is set and every queue is closed, so run() returns instead
+    of waiting on a pipeline with a dead stage.
+
+    Args:
+        capture: () -> frame or None; may block until the camera has one
+        compose: (frame) -> frame with overlays
+        encode: (frame) -> payload for deliver
+        deliver: (payload) -> None
+        stop_flag: threading.Event ending every stage
+        timings: StageTimings to record into (a new one if omitted)
+        controller: optional AdaptiveController; capture is paced to its
+                    fps and every delivered frame's latency and drop count
+                    are fed to it
+        pool: optional FramePool; capture is then called as capture(buf)
+              with a recycled array (or None) to read into
+    """
+
+    STAGES = ("capture", "compose", "encode", "deliver")
+
+    def __init__(self, capture, compose, encode, deliver, stop_flag, encode_workers=2,
+                 queue_size=1, timings=None, controller=None, pool=None):
+        self.capture = capture
+        self.compose = compose
+        self.encode = encode
+        self.deliver = deliver
+        self.stop_flag = stop_flag
+        self.encode_workers = encode_workers
+        self.timings = timings if timings is not None else StageTimings()
+        self.controller = controller
+        self.pool = pool
+        self.captured = LatestQueue(queue_size, on_drop=self._recycle)
+        self.composed = LatestQueue(queue_size, on_drop=self._recycle)
+        self.encoded = LatestQueue(queue_size)
+        self.delivered = 0
+        self.stale = 0
+        self._newest_encoded = 0
+        self._order_lock = threading.Lock()
+        self._encoders_left = encode_workers
+        self._threads = []
+        self.error = None
+
+    @property
+    def dropped(self):
+        """Frames dropped before each stage: {"compose", "encode", "deliver"}"""
+        return {
+            "compose": self.captured.dropped,
+            "encode": self.composed.dropped,
+            "deliver": self.encoded.dropped + self.stale,
+        }
+
+    def _recycle(self, item):
+        if self.pool is not None:
+            self.pool.release(item[3], item[2])
+
+    def _timed(self, stage, fn, *args):
+        t0 = time.perf_counter()
+        result = fn(*args)
+        self.timings.record(stage, time.perf_counter() - t0)
+        return result
+
+    def _fail(self, stage, exc):
+        """A stage raised: report it and stop every stage"""
+        print(f"Error in AR {stage} stage: {exc!r}")
+        traceback.print_exc()
+        if self.error is None:
+            self.error = exc
+        self.stop_flag.set()
+        for queue in (self.captured, self.composed, self.encoded):
+            queue.close()
+
+    def _capture_loop(self):
+        seq = 0
+        next_at = time.perf_counter()
+        try:
+            while not self.stop_flag.is_set():
+                if self.pool is not None:
+                    slot, buf = self.pool.acquire()
+                    frame = self._timed("capture", self.capture, buf)
+                else:
+                    slot, buf = None, None
+                    frame = self._timed("capture", self.capture)
+                if frame is None:
+                    if self.pool is not None:
+                        self.pool.release(slot, buf)
+                    time.sleep(0.02)
+                    continue
+                seq += 1
+                self.captured.put((seq, time.perf_counter(), frame, slot))
+
+                if self.controller is not None:
+                    # Hold capture to the target rate; never bank missed ticks
+                    next_at = max(next_at + 1.0 / self.controller.fps, time.perf_counter())
+                    self.stop_flag.wait(next_at - time.perf_counter())
+        except Exception as e:
+            self._fail("capture", e)
+        finally:
+            self.captured.close()
+
+    def _compose_loop(self):
+        try:
+            self._drain("compose", self.captured, lambda item: self.composed.put(
+                (item[0], item[1], self._timed("compose", self.compose, item[2]), item[3])))
+        finally:
+            self.composed.close()
+
+    def _encode_loop(self):
+        def encode(item):
+            seq, captured_at, frame, slot = item
+            payload = self._timed("encode", self.encode, frame)
+            if self.pool is not None:
+                self.pool.release(slot, frame)
+            # Workers can finish out of order; never queue behind a newer frame
+            with self._order_lock:
+                if seq < self._newest_encoded:
+                    self.stale += 1
+                    return
+                self._newest_encoded = seq
+                self.encoded.put((seq, captured_at, payload))
+
+        try:
+            self._drain("encode", self.composed, encode)
+        finally:
+            # The last worker out closes delivery; the others may still be mid-frame
+            with self._order_lock:
+                self._encoders_left -= 1
+                last = self._encoders_left == 0
+            if last:
+                self.encoded.close()
+
+    def _deliver_loop(self):
+        seen_dropped = 0
+
+        def deliver(item):
+            nonlocal seen_dropped
+            _, captured_at, payload = item
+            self._timed("deliver", self.deliver, payload)
+            latency = time.perf_counter() - captured_at
+            self.timings.record("latency", latency)
+            self.delivered += 1
+            if self.controller is not None:
+                dropped = sum(self.dropped.values())
+                self.controller.observe(latency, dropped - seen_dropped)
+                seen_dropped = dropped
+
+        self._drain("deliver", self.encoded, deliver)
+
+    def _drain(self, stage, queue, handle):
+        try:
+            while not self.stop_flag.is_set():
+                try:
+                    item = queue.get(timeout=0.1)
+                except Closed:
+                    return
+                if item is not None:
+                    handle(item)
+        except Exception as e:
+            self._fail(stage, e)
+
+    def start(self):
+        targets = [self._capture_loop, self._compose_loop, self._deliver_loop]
+        targets += [self._encode_loop] * self.encode_workers
+        for i, target in enumerate(targets):
+            t = threading.Thread(target=target, name=f"ar-{target.__name__.strip('_')}-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+        return self
+
+    def join(self, timeout=None):
+        """Wait for the stages to finish (after stop_flag is set)"""
+        for t in self._threads:
+            t.join(timeout)
+
+    def run(self):
+        """start() and block until stop_flag is set and every stage exits"""
+        self.start()
+        self.stop_flag.wait()
+        self.join()
@@ -0,0 +1,85 @@
+"""Vectorised route polyline post-processing in local metres"""
+import numpy as np
+from simplification.cutil import simplify_coords
+
+from .campus_graph import EARTH_RADIUS_M
+
+_M_PER_DEG = np.radians(1.0) * EARTH_RADIUS_M
+
+
+def to_local_xy(latlon, origin=None):
+    """
+    Project (lat, lon) points onto a flat east/north plane in metres
+
+    Args:
+        latlon: (N, 2) array-like of (lat, lon)
+        origin: (lat, lon) of the plane's origin, defaults to the first point
+
+    Returns:
+        tuple: ((N, 2) float64 array of (x_east, y_north), origin)
+    """
+    pts = np.asarray(latlon, dtype=np.float64)
+    if origin is None:
+        origin = (float(pts[0, 0]), float(pts[0, 1]))
+    lat0, lon0 = origin
+    xy = np.empty_like(pts)
+    xy[:, 0] = (pts[:, 1] - lon0) * (_M_PER_DEG * np.cos(np.radians(lat0)))
+    xy[:, 1] = (pts[:, 0] - lat0) * _M_PER_DEG
+    return xy, origin
+
+
+def from_local_xy(xy, origin):
+    """Inverse of to_local_xy; returns an (N, 2) array of (lat, lon)"""
+    lat0, lon0 = origin
+    latlon = np.empty_like(xy)
+    latlon[:, 0] = lat0 + xy[:, 1] / _M_PER_DEG
+    latlon[:, 1] = lon0 + xy[:, 0] / (_M_PER_DEG * np.cos(np.radians(lat0)))
+    return latlon
+
+
+def resample_xy(xy, spacing_m):
+    """
+    Re-space a polyline so consecutive points are spacing_m apart
+
+    Both endpoints are kept; the last step may be shorter.
+    """
+    if len(xy) < 2:
+        return xy
+    seg = np.hypot(*np.diff(xy, axis=0).T)
+    cum = np.concatenate(([0.0], np.cumsum(seg)))
+    total = cum[-1]
+    if total == 0.0:
+        return xy[:1]
+    stations = np.arange(0.0, total, spacing_m)
+    stations = np.append(stations, total)
+    out = np.empty((len(stations), 2))
+    out[:, 0] = np.interp(stations, cum, xy[:, 0])
+    out[:, 1] = np.interp(stations, cum, xy[:, 1])
+    return out
+
+
+def postprocess_route(latlon, simplify_tol_m=5.0, resample_m=None):
+    """
+    Simplify (and optionally resample) a route in metres
+
+    Douglas-Peucker runs on the projected plane, so the tolerance means the
+    same thing at any latitude.
+
+    Args:
+        latlon: (N, 2) array-like of (lat, lon)
+        simplify_tol_m: Douglas-Peucker tolerance in metres (0 disables)
+        resample_m: if set, re-space the result every resample_m metres
+
+    Returns:
+        list of (lat, lon) tuples
+    """
+    pts = np.asarray(latlon, dtype=np.float64)
+    if len(pts) < 2:
+        return [tuple(p) for p in pts.tolist()]
+
+    xy, origin = to_local_xy(pts)
+    if simplify_tol_m:
+        xy = np.asarray(simplify_coords(xy, simplify_tol_m), dtype=np.float64)
+    if resample_m:
+        xy = resample_xy(xy, resample_m)
+    return list(map(tuple, from_local_xy(xy, origin).tolist()))
@@ -0,0 +1,151 @@
+"""Smoothed user pose for the AR loop: Kalman-filtered position, circular heading"""
+import time
+from math import atan2, cos, degrees, exp, hypot, radians, sin
+
+import numpy as np
+
+from .polyline import from_local_xy, to_local_xy
+
+
+class PoseFilter:
+    """
+    Constant-velocity Kalman filter on local east/north metres
+
+    GPS fixes arrive at ~1 Hz with metres of jitter; pose() is asked for
+    every frame. Between fixes the filter extrapolates along its velocity
+    estimate, so the position glides instead of jumping once a second.
+    With a white-acceleration model and the same noise on both axes, east
+    and north are independent filters sharing one 2x2 covariance, which
+    keeps a step to a few float operations.
+
+    A fix far outside the predicted uncertainty (gate_sigma) is ignored
+    as an outlier, unless reset_after of them arrive in a row, which means
+    the user really is somewhere else (e.g. GPS came back after a tunnel).
+
+    Heading is smoothed separately on the unit circle (so 359 -> 1 is a
+    2 degree turn, not 358) with time constant heading_tau_s.
+
+    Args:
+        accel_noise: process noise, m/s^2 of unmodelled acceleration
+        default_accuracy_m: fix standard deviation when none is reported
+    """
+
+    def __init__(self, accel_noise=0.6, default_accuracy_m=8.0, max_speed_mps=3.0,
+                 max_extrapolate_s=2.0, gate_sigma=4.0, reset_after=3, heading_tau_s=0.35,
+                 clock=time.monotonic):
+        self.accel_noise = accel_noise
+        self.default_accuracy_m = default_accuracy_m
+        self.max_speed_mps = max_speed_mps
+        self.max_extrapolate_s = max_extrapolate_s
+        self.gate_sigma = gate_sigma
+        self.reset_after = reset_after
+        self.heading_tau_s = heading_tau_s
+        self.clock = clock
+        self.origin = None
+        self.stats = {"fixes": 0, "rejected": 0, "resets": 0}
+        self._last_fix = None
+        self._rejected_run = 0
+        self._heading_xy = None
+        self._heading_t = None
+
+    def _reset(self, x, y, var, t):
+        self._e, self._n = x, y
+        self._ve = self._vn = 0.0
+        # Shared covariance [[p00, p01], [p01, p11]] for (position, velocity)
+        self._p00, self._p01, self._p11 = var, 0.0, self.max_speed_mps ** 2
+        self._t = t
+
+    def _predict(self, t):
+        dt = t - self._t
+        if dt <= 0:
+            return
+        q = self.accel_noise ** 2
+        self._e += self._ve * dt
+        self._n += self._vn * dt
+        self._p00 += dt * (2 * self._p01 + dt * self._p11) + q * dt ** 4 / 4
+        self._p01 += dt * self._p11 + q * dt ** 3 / 2
+        self._p11 += q * dt ** 2
+        self._t = t
+
+    def _to_xy(self, lat, lon):
+        xy, _ = to_local_xy([(lat, lon)], self.origin)
+        return float(xy[0, 0]), float(xy[0, 1])
+
+    def _to_latlon(self, x, y):
+        lat, lon = from_local_xy(np.array([[x, y]]), self.origin)[0]
+        return float(lat), float(lon)
+
+    def observe(self, lat, lon, accuracy_m=None, timestamp=None):
+        """
+        Feed a GPS fix; repeats of the last fix are ignored, so it is safe
+        to call every frame with whatever the location slot holds
+        """
+        fix = (lat, lon, accuracy_m, timestamp)
+        if fix == self._last_fix:
+            return
+        self._last_fix = fix
+        t = self.clock() if timestamp is None else timestamp
+        var = (accuracy_m or self.default_accuracy_m) ** 2
+
+        if self.origin is None:
+            self.origin = (lat, lon)
+            self._reset(0.0, 0.0, var, t)
+            self.stats["fixes"] += 1
+            return
+
+        zx, zy = self._to_xy(lat, lon)
+        self._predict(t)
+        s = self._p00 + var
+        rx, ry = zx - self._e, zy - self._n
+        if (rx * rx + ry * ry) / s > 2 * self.gate_sigma ** 2:
+            self._rejected_run += 1
+            self.stats["rejected"] += 1
+            if self._rejected_run < self.reset_after:
+                return
+            self._reset(zx, zy, var, t)
+            self.stats["resets"] += 1
+            self._rejected_run = 0
+            return
+        self._rejected_run = 0
+
+        k0, k1 = self._p00 / s, self._p01 / s
+        self._e += k0 * rx
+        self._n += k0 * ry
+        self._ve += k1 * rx
+        self._vn += k1 * ry
+        speed = hypot(self._ve, self._vn)
+        if speed > self.max_speed_mps:
+            self._ve *= self.max_speed_mps / speed
+            self._vn *= self.max_speed_mps / speed
+        self._p11 -= k1 * self._p01
+        self._p00 *= 1 - k0
+        self._p01 *= 1 - k0
+        self.stats["fixes"] += 1
+
+    def position(self, now=None):
+        """Filtered (lat, lon) extrapolated to now, or (None, None) before any fix"""
+        if self.origin is None:
+            return None, None
+        dt = (self.clock() if now is None else now) - self._t
+        dt = max(0.0, min(dt, self.max_extrapolate_s))
+        return self._to_latlon(self._e + self._ve * dt, self._n + self._vn * dt)
+
+    @property
+    def speed_mps(self):
+        return hypot(self._ve, self._vn) if self.origin is not None else 0.0
+
+    def heading(self, heading_deg, now=None):
+        """Feed a compass reading (None keeps the last) and return the smoothed heading"""
+        now = self.clock() if now is None else now
+        if heading_deg is not None:
+            hx, hy = sin(radians(heading_deg)), cos(radians(heading_deg))
+            if self._heading_xy is None:
+                self._heading_xy = (hx, hy)
+            else:
+                a = 1.0 - exp(-max(0.0, now - self._heading_t) / self.heading_tau_s)
+                sx, sy = self._heading_xy
+                self._heading_xy = (sx + a * (hx - sx), sy + a * (hy - sy))
+            self._heading_t = now
+        if self._heading_xy is None:
+            return 0.0
+        return degrees(atan2(*self._heading_xy)) % 360
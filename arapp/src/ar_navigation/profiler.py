@@ -0,0 +1,174 @@
+"""Per-stage AR frame profiling: ring-buffered timings, percentiles, on-frame HUD"""
+import json
+import os
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from .blend import blend_premultiplied
+from .campus_graph import SRC_DIR
+
+# Snapshots written when the AR view closes; storage/ is not checked in
+PROFILE_DIR = os.path.join(os.path.dirname(SRC_DIR), "storage", "profiles")
+
+# capture/encode/deliver (the frame callback) and latency come from
+# FramePipeline; pose/navigation/banner/arrow/hud are laps inside compose
+STAGES = ("capture", "pose", "navigation", "banner", "arrow", "hud", "compose", "encode", "deliver",
+          "latency")
+
+
+class _Ring:
+    """One stage's samples; buffer and count live together so they are read as one"""
+
+    __slots__ = ("buf", "count")
+
+    def __init__(self, capacity):
+        self.buf = np.zeros(capacity, dtype=np.float64)
+        self.count = 0
+
+
+class StageProfiler:
+    """
+    Fixed-size ring buffer of timings per stage, percentiles on demand
+
+    record() is the StageTimings interface, so a profiler can be passed
+    to FramePipeline as timings. lap(stage, since) times the code since
+    the last lap and returns the new mark, for stages inside compose.
+    A stage is written by one thread at a time, except encode with
+    several workers, where a rare lost sample does not matter. reset()
+    swaps in a new set of rings, so a record() or percentiles() running
+    at the same time finishes on the old ones.
+
+    With enabled False, record() returns at once and lap() only reads
+    the clock, so the instrumentation can stay in the frame loop.
+
+    Args:
+        capacity: samples kept per stage (the most recent ones)
+        hud: draw the percentile overlay on each frame (draw_hud)
+        refresh_s: how often the HUD text is recomputed and re-rendered
+        ref_height: frame height the HUD's font is sized for; other
+                    heights scale it, like the banner
+    """
+
+    def __init__(self, capacity=1024, enabled=True, hud=False, refresh_s=0.5, ref_height=480):
+        self.capacity = capacity
+        self.enabled = enabled
+        self.hud = hud
+        self.refresh_s = refresh_s
+        self.ref_height = ref_height
+        self._rings = {}
+        self._lock = threading.Lock()
+        self._hud_sprite = None
+        self._hud_scale = None
+        self._hud_at = 0.0
+
+    def _ring(self, stage):
+        with self._lock:
+            ring = self._rings.get(stage)
+            if ring is None:
+                ring = self._rings[stage] = _Ring(self.capacity)
+            return ring
+
+    def record(self, stage, seconds):
+        if not self.enabled:
+            return
+        ring = self._rings.get(stage)
+        if ring is None:
+            ring = self._ring(stage)
+        n = ring.count
+        ring.buf[n % self.capacity] = seconds * 1e3
+        ring.count = n + 1
+
+    def lap(self, stage, since):
+        """Record now - since for stage; returns now (a perf_counter mark)"""
+        now = time.perf_counter()
+        if self.enabled:
+            self.record(stage, now - since)
+        return now
+
+    def reset(self):
+        with self._lock:
+            self._rings = {}
+
+    def percentiles(self, qs=(50, 95, 99)):
+        """{stage: {"p50_ms", "p95_ms", "p99_ms", "max_ms", "count"}} over the kept samples"""
+        with self._lock:
+            rings = list(self._rings.items())
+        rings.sort(key=lambda item: STAGES.index(item[0]) if item[0] in STAGES else len(STAGES))
+        result = {}
+        for stage, ring in rings:
+            count = ring.count
+            samples = ring.buf[:min(count, self.capacity)]
+            if not len(samples):
+                continue
+            values = np.percentile(samples, qs)
+            entry = {f"p{q}_ms": round(float(v), 3) for q, v in zip(qs, values)}
+            entry["max_ms"] = round(float(samples.max()), 3)
+            entry["count"] = count
+            result[stage] = entry
+        return result
+
+    def snapshot(self, **extra):
+        """JSON-ready dict of the percentiles plus anything in extra"""
+        return {"time": time.time(), "capacity": self.capacity, "stages": self.percentiles(), **extra}
+
+    def dump(self, path=None, **extra):
+        """
+        Write snapshot() as JSON; to PROFILE_DIR/ar-<time>.json by default
+
+        Returns:
+            path written, or None if nothing was recorded or writing failed
+        """
+        if not self._rings:
+            return None
+        if path is None:
+            path = os.path.join(PROFILE_DIR, time.strftime("ar-%Y%m%d-%H%M%S.json"))
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.snapshot(**extra), f, indent=2)
+        except OSError as e:
+            print(f"Could not write AR profile: {e}")
+            return None
+        return path
+
+    def _render_hud(self, header, scale):
+        lines = [header, f"{'stage':<10}{'p50':>7}{'p95':>7}{'p99':>7}"]
+        for stage, p in self.percentiles().items():
+            lines.append(f"{stage:<10}{p['p50_ms']:7.1f}{p['p95_ms']:7.1f}{p['p99_ms']:7.1f}")
+
+        font, font_scale = cv2.FONT_HERSHEY_PLAIN, 0.9 * scale
+        line_h, pad = max(1, round(13 * scale)), round(6 * scale)
+        w = max(cv2.getTextSize(line, font, font_scale, 1)[0][0] for line in lines) + 2 * pad
+        h = line_h * len(lines) + 2 * pad
+        coverage = np.zeros((h, w), dtype=np.uint8)
+        for i, line in enumerate(lines):
+            cv2.putText(coverage, line, (pad, pad + line_h * (i + 1) - round(3 * scale)), font, font_scale, 255, 1,
+                        cv2.LINE_AA)
+
+        # White text over 60% black, premultiplied like the banner sprite
+        c = coverage[:, :, None].astype(np.float32) / 255.0
+        premul = 255.0 * c
+        inv_alpha = (1.0 - c) * 0.4 * 255.0
+        return np.rint(premul).astype(np.uint8), np.rint(inv_alpha).astype(np.uint8)
+
+    def draw_hud(self, frame, header="ms per frame"):
+        """
+        Blend the percentile table bottom left, sized for the frame's
+        height; the text is re-rendered at most every refresh_s (or when
+        the height changes), in between it is a single ROI blend
+
+        Returns:
+            frame
+        """
+        now = time.perf_counter()
+        scale = max(0.5, round(frame.shape[0] / self.ref_height * 20) / 20)
+        if self._hud_sprite is None or scale != self._hud_scale or now - self._hud_at >= self.refresh_s:
+            self._hud_sprite = self._render_hud(header, scale)
+            self._hud_scale = scale
+            self._hud_at = now
+        premul, inv_alpha = self._hud_sprite
+        margin = round(10 * scale)
+        return blend_premultiplied(frame, margin, frame.shape[0] - premul.shape[0] - margin, premul, inv_alpha)
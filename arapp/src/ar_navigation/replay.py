@@ -0,0 +1,186 @@
+"""Headless replay of an AR session: recorded or synthetic frames and GPS, no UI"""
+import argparse
+import json
+import sys
+import threading
+import time
+
+import numpy as np
+
+from .adaptive import AdaptiveController
+from .ar_camera import generate_frames
+from .frame_source import SyntheticSource, VideoFileSource
+from .local_router import get_local_route
+from .location import LocationService, ReplayLocationProvider
+from .polyline import from_local_xy, postprocess_route, to_local_xy
+from .profiler import StageProfiler
+from .route_table import load_places, lookup_route
+
+# Keeps a few minutes of 30 fps samples per stage for the percentiles
+TIMING_CAPACITY = 8192
+
+
+def synthetic_trace(route_points, speed_mps=1.4, rate_hz=1.0, noise_m=4.0, seed=0):
+    """
+    GPS fixes for walking route_points at speed_mps
+
+    Returns:
+        list of (t_s, lat, lon, accuracy_m) at rate_hz with noise_m of
+        Gaussian noise per axis, ending on the destination
+    """
+    xy, origin = to_local_xy(np.asarray(route_points, dtype=np.float64)[:, :2])
+    cum = np.concatenate(([0.0], np.cumsum(np.hypot(*np.diff(xy, axis=0).T))))
+    t = np.arange(0.0, cum[-1] / speed_mps, 1.0 / rate_hz)
+    t = np.append(t, cum[-1] / speed_mps)
+    stations = np.minimum(t * speed_mps, cum[-1])
+    walk = np.column_stack([np.interp(stations, cum, xy[:, 0]), np.interp(stations, cum, xy[:, 1])])
+    walk += np.random.default_rng(seed).normal(0.0, noise_m, walk.shape)
+    fixes = from_local_xy(walk, origin)
+    return [(float(ti), float(lat), float(lon), noise_m) for ti, (lat, lon) in zip(t, fixes)]
+
+
+def replay_session(route_points, trace, source=None, speed=1.0, max_s=None, linger_s=1.0, raw_jpeg=False):
+    """
+    Run generate_frames against a trace and frame source, without a UI
+
+    The trace drives both location and heading (ReplayLocationProvider)
+    at speed times real time; frames come from source (synthetic by
+    default) and are counted instead of shown. The session ends linger_s
+    after arrival, once the trace has played out, or after max_s.
+
+    Returns:
+        report dict: frames, wall_s, fps, stage percentiles (ms),
+        waypoint transitions, arrival time on the trace clock
+    """
+    provider = ReplayLocationProvider(trace, speed=speed)
+    location = LocationService(provider.read, interval_s=min(1.0, 1.0 / speed), fallback=None)
+    timings = StageProfiler(capacity=TIMING_CAPACITY)
+    controller = AdaptiveController()
+    stop_event = threading.Event()
+    state = {"frames": 0, "segment": None, "transitions": [], "arrived_at": None,
+             "remaining_m": None, "off_route_max_m": 0.0}
+    started = time.monotonic()
+
+    def trace_time():
+        return (time.monotonic() - started) * speed
+
+    def frame_callback(payload):
+        state["frames"] += 1
+
+    def on_position(pos):
+        if pos.segment != state["segment"]:
+            if state["segment"] is not None:
+                state["transitions"].append((round(trace_time(), 2), state["segment"], pos.segment))
+            state["segment"] = pos.segment
+        state["remaining_m"] = pos.remaining_m
+        state["off_route_max_m"] = max(state["off_route_max_m"], pos.off_route_m)
+        if pos.arrived and state["arrived_at"] is None:
+            state["arrived_at"] = trace_time()
+
+    location.start()
+    worker = threading.Thread(
+        target=generate_frames,
+        args=(route_points, frame_callback, location.reading, provider.heading, stop_event),
+        kwargs={"timings": timings, "controller": controller, "raw_jpeg": raw_jpeg,
+                "source": source or SyntheticSource(), "on_position": on_position},
+        name="ar-replay", daemon=True,
+    )
+    worker.start()
+
+    # Past the end of the trace the pose filter stops extrapolating within
+    # a couple of seconds; give it that long to call the arrival
+    deadline = started + provider.duration_s / speed + 3.0
+    if max_s is not None:
+        deadline = min(deadline, started + max_s)
+    while worker.is_alive() and time.monotonic() < deadline:
+        if state["arrived_at"] is not None and trace_time() - state["arrived_at"] >= linger_s * speed:
+            break
+        time.sleep(0.05)
+    stop_event.set()
+    location.stop()
+    worker.join(timeout=5.0)
+
+    wall_s = time.monotonic() - started
+    return {
+        "frames": state["frames"],
+        "wall_s": round(wall_s, 2),
+        "fps": round(state["frames"] / wall_s, 1) if wall_s > 0 else 0.0,
+        "stages_ms": timings.percentiles(),
+        "transitions": len(state["transitions"]),
+        "transition_log": state["transitions"],
+        "segments": len(route_points) - 1,
+        "arrived": state["arrived_at"] is not None,
+        "arrival_s": None if state["arrived_at"] is None else round(state["arrived_at"], 1),
+        "trace_s": round(provider.duration_s, 1),
+        "remaining_m": None if state["remaining_m"] is None else round(state["remaining_m"], 1),
+        "off_route_max_m": round(state["off_route_max_m"], 1),
+        "stream": controller.settings,
+    }
+
+
+def _load_route(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [tuple(p[:2]) for p in json.load(f)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Replay an AR session headlessly and report frame rate, stage latency and arrival")
+    parser.add_argument("--route", help="JSON list of [lat, lon]; default: a campus route between two places")
+    parser.add_argument("--from", dest="origin", help="start place name (default: first place)")
+    parser.add_argument("--to", dest="dest", help="destination place name (default: last place)")
+    parser.add_argument("--trace", help="recorded trace, JSON or CSV of t,lat,lon[,accuracy][,heading]; "
+                                        "default: a synthetic walk along the route")
+    parser.add_argument("--video", help="video file to use as the camera; default: synthetic frames")
+    parser.add_argument("--speed", type=float, default=2.0,
+                        help="trace playback speed; keep speed x walking pace under the pose filter's 3 m/s")
+    parser.add_argument("--noise-m", type=float, default=4.0, help="GPS noise of the synthetic walk")
+    parser.add_argument("--max-s", type=float, default=None, help="wall-clock limit")
+    parser.add_argument("--min-fps", type=float, default=0.0, help="exit 1 below this frame rate")
+    parser.add_argument("--json", dest="json_path", help="also write the report here")
+    args = parser.parse_args(argv)
+
+    if args.route:
+        route = _load_route(args.route)
+    else:
+        places = load_places()
+        names = list(places)
+        a = places[args.origin or names[0]]
+        b = places[args.dest or names[-1]]
+        full = lookup_route(a, b) or get_local_route(a, b)
+        if full is None:
+            print(f"No route between {args.origin or names[0]} and {args.dest or names[-1]}")
+            return 2
+        # Same spacing the AR view asks for
+        route = postprocess_route(full, simplify_tol_m=5.0, resample_m=8.0)
+
+    if args.trace:
+        trace = ReplayLocationProvider.from_file(args.trace).trace
+    else:
+        trace = synthetic_trace(route, noise_m=args.noise_m)
+    source = VideoFileSource(args.video) if args.video else SyntheticSource()
+
+    report = replay_session(route, trace, source=source, speed=args.speed, max_s=args.max_s)
+
+    print(f"{report['frames']} frames in {report['wall_s']} s: {report['fps']} fps "
+          f"(ended at {report['stream']['width']}x{report['stream']['height']} "
+          f"@ {report['stream']['fps']} fps, q{report['stream']['jpeg_quality']})")
+    print(f"{'stage':>10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for stage, p in report["stages_ms"].items():
+        print(f"{stage:>10} {p['p50_ms']:8.2f} {p['p95_ms']:8.2f} {p['p99_ms']:8.2f}")
+    print(f"waypoint transitions: {report['transitions']} over {report['segments']} segments, "
+          f"max off-route {report['off_route_max_m']} m")
+    if report["arrived"]:
+        print(f"arrived at t={report['arrival_s']} s of a {report['trace_s']} s trace")
+    else:
+        print(f"did not arrive; {report['remaining_m']} m left at the end of a {report['trace_s']} s trace")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0 if report["arrived"] and report["fps"] >= args.min_fps else 1
+
+
+if __name__ == "__main__":
+    # python -m src.ar_navigation.replay [--trace walk.csv] [--video walk.mp4] [--speed 2]
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""Off-route detection and background re-routing for the AR loop"""
+import threading
+import time
+
+from .local_router import get_local_route
+from .polyline import postprocess_route
+
+
+class Rerouter:
+    """
+    Detects when the user has left the route and re-routes off-thread
+
+    The frame loop calls update() once per frame and poll() to pick up a
+    finished route; neither blocks. Routing from the user's nearest graph
+    node to the destination runs on a daemon worker (one at a time) using
+    the on-device campus graph, so no network call happens mid-walk.
+
+    A re-route that finds no path (or raises) is not retried for
+    retry_s, doubling with each failure in a row up to max_retry_s, so
+    a user standing somewhere the graph cannot reach does not start a
+    worker every frames_required frames forever.
+    """
+
+    def __init__(self, threshold_m=20.0, frames_required=15, simplify_tol_m=5.0, spacing_m=8.0,
+                 retry_s=5.0, max_retry_s=60.0, clock=time.monotonic):
+        self.threshold_m = threshold_m
+        self.frames_required = frames_required
+        self.simplify_tol_m = simplify_tol_m
+        self.spacing_m = spacing_m
+        self.retry_s = retry_s
+        self.max_retry_s = max_retry_s
+        self.clock = clock
+        self.off_route_frames = 0
+        self.reroutes = 0
+        self.failures = 0
+        self._retry_at = 0.0
+        self._busy = False
+        self._result = None
+        self._lock = threading.Lock()
+
+    def update(self, lat, lon, off_route_m, destination):
+        """
+        Feed the current fix and its distance off the route (the
+        RouteTracker's off_route_m); starts a re-route to destination after
+        frames_required consecutive frames farther than threshold_m
+        """
+        if off_route_m > self.threshold_m:
+            self.off_route_frames += 1
+        else:
+            self.off_route_frames = 0
+
+        if (self.off_route_frames >= self.frames_required and not self._busy
+                and self.clock() >= self._retry_at):
+            self._busy = True
+            self.off_route_frames = 0
+            threading.Thread(
+                target=self._reroute,
+                args=((lat, lon), tuple(destination)),
+                daemon=True,
+            ).start()
+
+    def _reroute(self, position, destination):
+        waypoints = None
+        try:
+            full = get_local_route(position, destination)
+            if full is not None:
+                waypoints = postprocess_route(full, self.simplify_tol_m, self.spacing_m)
+        except Exception as e:
+            print(f"Re-route failed: {e}")
+
+        with self._lock:
+            if waypoints is not None:
+                self._result = waypoints
+                self.reroutes += 1
+                self.failures = 0
+                self._retry_at = 0.0
+            else:
+                self.failures += 1
+                backoff = min(self.retry_s * 2 ** (self.failures - 1), self.max_retry_s)
+                self._retry_at = self.clock() + backoff
+        self._busy = False
+
+    def poll(self):
+        """Return freshly computed waypoints once, else None"""
+        with self._lock:
+            result, self._result = self._result, None
+        return result
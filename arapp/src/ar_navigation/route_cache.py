@@ -0,0 +1,173 @@
+"""Two-tier (memory LRU + disk) cache for computed routes"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from math import cos, radians
+
+from .campus_graph import EARTH_RADIUS_M, SRC_DIR
+
+# Kept out of src/cache/, which holds the Overpass dump bundled with the app
+ROUTE_CACHE_DIR = os.path.join(os.path.dirname(SRC_DIR), "storage", "route_cache")
+
+# Origins within the same ~5 m cell share a cache entry
+GRID_M = 5.0
+_DEG_PER_M = 1.0 / (radians(1.0) * EARTH_RADIUS_M)
+
+
+def snap_to_grid(lat, lon, grid_m=GRID_M):
+    """Snap a position to a ~grid_m square cell; returns the cell indices"""
+    step_lat = grid_m * _DEG_PER_M
+    step_lon = step_lat / max(cos(radians(lat)), 1e-6)
+    return round(lat / step_lat), round(lon / step_lon)
+
+
+def route_key(start, end, profile, simplify_tol, grid_m=GRID_M):
+    cell = snap_to_grid(start[0], start[1], grid_m)
+    return f"{cell[0]}:{cell[1]}|{end[0]:.6f},{end[1]:.6f}|{profile}|{simplify_tol!r}"
+
+
+class RouteCache:
+    """
+    Bounded in-memory LRU backed by a size-capped directory of JSON files
+
+    Entries expire after ttl_s in both tiers. The disk tier survives
+    restarts; when it grows past max_disk_bytes the least recently written
+    files are removed first.
+    """
+
+    def __init__(self, cache_dir=ROUTE_CACHE_DIR, max_entries=128,
+                 max_disk_bytes=2 * 1024 * 1024, ttl_s=24 * 3600):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl_s = ttl_s
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "expired": 0,
+                      "memory_evictions": 0, "disk_evictions": 0}
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json")
+
+    def get(self, key, record=True):
+        """
+        Return a cached route or None; a disk hit is promoted to memory
+
+        record=False skips the hit/miss counters (for internal re-checks)
+        """
+        now = time.time()
+        with self._lock:
+            item = self._memory.get(key)
+            if item is not None:
+                stored_at, route = item
+                if now - stored_at <= self.ttl_s:
+                    self._memory.move_to_end(key)
+                    if record:
+                        self.stats["memory_hits"] += 1
+                    return list(route)
+                del self._memory[key]
+                self.stats["expired"] += 1
+
+        item = self._read_disk(key, now)
+        with self._lock:
+            if item is None:
+                if record:
+                    self.stats["misses"] += 1
+                return None
+            if record:
+                self.stats["disk_hits"] += 1
+            stored_at, route = item
+            self._remember(key, stored_at, route)
+        return list(route)
+
+    def put(self, key, route):
+        """Store a route in both tiers"""
+        now = time.time()
+        route = [tuple(p) for p in route]
+        with self._lock:
+            self._remember(key, now, route)
+        self._write_disk(key, now, route)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        if os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".json"):
+                    try:
+                        os.remove(os.path.join(self.cache_dir, name))
+                    except OSError:
+                        pass
+
+    def _remember(self, key, stored_at, route):
+        self._memory[key] = (stored_at, route)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.stats["memory_evictions"] += 1
+
+    def _read_disk(self, key, now):
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("key") != key or "route" not in data:
+            return None
+        if now - data.get("stored_at", 0) > self.ttl_s:
+            with self._lock:
+                self.stats["expired"] += 1
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        return data["stored_at"], [tuple(p) for p in data["route"]]
+
+    def _write_disk(self, key, stored_at, route):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._path(key)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"key": key, "stored_at": stored_at, "route": route}, f, separators=(",", ":"))
+            os.replace(tmp_path, path)
+            self._trim_disk()
+        except OSError as e:
+            print(f"Route cache write failed: {e}")
+
+    def _trim_disk(self):
+        files = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+
+        files.sort()
+        for _, size, path in files:
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                with self._lock:
+                    self.stats["disk_evictions"] += 1
+            except OSError:
+                pass
+
+    def hit_rate(self):
+        with self._lock:
+            hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+            total = hits + self.stats["misses"]
+        return hits / total if total else 0.0
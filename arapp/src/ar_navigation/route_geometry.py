@@ -0,0 +1,121 @@
+"""Per-route distance, bearing and ETA arrays for the AR loop and the route screen"""
+import numpy as np
+
+from .bearing import bearing_to_target_array
+from .campus_graph import haversine_m_array
+from .polyline import to_local_xy
+from .route_table import WALKING_SPEED_MPS
+
+
+class RouteGeometry:
+    """
+    Per-route arrays, built once, for distance-to-go and ETA lookups
+
+    Segment i runs from points[i] to points[i + 1]. seg_len_m (haversine),
+    cum_m (distance from the start to each point) and bearings_deg
+    (initial bearing of each segment, 0 = N, 90 = E) are NumPy arrays, and
+    xy is the route on a flat east/north plane in metres for projecting
+    positions onto it. Once a position is known as (segment, t), its
+    remaining distance and ETA are a couple of array lookups.
+
+    turns_m holds the distance from the start to every vertex where the
+    route bends by more than turn_deg, plus the end, so resampled routes
+    (a vertex every few metres) still know how far the next real turn is.
+    """
+
+    def __init__(self, route_points, walking_speed_mps=WALKING_SPEED_MPS, turn_deg=30.0):
+        pts = np.asarray(route_points, dtype=np.float64)[:, :2]
+        if len(pts) == 1:
+            pts = np.vstack([pts, pts])
+        self.points = pts
+        self.walking_speed_mps = walking_speed_mps
+
+        a, b = pts[:-1], pts[1:]
+        self.seg_len_m = haversine_m_array(a[:, 0], a[:, 1], b[:, 0], b[:, 1])
+        self.cum_m = np.concatenate(([0.0], np.cumsum(self.seg_len_m)))
+        self.total_m = float(self.cum_m[-1])
+        self.bearings_deg = bearing_to_target_array(a[:, 0], a[:, 1], b[:, 0], b[:, 1])
+        # Turns are where one (non-empty) segment's bearing differs from the last's
+        moving = self.seg_len_m > 0
+        starts_m = self.cum_m[:-1][moving]
+        bend = np.abs((np.diff(self.bearings_deg[moving]) + 180) % 360 - 180)
+        self.turns_m = np.append(starts_m[1:][bend > turn_deg], self.total_m)
+
+        # Flat plane around the first point, plenty accurate at campus scale
+        self.xy, self.origin = to_local_xy(pts)
+        # The plane is linear in lat/lon: metres per degree of each, for to_xy
+        self._k_lon, self._k_lat = to_local_xy([(self.origin[0] + 1.0, self.origin[1] + 1.0)], self.origin)[0][0]
+        self.seg_vec = np.diff(self.xy, axis=0)
+        self.seg_len2 = np.einsum("ij,ij->i", self.seg_vec, self.seg_vec)
+
+    @property
+    def segment_count(self):
+        return len(self.seg_len_m)
+
+    def to_xy(self, lat, lon):
+        return (lon - self.origin[1]) * self._k_lon, (lat - self.origin[0]) * self._k_lat
+
+    def project(self, lat, lon, lo=0, hi=None):
+        """
+        Nearest point on segments lo..hi-1 to (lat, lon), in one vectorised pass
+
+        Returns:
+            tuple: (segment, t along it 0..1, distance off the route in m)
+        """
+        if hi is None:
+            hi = self.segment_count
+        px, py = self.to_xy(lat, lon)
+        a = self.xy[lo:hi]
+        d = self.seg_vec[lo:hi]
+        len2 = self.seg_len2[lo:hi]
+        rx = px - a[:, 0]
+        ry = py - a[:, 1]
+        dot = rx * d[:, 0] + ry * d[:, 1]
+        t = np.divide(dot, len2, out=np.zeros_like(dot), where=len2 > 0)
+        np.clip(t, 0.0, 1.0, out=t)
+        dist = np.hypot(rx - t * d[:, 0], ry - t * d[:, 1])
+        i = int(np.argmin(dist))
+        return lo + i, float(t[i]), float(dist[i])
+
+    def along_m(self, segment, t):
+        """Distance from the start to fraction t of segment"""
+        return float(self.cum_m[segment] + t * self.seg_len_m[segment])
+
+    def to_turn_m(self, along_m):
+        """Distance from along_m to the next turn (or the end of the route)"""
+        i = min(int(np.searchsorted(self.turns_m, along_m, side="right")), len(self.turns_m) - 1)
+        return max(float(self.turns_m[i]) - along_m, 0.0)
+
+    def remaining_m(self, segment, t):
+        """Walking distance left from fraction t of segment to the end"""
+        return self.total_m - self.along_m(segment, t)
+
+    def eta_s(self, segment, t, speed_mps=None):
+        """Seconds to walk the rest of the route at speed_mps (default walking pace)"""
+        return self.remaining_m(segment, t) / (speed_mps or self.walking_speed_mps)
+
+    def point_at(self, along_m):
+        """(lat, lon) along_m metres from the start, clamped to the route"""
+        along_m = min(max(along_m, 0.0), self.total_m)
+        return (float(np.interp(along_m, self.cum_m, self.points[:, 0])),
+                float(np.interp(along_m, self.cum_m, self.points[:, 1])))
+
+    def distance_to_go(self, lat, lon):
+        """
+        Walking distance and ETA from (lat, lon), projected onto the whole route
+
+        Returns:
+            tuple: (remaining_m, eta_s)
+        """
+        segment, t, _ = self.project(lat, lon)
+        return self.remaining_m(segment, t), self.eta_s(segment, t)
+
+
+def format_eta(seconds):
+    """Rounded-up walking time for labels: "<1 min", "4 min", "1 h 05 min" """
+    minutes = int(np.ceil(seconds / 60.0))
+    if minutes < 1:
+        return "<1 min"
+    if minutes < 60:
+        return f"{minutes} min"
+    return f"{minutes // 60} h {minutes % 60:02d} min"
@@ -0,0 +1,190 @@
+"""Precomputed building-to-building routes for every pair in PLACES"""
+import argparse
+import json
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from .campus_graph import SRC_DIR, haversine_m
+from .local_router import get_local_route
+
+PLACES_FILE = os.path.join(SRC_DIR, "places_cache.json")
+ROUTE_TABLE_FILE = os.path.join(SRC_DIR, "route_table.json")
+
+TABLE_VERSION = 1
+POLYLINE_PRECISION = 6      # 1e-6 deg ~ 0.1 m
+WALKING_SPEED_MPS = 1.4
+
+# A GPS fix within this radius of a building counts as standing at it
+SNAP_RADIUS_M = 30.0
+# Destinations come straight from PLACES, so they must match almost exactly
+DEST_MATCH_M = 2.0
+
+_table = None
+_table_lock = threading.Lock()
+
+
+def encode_polyline(points, precision=POLYLINE_PRECISION):
+    """Encode (lat, lon) points with the Google polyline algorithm"""
+    factor = 10 ** precision
+    out = []
+    prev_lat = prev_lon = 0
+    for lat, lon in points:
+        lat_i, lon_i = round(lat * factor), round(lon * factor)
+        for delta in (lat_i - prev_lat, lon_i - prev_lon):
+            value = ~(delta << 1) if delta < 0 else delta << 1
+            while value >= 0x20:
+                out.append(chr((0x20 | (value & 0x1F)) + 63))
+                value >>= 5
+            out.append(chr(value + 63))
+        prev_lat, prev_lon = lat_i, lon_i
+    return "".join(out)
+
+
+def decode_polyline(encoded, precision=POLYLINE_PRECISION):
+    """Decode a Google polyline string back into (lat, lon) points"""
+    factor = 10 ** precision
+    points = []
+    index = lat = lon = 0
+    while index < len(encoded):
+        deltas = []
+        for _ in range(2):
+            shift = result = 0
+            while True:
+                b = ord(encoded[index]) - 63
+                index += 1
+                result |= (b & 0x1F) << shift
+                shift += 5
+                if b < 0x20:
+                    break
+            deltas.append(~(result >> 1) if result & 1 else result >> 1)
+        lat += deltas[0]
+        lon += deltas[1]
+        points.append((lat / factor, lon / factor))
+    return points
+
+
+def load_places(path=PLACES_FILE):
+    with open(path, "r", encoding="utf-8") as f:
+        return {name: tuple(coords) for name, coords in json.load(f).items()}
+
+
+def _path_length_m(points):
+    return sum(haversine_m(*a, *b) for a, b in zip(points, points[1:]))
+
+
+def _route_pair(pair):
+    # Process-pool worker: each process maps the campus graph on first use
+    origin_name, origin, dest_name, dest = pair
+    points = get_local_route(origin, dest)
+    if points is None:
+        return origin_name, dest_name, None
+    length = _path_length_m(points)
+    return origin_name, dest_name, {
+        "polyline": encode_polyline(points),
+        "length_m": round(length, 1),
+        "duration_s": round(length / WALKING_SPEED_MPS, 1),
+    }
+
+
+def build_route_table(path=ROUTE_TABLE_FILE, workers=None):
+    """
+    Route every ordered pair of PLACES on a process pool and save the table
+
+    Args:
+        path: output JSON file
+        workers: process count (defaults to the CPU count)
+
+    Returns:
+        dict: the table that was written
+    """
+    places = load_places()
+    pairs = [
+        (a, places[a], b, places[b])
+        for a in places for b in places if a != b
+    ]
+
+    routes = {}
+    missing = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for origin_name, dest_name, entry in pool.map(_route_pair, pairs, chunksize=8):
+            if entry is None:
+                missing += 1
+                continue
+            routes.setdefault(origin_name, {})[dest_name] = entry
+
+    table = {
+        "version": TABLE_VERSION,
+        "precision": POLYLINE_PRECISION,
+        "places": {name: list(coords) for name, coords in places.items()},
+        "routes": routes,
+    }
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(table, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+    print(f"Routed {len(pairs) - missing}/{len(pairs)} building pairs into {path}")
+    return table
+
+
+def get_table():
+    """Load the route table once per process; None if it was never built"""
+    global _table
+    if _table is None:
+        with _table_lock:
+            if _table is None:
+                try:
+                    with open(ROUTE_TABLE_FILE, "r", encoding="utf-8") as f:
+                        table = json.load(f)
+                    if table.get("version") != TABLE_VERSION:
+                        raise ValueError(f"unsupported version {table.get('version')}")
+                    _table = table
+                except (OSError, ValueError) as e:
+                    print(f"Route table unavailable: {e}")
+                    _table = {}
+    return _table or None
+
+
+def _nearest_place(places, lat, lon):
+    best, best_d = None, float("inf")
+    for name, (p_lat, p_lon) in places.items():
+        d = haversine_m(lat, lon, p_lat, p_lon)
+        if d < best_d:
+            best, best_d = name, d
+    return best, best_d
+
+
+def lookup_route(start, end):
+    """
+    Building-to-building route from the precomputed table
+
+    The GPS fix is snapped to the nearest building; the destination must be
+    one of the PLACES coordinates.
+
+    Returns:
+        list of (lat, lon) starting at the user's fix, or None on a miss
+    """
+    table = get_table()
+    if table is None:
+        return None
+
+    places = table["places"]
+    origin_name, origin_d = _nearest_place(places, start[0], start[1])
+    dest_name, dest_d = _nearest_place(places, end[0], end[1])
+    if origin_d > SNAP_RADIUS_M or dest_d > DEST_MATCH_M:
+        return None
+
+    entry = table["routes"].get(origin_name, {}).get(dest_name)
+    if entry is None:
+        return None
+
+    points = decode_polyline(entry["polyline"], table["precision"])
+    return [tuple(start)] + points[1:]
+
+
+if __name__ == "__main__":
+    # python -m src.ar_navigation.route_table [--workers N]
+    parser = argparse.ArgumentParser(description="Precompute the building route table")
+    parser.add_argument("--workers", type=int, default=None)
+    build_route_table(workers=parser.parse_args().workers)
@@ -0,0 +1,89 @@
+"""Progress along the AR route by projecting the user onto its segments"""
+from .route_geometry import RouteGeometry
+
+
+class TrackPosition:
+    """
+    Where the user is along the route
+
+    segment is the index of the route segment (points[segment] to
+    points[segment + 1]) the user projects onto, t the 0..1 progress
+    along it. target is the (lat, lon) lookahead_m further along the
+    route, which is what the arrow points at. eta_s is remaining_m at
+    walking pace. to_vertex_m is the distance to the next vertex where the
+    route turns (RouteGeometry.turns_m), not merely the next resampled point.
+    """
+
+    __slots__ = ("segment", "t", "along_m", "remaining_m", "eta_s", "off_route_m", "to_vertex_m", "target",
+                 "arrived")
+
+    def __init__(self, segment, t, along_m, remaining_m, eta_s, off_route_m, to_vertex_m, target, arrived):
+        self.segment = segment
+        self.t = t
+        self.along_m = along_m
+        self.remaining_m = remaining_m
+        self.eta_s = eta_s
+        self.off_route_m = off_route_m
+        self.to_vertex_m = to_vertex_m
+        self.target = target
+        self.arrived = arrived
+
+
+class RouteTracker:
+    """
+    Snaps each fix onto the route polyline instead of chasing waypoints
+
+    Each update projects the fix onto a small window of segments around
+    the current one (search_back behind, window ahead) in one vectorised
+    pass, so a skipped waypoint, a cut corner or GPS jitter just moves the
+    projection along. If the nearest segment in the window is more than
+    relocate_m away the whole route is searched once, which picks the user
+    up again after a shortcut. Distances come from the route's
+    RouteGeometry, built once here.
+    """
+
+    def __init__(self, route_points, window=8, search_back=2, relocate_m=30.0, lookahead_m=8.0,
+                 arrive_m=5.0):
+        self.geometry = RouteGeometry(route_points)
+        self.window = window
+        self.search_back = search_back
+        self.relocate_m = relocate_m
+        self.lookahead_m = lookahead_m
+        self.arrive_m = arrive_m
+        self.total_m = self.geometry.total_m
+        self.segment = 0
+
+    @property
+    def segment_count(self):
+        return self.geometry.segment_count
+
+    def update(self, lat, lon):
+        """
+        Project a fix onto the route
+
+        Returns:
+            TrackPosition
+        """
+        geometry = self.geometry
+        n = geometry.segment_count
+
+        lo = max(0, self.segment - self.search_back)
+        hi = min(n, self.segment + self.window + 1)
+        seg, t, off = geometry.project(lat, lon, lo, hi)
+        if off > self.relocate_m and (lo > 0 or hi < n):
+            seg, t, off = geometry.project(lat, lon, 0, n)
+        self.segment = seg
+
+        along = geometry.along_m(seg, t)
+        remaining = self.total_m - along
+        return TrackPosition(
+            segment=seg,
+            t=t,
+            along_m=along,
+            remaining_m=remaining,
+            eta_s=remaining / geometry.walking_speed_mps,
+            off_route_m=off,
+            to_vertex_m=geometry.to_turn_m(along),
+            target=geometry.point_at(along + self.lookahead_m),
+            arrived=remaining <= self.arrive_m,
+        )
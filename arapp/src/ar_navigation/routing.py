@@ -1,36 +1,140 @@
-
+import asyncio
 import os
-import openrouteservice
+import threading
+import numpy as np
 from openrouteservice import convert
-from simplification.cutil import simplify_coords
 from dotenv import load_dotenv
 
+from .async_runtime import in_loop_thread, submit
+from .local_router import get_local_route
+from .ors_client import AsyncORSClient
+from .polyline import postprocess_route
+from .route_cache import RouteCache, route_key
+from .route_table import lookup_route
+from .singleflight import SingleFlight
+
 load_dotenv()
 
 ORS_KEY = os.getenv("ORS_KEY")
 
-# ors api key
-client = openrouteservice.Client(key=ORS_KEY)
+PROFILE = "foot-walking"
+
+# Douglas-Peucker tolerance in metres (about the old 0.00005 degrees)
+SIMPLIFY_TOL_M = 5.0
+
+# Shared by every caller in the process: select_place and on_ar_mode_click
+# ask for the same route back to back
+route_cache = RouteCache()
+
+# Identical requests that arrive while one is being computed (a class all
+# tapping the same building) wait for it instead of calling ORS again;
+# route_flight.stats["coalesced"] counts them
+route_flight = SingleFlight()
 
-def get_route(start, end, simplify_tol=0.00005):
+# ors api key; one pooled keep-alive client, used from the shared loop only
+ors = AsyncORSClient(ORS_KEY)
+
+async def _get_ors_route(start, end, timeout_s=None):
     # (lat, lon)
     coords = ((start[1], start[0]), (end[1], end[0]))  # (lon, lat)
 
     # call ORS
-    res = client.directions(coords, profile="foot-walking")
+    res = await ors.directions(coords, profile=PROFILE, timeout_s=timeout_s)
 
     geometry = res["routes"][0]["geometry"]
     decoded = convert.decode_polyline(geometry)
 
-    full_coords = [(c[1], c[0]) for c in decoded["coordinates"]]  # (lat, lon)
+    # (lon, lat) -> (lat, lon)
+    return np.asarray(decoded["coordinates"], dtype=np.float64)[:, ::-1]
+
+async def _route(start, end, simplify_tol, timeout_s, resample_m=None):
+    # Runs on the shared loop from async_runtime
+    key = route_key(start, end, PROFILE, simplify_tol)
+    route = route_cache.get(key)
+    if route is None:
+        route = await route_flight.do(key, _compute_and_cache, key, start, end, simplify_tol, timeout_s)
+
+    # Resampling is cheap and derived from the cached route, so the map
+    # and the AR view share one cache entry
+    if resample_m:
+        return postprocess_route(route, simplify_tol_m=0, resample_m=resample_m)
+    return list(route)
+
+async def _compute_and_cache(key, start, end, simplify_tol, timeout_s):
+    # Another leader may have just finished this key
+    cached = route_cache.get(key, record=False)
+    if cached is not None:
+        return cached
+
+    route = await _compute_route(start, end, simplify_tol, timeout_s)
+    route_cache.put(key, route)
+    return route
+
+async def _compute_route(start, end, simplify_tol, timeout_s=None):
+    # Precomputed building-to-building table, then the on-device campus
+    # graph; ORS is only the fallback
+    full_coords = lookup_route(start, end)
+    if full_coords is None:
+        full_coords = get_local_route(start, end)
+    if full_coords is None:
+        full_coords = await _get_ors_route(start, end, timeout_s)
+
+    # Douglas–Peucker in metres on a local plane
+    return postprocess_route(full_coords, simplify_tol_m=simplify_tol)
+
+async def get_route_async(start, end, simplify_tol=SIMPLIFY_TOL_M, timeout_s=None, resample_m=None):
+    """
+    Awaitable get_route, usable from any event loop (e.g. an async Flet handler)
+
+    The work runs on the shared navigation loop; cancelling the awaiting
+    task cancels the request there, including any ORS call in flight.
+
+    Args:
+        simplify_tol: Douglas-Peucker tolerance in metres
+        resample_m: re-space the route every resample_m metres (for AR)
+    """
+    return await asyncio.wrap_future(submit(_route(start, end, simplify_tol, timeout_s, resample_m)))
+
+def get_route(start, end, simplify_tol=SIMPLIFY_TOL_M, timeout_s=None, resample_m=None):
+    """Blocking wrapper around get_route_async for existing callers"""
+    if in_loop_thread():
+        raise RuntimeError("get_route would deadlock on the navigation loop; await get_route_async instead")
+    return submit(_route(start, end, simplify_tol, timeout_s, resample_m)).result()
+
+class RouteRequester:
+    """
+    Keeps at most one outstanding route request per owner (e.g. a view)
+
+    Submitting a new request cancels the previous one, so a user who picks
+    a different destination mid-request stops paying for the old one.
+    """
+
+    def __init__(self):
+        self._future = None
+        self._lock = threading.Lock()
 
-    # convert to lon-lat for simplification
-    lonlat = [(c[1], c[0]) for c in full_coords]
+    def submit(self, start, end, callback, simplify_tol=SIMPLIFY_TOL_M, timeout_s=None, resample_m=None):
+        """
+        Start routing in the background
 
-    # apply Douglas–Peucker
-    simplified_lonlat = simplify_coords(lonlat, simplify_tol)
+        Args:
+            callback: called with the concurrent.futures.Future once it is
+                done, on the navigation loop thread; a superseded request
+                calls it with a cancelled future on the superseding thread
 
-    # convert back to lat-lon
-    simplified_latlon = [(c[1], c[0]) for c in simplified_lonlat]
+        Returns:
+            concurrent.futures.Future for the route
+        """
+        future = submit(_route(start, end, simplify_tol, timeout_s, resample_m))
+        with self._lock:
+            previous, self._future = self._future, future
+        if previous is not None:
+            previous.cancel()
+        future.add_done_callback(callback)
+        return future
 
-    return simplified_latlon
\ No newline at end of file
+    def cancel(self):
+        with self._lock:
+            previous, self._future = self._future, None
+        if previous is not None:
+            previous.cancel()
@@ -0,0 +1,62 @@
+"""In-flight de-duplication of identical concurrent calls"""
+import asyncio
+import threading
+
+
+class SingleFlight:
+    """
+    Run at most one call per key at a time
+
+    The first caller for a key starts the coroutine as a task; callers that
+    arrive while it is running await the same task and get the same result
+    or exception instead of issuing their own call. The task is cancelled
+    only when every caller waiting on it has been cancelled.
+
+    All calls for one instance must come from the same event loop.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.stats = {"executed": 0, "coalesced": 0, "errors": 0, "cancelled": 0}
+
+    async def do(self, key, coro_fn, *args, **kwargs):
+        with self._lock:
+            entry = self._calls.get(key)
+            if entry is None:
+                entry = {"waiters": 0}
+                entry["task"] = asyncio.ensure_future(self._run(key, entry, coro_fn, *args, **kwargs))
+                self._calls[key] = entry
+                self.stats["executed"] += 1
+            else:
+                self.stats["coalesced"] += 1
+            entry["waiters"] += 1
+
+        task = entry["task"]
+        try:
+            return await asyncio.shield(task)
+        finally:
+            entry["waiters"] -= 1
+            if entry["waiters"] == 0 and not task.done():
+                # Nobody wants the answer any more
+                task.cancel()
+
+    async def _run(self, key, entry, coro_fn, *args, **kwargs):
+        try:
+            return await coro_fn(*args, **kwargs)
+        except asyncio.CancelledError:
+            with self._lock:
+                self.stats["cancelled"] += 1
+            raise
+        except Exception:
+            with self._lock:
+                self.stats["errors"] += 1
+            raise
+        finally:
+            with self._lock:
+                if self._calls.get(key) is entry:
+                    del self._calls[key]
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
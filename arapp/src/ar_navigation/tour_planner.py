@@ -0,0 +1,183 @@
+"""Multi-stop campus tour planning over the building distance matrix"""
+import threading
+
+import numpy as np
+
+from .distance_matrix import dijkstra_all, walking_distances
+from .local_router import get_graph, get_local_route, nearest_node
+from .polyline import postprocess_route
+from .route_table import load_places, lookup_route
+
+# Held-Karp is exact but O(2^n n^2); beyond this many stops use 2-opt/Or-opt
+EXACT_MAX_STOPS = 8
+
+_matrix = None
+_matrix_lock = threading.Lock()
+
+
+def building_matrix():
+    """
+    Walking metres between every pair of PLACES, computed once per process
+
+    Returns:
+        tuple: (names list, (N, N) float64 matrix)
+    """
+    global _matrix
+    if _matrix is None:
+        with _matrix_lock:
+            if _matrix is None:
+                graph = get_graph()
+                places = load_places()
+                names = list(places)
+                snapped = [nearest_node(graph, *places[n]) for n in names]
+                nodes = np.array([node for node, _ in snapped])
+                snap_d = np.array([d for _, d in snapped])
+                matrix = np.empty((len(names), len(names)))
+                for i, (node, d) in enumerate(snapped):
+                    matrix[i] = d + dijkstra_all(graph, node)[nodes] + snap_d
+                np.fill_diagonal(matrix, 0.0)
+                _matrix = (names, matrix)
+    return _matrix
+
+
+def _path_cost(cost, path):
+    return sum(cost[a][b] for a, b in zip(path, path[1:]))
+
+
+def _held_karp(cost, n):
+    # Open path from depot 0 through stops 1..n, ending anywhere
+    full = (1 << n) - 1
+    dp = {(1 << (j - 1), j): (cost[0][j], 0) for j in range(1, n + 1)}
+    for mask in range(1, full + 1):
+        for j in range(1, n + 1):
+            entry = dp.get((mask, j))
+            if entry is None:
+                continue
+            base = entry[0]
+            for k in range(1, n + 1):
+                bit = 1 << (k - 1)
+                if mask & bit:
+                    continue
+                key = (mask | bit, k)
+                c = base + cost[j][k]
+                if key not in dp or c < dp[key][0]:
+                    dp[key] = (c, j)
+
+    last = min(range(1, n + 1), key=lambda j: dp[(full, j)][0])
+    order = []
+    mask = full
+    while last:
+        order.append(last)
+        mask, last = mask & ~(1 << (last - 1)), dp[(mask, last)][1]
+    return [0] + order[::-1]
+
+
+def _nearest_neighbour(cost, n):
+    path = [0]
+    left = set(range(1, n + 1))
+    while left:
+        nxt = min(left, key=lambda k: cost[path[-1]][k])
+        path.append(nxt)
+        left.remove(nxt)
+    return path
+
+
+def _two_opt(cost, path):
+    # Reverse path[i..j]; the depot at 0 never moves and nothing returns to it
+    improved = False
+    n = len(path)
+    for i in range(1, n - 1):
+        for j in range(i + 1, n):
+            a, b, c = path[i - 1], path[i], path[j]
+            d = path[j + 1] if j + 1 < n else None
+            delta = cost[a][c] - cost[a][b]
+            if d is not None:
+                delta += cost[b][d] - cost[c][d]
+            if delta < -1e-9:
+                path[i:j + 1] = path[i:j + 1][::-1]
+                improved = True
+    return improved
+
+
+def _or_opt(cost, path):
+    # Move a run of 1-3 stops (optionally reversed) to a better position
+    improved = False
+    for seg_len in (1, 2, 3):
+        i = 1
+        while i + seg_len <= len(path):
+            seg = path[i:i + seg_len]
+            rest = path[:i] + path[i + seg_len:]
+            current = _path_cost(cost, path)
+            best_cost, best_path = current, None
+            for pos in range(1, len(rest) + 1):
+                for candidate in (seg, seg[::-1]):
+                    new_path = rest[:pos] + candidate + rest[pos:]
+                    c = _path_cost(cost, new_path)
+                    if c < best_cost - 1e-9:
+                        best_cost, best_path = c, new_path
+            if best_path is not None:
+                path[:] = best_path
+                improved = True
+            i += 1
+    return improved
+
+
+def _order_stops(cost, n):
+    if n <= EXACT_MAX_STOPS:
+        return _held_karp(cost, n)
+    path = _nearest_neighbour(cost, n)
+    while _two_opt(cost, path) or _or_opt(cost, path):
+        pass
+    return path
+
+
+def _leg(a, b):
+    return lookup_route(a, b) or get_local_route(a, b) or [tuple(a), tuple(b)]
+
+
+def plan_tour(names, start=None, spacing_m=8.0):
+    """
+    Shortest order to visit a set of buildings
+
+    Args:
+        names: PLACES names to visit
+        start: optional (lat, lon) the tour starts from (the user's fix);
+               without it the tour may start at any of the stops
+        spacing_m: waypoint spacing of the stitched route (None keeps vertices)
+
+    Returns:
+        dict with "order" (names in visiting order), "length_m", and "route",
+        a list of (lat, lon) ready for page.session["current_route"]
+    """
+    all_names, matrix = building_matrix()
+    index = {n: i for i, n in enumerate(all_names)}
+    stops = [n for n in dict.fromkeys(names) if n in index]
+    if not stops:
+        return {"order": [], "length_m": 0.0, "route": []}
+
+    places = load_places()
+    idx = [index[n] for n in stops]
+    n = len(stops)
+
+    # Row/column 0 is the depot: the user's position, or a free start
+    cost = np.zeros((n + 1, n + 1))
+    cost[1:, 1:] = matrix[np.ix_(idx, idx)]
+    if start is not None:
+        from_start = walking_distances(start, {s: places[s] for s in stops})
+        cost[0, 1:] = [from_start[s] for s in stops]
+    cost = cost.tolist()
+
+    path = _order_stops(cost, n)
+    order = [stops[k - 1] for k in path[1:]]
+
+    points = [tuple(start)] if start is not None else []
+    for name in order:
+        target = places[name]
+        if points:
+            leg = _leg(points[-1], target)
+            points.extend(leg[1:])
+        else:
+            points.append(tuple(target))
+
+    route = postprocess_route(points, simplify_tol_m=0, resample_m=spacing_m) if len(points) > 1 else points
+    return {"order": order, "length_m": _path_cost(cost, path), "route": route}
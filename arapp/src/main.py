@@ -26,6 +26,7 @@ from src.ui.home import HomeView
 from src.ui.settings import SettingsView
 from src.ui.ar_view import ARView
 from src.admin_ui.dashboard import DashboardView
+from src.ar_navigation.camera_manager import camera_manager
 from src.utils.auth_middleware import check_route_access
 
 def main(page: ft.Page):
@@ -35,6 +36,9 @@ def main(page: ft.Page):
     page.window.height = 800
     page.window.center()
     page.window_resizable = False
+
+    # Find the AR camera now so /ar does not spend seconds probing devices
+    camera_manager.probe_async()
     
     # Check app state
     def check_first_launch():
@@ -1,18 +1,49 @@
 
 import flet as ft
+import os
 import threading
 from src.ar_navigation.ar_camera import generate_frames
+from src.ar_navigation.adaptive import AdaptiveController
+from src.ar_navigation.delivery import FrameDelivery
+from src.ar_navigation.frame_server import FrameServer
+from src.ar_navigation.frame_source import VideoFileSource
+from src.ar_navigation.location import LocationService, ReplayLocationProvider
+from src.ar_navigation.profiler import StageProfiler
+
+# "base64": frames go through img.src_base64 + page.update (works everywhere)
+# "mjpeg": raw JPEG over a localhost MJPEG stream shown in a WebView
+# (Android/iOS only; Flutter's Image widget cannot play MJPEG). A web
+# deployment always uses base64: the visitor's browser would load its own
+# 127.0.0.1, not the server's.
+AR_TRANSPORT = os.getenv("AR_TRANSPORT", "base64")
+# Recorded trace (JSON or CSV of t,lat,lon[,accuracy][,heading]) to replay instead of GPS
+AR_LOCATION_TRACE = os.getenv("AR_LOCATION_TRACE")
+# Recorded video to play instead of the camera (desktop testing)
+AR_VIDEO_FILE = os.getenv("AR_VIDEO_FILE")
+# "1": profile every stage from the start and show the timing HUD
+# (the speed button turns both on at any time)
+AR_PROFILE = os.getenv("AR_PROFILE") == "1"
 
 class ARView(ft.View):
     def __init__(self, page):
         super().__init__("/ar")
         self.page = page
-        self.img = ft.Image(src="", width=page.window.width, height=page.window.height, fit=ft.ImageFit.COVER)
+        self.frame_server = None
+        if AR_TRANSPORT == "mjpeg" and not page.web:
+            self.frame_server = FrameServer().start()
+            self.img = ft.WebView(url=self.frame_server.url, expand=True)
+        else:
+            self.img = ft.Image(src="", width=page.window.width, height=page.window.height, fit=ft.ImageFit.COVER)
         
         self.stop_event = threading.Event()
+        # Per-stage frame timings, p50/p95/p99 on demand; written to
+        # storage/profiles when the view closes if anything was recorded
+        self.timings = StageProfiler(enabled=AR_PROFILE, hud=AR_PROFILE)
+        # Current fps / resolution / JPEG quality: self.stream.settings
+        self.stream = AdaptiveController()
         
         def on_back_click(e):
-            self.stop_event.set()
+            self.stop()
             page.go("/home")
         
         back_button = ft.Container(
@@ -20,29 +51,52 @@ class ARView(ft.View):
             bgcolor="#80000000", border_radius=25, padding=5, top=40, left=20
         )
         
-        self.controls = [ft.Stack([self.img, back_button], expand=True)]
+        def on_hud_click(e):
+            self.timings.hud = not self.timings.hud
+            if self.timings.hud:
+                self.timings.enabled = True
+
+        hud_button = ft.Container(
+            content=ft.IconButton(ft.Icons.SPEED, icon_color="white", icon_size=24, on_click=on_hud_click),
+            bgcolor="#80000000", border_radius=25, padding=5, top=40, right=20
+        )
+
+        # Shown until the first frame arrives; the camera opens off-thread
+        self.placeholder_text = ft.Text("Starting camera...", color="white", size=16)
+        self.placeholder = ft.Container(
+            content=ft.Column(
+                [ft.ProgressRing(color="white"), self.placeholder_text],
+                alignment=ft.MainAxisAlignment.CENTER,
+                horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+            ),
+            bgcolor="black", alignment=ft.alignment.center, expand=True
+        )
+
+        self.controls = [ft.Stack([self.img, self.placeholder, back_button, hud_button], expand=True)]
 
         route = page.session.get("current_route")
         if not route:
             # Dummy route for testing
             route = [(13.621775, 123.194824), (13.622, 123.195)]
 
-        def get_user_location():
-            try:
-                # 1. Try Real GPS
-                if hasattr(page, "geolocator"):
-                    loc = page.geolocator.get_geolocation()
-                    if loc:
-                        return (loc.latitude, loc.longitude)
-                
-                # 2. Fallback for testing/desktop (Returns start of route)
-                # Without this, the arrow will never show if GPS is flaky
-                if route:
-                    return route[0]
-                return (None, None)
-            except Exception:
-                if route: return route[0]
-                return (None, None)
+        def read_geolocation():
+            # Blocking platform round trip; runs on the location thread only
+            if hasattr(page, "geolocator"):
+                loc = page.geolocator.get_geolocation()
+                if loc:
+                    return (loc.latitude, loc.longitude, getattr(loc, "accuracy", None))
+            return None
+
+        replay = None
+        if AR_LOCATION_TRACE:
+            replay = ReplayLocationProvider.from_file(AR_LOCATION_TRACE)
+            read_geolocation = replay.read
+
+        # Fallback for testing/desktop until the first fix (start of route);
+        # without it the arrow never shows if GPS is flaky
+        self.location = LocationService(read_geolocation, fallback=route[0] if route else None).start()
+        # Fix with accuracy and timestamp, for the pose filter in generate_frames
+        get_user_location = self.location.reading
 
         def get_user_heading():
             try:
@@ -50,20 +104,73 @@ class ARView(ft.View):
             except:
                 return 0
 
-        def frame_callback(b64):
-            if self.stop_event.is_set(): return
-            try:
-                self.img.src_base64 = b64
-                self.page.update()
-            except:
-                self.stop_event.set()
+        if replay is not None:
+            get_user_heading = replay.heading
 
-        threading.Thread(
-            target=generate_frames, 
-            args=(route, frame_callback, get_user_location, get_user_heading, self.stop_event), 
-            daemon=True
-        ).start()
+        # Latest frame only, into self.img only. It is called from the
+        # pipeline's one deliver thread, so frames the page is too slow for
+        # are dropped in the pipeline: see frames_dropped, not delivery.stats
+        self.pipeline = None
+        self.delivery = FrameDelivery(self.img, on_error=lambda e: self.stop_event.set())
+        send_frame = self.delivery.submit
 
-    def did_dispose(self):
+        if self.frame_server is not None:
+            # Binary frames straight to the stream; no base64, no page diff
+            send_frame = self.frame_server.publish
+
+        first_frame = threading.Event()
+
+        def frame_callback(frame):
+            send_frame(frame)
+            if not first_frame.is_set():
+                first_frame.set()
+                self._hide_placeholder()
+
+        def run():
+            generate_frames(route, frame_callback, get_user_location, get_user_heading, self.stop_event,
+                            timings=self.timings, controller=self.stream,
+                            raw_jpeg=self.frame_server is not None,
+                            source=VideoFileSource(AR_VIDEO_FILE) if AR_VIDEO_FILE else None,
+                            on_pipeline=lambda pipeline: setattr(self, "pipeline", pipeline))
+            if not first_frame.is_set() and not self.stop_event.is_set():
+                self._show_camera_error()
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def _hide_placeholder(self):
+        try:
+            self.placeholder.visible = False
+            self.placeholder.update()
+        except Exception:
+            pass
+
+    def _show_camera_error(self):
+        try:
+            self.placeholder_text.value = "Camera not available"
+            self.placeholder.content.controls[0].visible = False
+            self.placeholder.update()
+        except Exception:
+            pass
+
+    @property
+    def frames_dropped(self):
+        """Frames dropped per pipeline stage ({"compose", "encode", "deliver"}), empty before start"""
+        return self.pipeline.dropped if self.pipeline is not None else {}
+
+    def stop(self):
         self.stop_event.set()
+        self.location.stop()
+        self.delivery.close()
+        if self.frame_server is not None:
+            self.frame_server.close()
+        path = self.timings.dump(stream=self.stream.settings,
+                                 delivered=self.pipeline.delivered if self.pipeline is not None else 0,
+                                 dropped=self.frames_dropped)
+        if path:
+            print(f"AR profile written to {path}")
+        # stop() runs again from did_dispose; write the profile once
+        self.timings.reset()
+
+    def did_dispose(self):
+        self.stop()
         super().did_dispose()
\ No newline at end of file
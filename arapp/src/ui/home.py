@@ -1,16 +1,20 @@
+import asyncio
 import flet as ft
 import json
 import os
 import sys
-import threading
 import webbrowser
 import platform
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from ar_navigation.routing import get_route
+from ar_navigation.distance_matrix import walking_distances
+from ar_navigation.routing import RouteRequester, get_route_async
 from utils.map_generator import generate_route_map, save_map_html
+from utils.route_utils import RouteGeometry, format_eta
+
+AR_WAYPOINT_SPACING_M = 8.0
 
 def HomeView(page: ft.Page):
     # Get current user from session/storage
@@ -65,6 +69,7 @@ def HomeView(page: ft.Page):
     current_location = {"lat": 13.405669, "lon": 123.377169}  # Default: CCS Building
     current_route = None
     map_file_path = None  # Store the path to the generated map
+    route_requests = RouteRequester()
     
     def on_search_change(e):
         query = e.control.value.strip().lower()
@@ -94,15 +99,32 @@ def HomeView(page: ft.Page):
         # Filter places that match the query
         matching_places = [name for name in PLACES.keys() if query in name.lower()]
         
+        # Nearest first, by walking distance (one shortest-path run per origin)
+        distances = walking_distances(
+            (current_location["lat"], current_location["lon"]),
+            {name: PLACES[name] for name in matching_places}
+        )
+        matching_places.sort(key=lambda name: distances[name])
+        
         if matching_places:
             suggestions_list.current.visible = True
             # Hide AR section when showing suggestions
             ar_section.current.visible = False
             
             for place_name in matching_places[:10]:  # Show max 10 suggestions
+                distance = distances[place_name]
                 suggestions_list.current.controls.append(
                     ft.Container(
-                        content=ft.Text(place_name, color="white", size=14),
+                        content=ft.Row(
+                            controls=[
+                                ft.Text(place_name, color="white", size=14, expand=True),
+                                ft.Text(
+                                    f"{int(distance)} m" if distance != float("inf") else "",
+                                    color="white70",
+                                    size=12
+                                )
+                            ]
+                        ),
                         bgcolor="#80000000",
                         padding=10,
                         border_radius=5,
@@ -175,73 +197,85 @@ def HomeView(page: ft.Page):
         
         page.update()
         
-        # Generate map in background thread
-        def generate_map():
-            try:
-                nonlocal map_file_path
-                
-                # Get current user location
-                try:
-                    loc = page.geolocator.get_geolocation()
-                    current_location["lat"] = loc.latitude
-                    current_location["lon"] = loc.longitude
-                except Exception:
-                    # Use default location if geolocation fails
-                    pass
-                
-                # Get route
-                nonlocal current_route
-                dest_coords = selected_destination["coords"]
-                current_route = get_route(
-                    (current_location["lat"], current_location["lon"]), 
-                    dest_coords
-                )
-                
-                # Generate map HTML
-                start_coords = (current_location["lat"], current_location["lon"])
-                end_coords = dest_coords
-                
-                html_content = generate_route_map(start_coords, end_coords, current_route)
-                map_file_path = save_map_html(html_content)
-                print(f"Map saved to: {map_file_path}")
-                print(f"File exists: {os.path.exists(map_file_path)}")
-                
-                # Update location info
-                if location_info_text.current is not None:
-                    location_info_text.current.value = f"My Location → {place_name}"
-                
-                # Update map info with coordinates
-                if map_info_text.current is not None:
-                    start_lat = current_location["lat"]
-                    start_lon = current_location["lon"]
-                    end_lat = end_coords[0]
-                    end_lon = end_coords[1]
-                    distance = calculate_distance(start_lat, start_lon, end_lat, end_lon)
-                    map_info_text.current.value = f"From ({start_lat:.4f}, {start_lon:.4f}) to ({end_lat:.4f}, {end_lon:.4f})\nDistance: {distance:.2f} km"
-                
-                # Hide loading and show map
-                if loading_indicator.current is not None:
-                    loading_indicator.current.visible = False
-                if map_display_container.current is not None:
-                    map_display_container.current.visible = True
-                
-                # Enable view map button
-                if view_map_button.current is not None:
-                    view_map_button.current.disabled = False
-                
-                page.update()
-                
-            except Exception as e:
-                print(f"Error generating map: {e}")
-                import traceback
-                traceback.print_exc()
-                if loading_indicator.current is not None:
-                    loading_indicator.current.visible = False
-                page.update()
+        # The geolocator call blocks for a platform round trip; locate and
+        # request the route from a worker, not the handler thread
+        page.run_thread(locate_and_route, place_name, selected_destination["coords"])
+    
+    def locate_and_route(place_name, dest_coords):
+        # Get current user location
+        try:
+            loc = page.geolocator.get_geolocation()
+            current_location["lat"] = loc.latitude
+            current_location["lon"] = loc.longitude
+        except Exception:
+            # Use default location if geolocation fails
+            pass
         
-        # Start map generation in background
-        thread = threading.Thread(target=generate_map, daemon=True)
-        thread.start()
+        # Route in the background; picking another place cancels this request
+        route_requests.submit(
+            (current_location["lat"], current_location["lon"]),
+            dest_coords,
+            lambda future: on_route_ready(future, place_name, dest_coords)
+        )
+    
+    def on_route_ready(future, place_name, dest_coords):
+        # Runs on the shared routing loop: hand the map and UI work to a
+        # worker so other route requests are not held up behind it
+        if future.cancelled():
+            # Superseded by a newer selection
+            return
+        page.run_thread(show_route, future, place_name, dest_coords)
+    
+    def show_route(future, place_name, dest_coords):
+        nonlocal map_file_path, current_route
+        try:
+            current_route = future.result()
+            
+            # Generate map HTML
+            start_coords = (current_location["lat"], current_location["lon"])
+            end_coords = dest_coords
+            
+            html_content = generate_route_map(start_coords, end_coords, current_route)
+            map_file_path = save_map_html(html_content)
+            print(f"Map saved to: {map_file_path}")
+            print(f"File exists: {os.path.exists(map_file_path)}")
+            
+            # Update location info
+            if location_info_text.current is not None:
+                location_info_text.current.value = f"My Location → {place_name}"
+            
+            # Update map info with coordinates and the walk along the route
+            if map_info_text.current is not None:
+                start_lat = current_location["lat"]
+                start_lon = current_location["lon"]
+                end_lat = end_coords[0]
+                end_lon = end_coords[1]
+                if current_route:
+                    remaining_m, eta_s = RouteGeometry(current_route).distance_to_go(start_lat, start_lon)
+                    distance = f"{remaining_m / 1000:.2f} km walk, about {format_eta(eta_s)}"
+                else:
+                    distance = f"{calculate_distance(start_lat, start_lon, end_lat, end_lon):.2f} km"
+                map_info_text.current.value = f"From ({start_lat:.4f}, {start_lon:.4f}) to ({end_lat:.4f}, {end_lon:.4f})\nDistance: {distance}"
+            
+            # Hide loading and show map
+            if loading_indicator.current is not None:
+                loading_indicator.current.visible = False
+            if map_display_container.current is not None:
+                map_display_container.current.visible = True
+            
+            # Enable view map button
+            if view_map_button.current is not None:
+                view_map_button.current.disabled = False
+            
+            page.update()
+            
+        except Exception as e:
+            print(f"Error generating map: {e}")
+            import traceback
+            traceback.print_exc()
+            if loading_indicator.current is not None:
+                loading_indicator.current.visible = False
+            page.update()
     
     def calculate_distance(lat1, lon1, lat2, lon2):
         """Calculate distance between two coordinates in km"""
@@ -350,7 +384,7 @@ def HomeView(page: ft.Page):
             page.snack_bar.open = True
             page.update()
     
-    def on_ar_mode_click(e):
+    async def on_ar_mode_click(e):
         # Start AR navigation
         if not selected_destination["name"] or not selected_destination["coords"]:
             page.snack_bar = ft.SnackBar(ft.Text("Please select a destination first"))
@@ -358,9 +392,9 @@ def HomeView(page: ft.Page):
             page.update()
             return
         
-        # Get user location
+        # Get user location, off the event loop (blocking platform round trip)
         try:
-            loc = page.geolocator.get_geolocation()
+            loc = await asyncio.to_thread(page.geolocator.get_geolocation)
             user_lat = loc.latitude
             user_lon = loc.longitude
         except Exception:
@@ -369,7 +403,8 @@ def HomeView(page: ft.Page):
         
         # Compute route
         dest_coords = selected_destination["coords"]
-        route = get_route((user_lat, user_lon), dest_coords)
+        # Evenly spaced waypoints for the AR loop's 5 m advance check
+        route = await get_route_async((user_lat, user_lon), dest_coords, resample_m=AR_WAYPOINT_SPACING_M)
         
         # Save route to session and navigate to AR view
         page.session.set("current_route", route)
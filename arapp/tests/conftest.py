@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Tests import the app as src.*, like the benchmarks
+ARAPP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ARAPP_DIR)
@@ -0,0 +1,35 @@
+import numpy as np
+
+from src.ar_navigation.ar_camera import _arrow_img
+from src.ar_navigation.arrow_atlas import DEFAULT_BUDGET_BYTES, ArrowAtlas
+from src.ar_navigation.blend import blend_premultiplied
+
+
+def _direct(atlas, angle, scale):
+    """The sprite rendered at exactly this pose, drawn like ArrowAtlas.draw"""
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    sprite = atlas._render(angle, scale)
+    x = 640 // 2 - sprite.box_w // 2 + sprite.dx
+    y = int(480 * 0.75) - sprite.box_h // 2 + sprite.dy
+    return blend_premultiplied(frame, x, y, sprite.premul, sprite.inv_alpha)
+
+
+def test_quarter_turns_match_direct_renders():
+    atlas = ArrowAtlas(_arrow_img)
+    for angle in (93.0, 180.0, 204.0, 357.0):
+        drawn = atlas.draw(np.zeros((480, 640, 3), dtype=np.uint8), angle, 0.5)
+        diff = np.abs(drawn.astype(np.int16) - _direct(atlas, angle, 0.5)).max(axis=2)
+        assert diff.mean() < 0.05
+    # Only the first quarter turn was rendered
+    assert all(base < atlas.quarter_buckets for base, _ in atlas._sprites)
+
+
+def test_full_ring_fits_the_default_budget():
+    for scale in (0.3, 0.5, 0.8):
+        atlas = ArrowAtlas(_arrow_img, max_scale=0.8)
+        for angle in range(0, 720, 1):
+            atlas.get(angle, scale)
+        assert atlas.bytes_used + atlas._source_bytes <= DEFAULT_BUDGET_BYTES
+        assert atlas.stats["evictions"] == 0
+        # Second lap is all hits
+        assert atlas.stats["misses"] * atlas.angle_stride(scale) == atlas.quarter_buckets
@@ -0,0 +1,30 @@
+import numpy as np
+
+from src.ar_navigation.banner import BannerRenderer
+
+TEXT = "Destination: 1234 m (15 min)"
+
+
+def test_banner_keeps_its_share_of_smaller_frames():
+    banner = BannerRenderer()
+    widths = {}
+    for h, w in ((480, 640), (240, 320)):
+        frame = np.zeros((h, w, 3), dtype=np.uint8)
+        banner.draw(frame, TEXT)
+        cols = np.flatnonzero(frame.any(axis=(0, 2)))
+        widths[w] = (cols[-1] - cols[0] + 1) / w
+
+    assert widths[320] < 0.55
+    assert abs(widths[320] - widths[640]) < 0.05
+
+
+def test_sprites_are_cached_per_text_and_scale():
+    banner = BannerRenderer()
+    small = np.zeros((240, 320, 3), dtype=np.uint8)
+    large = np.zeros((480, 640, 3), dtype=np.uint8)
+    for frame in (large, small, large, small):
+        banner.draw(frame, TEXT)
+
+    assert banner.stats["misses"] == 2
+    assert banner.stats["hits"] == 2
+    assert banner.sprite(TEXT, 0.5)[0].shape[1] < banner.sprite(TEXT, 1.0)[0].shape[1]
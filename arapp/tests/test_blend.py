@@ -0,0 +1,34 @@
+import numpy as np
+
+from src.ar_navigation.blend import blend_premultiplied, premultiply, solid
+
+
+def _float_blend(frame, bgra):
+    a = bgra[:, :, 3:4] / 255.0
+    return frame * (1 - a) + bgra[:, :, :3] * a
+
+
+def test_solid_white_over_white_stays_white():
+    for alpha in (0.0, 0.3, 0.5, 0.7, 1.0):
+        frame = np.full((4, 4, 3), 255, dtype=np.uint8)
+        premul, inv_alpha = solid((255, 255, 255), alpha)
+        blend_premultiplied(frame, 0, 0, premul, inv_alpha, size=(4, 4))
+        assert (frame == 255).all(), alpha
+
+
+def test_premultiplied_blend_matches_float_within_one():
+    rng = np.random.default_rng(0)
+    bgra = rng.integers(0, 256, (32, 32, 4), dtype=np.uint8)
+    base = rng.integers(0, 256, (32, 32, 3), dtype=np.uint8)
+    premul, inv_alpha = premultiply(bgra)
+
+    frame = blend_premultiplied(base.copy(), 0, 0, premul, inv_alpha)
+    assert np.abs(frame - _float_blend(base, bgra)).max() <= 1.0
+
+
+def test_sprite_is_clipped_at_the_frame_edge():
+    frame = np.zeros((8, 8, 3), dtype=np.uint8)
+    premul, inv_alpha = solid((0, 0, 255), 1.0)
+    blend_premultiplied(frame, 6, -2, premul, inv_alpha, size=(4, 4))
+    assert (frame[:2, 6:, 2] == 255).all()
+    assert frame[2:].sum() == 0 and frame[:, :6].sum() == 0
@@ -0,0 +1,119 @@
+import threading
+import time
+import tracemalloc
+
+import numpy as np
+
+from src.ar_navigation.delivery import FrameDelivery
+from src.ar_navigation.pipeline import FramePipeline
+
+FRAME_BYTES = 50 * 1024
+
+
+class SlowImage:
+    """Stands in for ft.Image on a page whose update() takes update_s"""
+
+    def __init__(self, update_s):
+        self.update_s = update_s
+        self.src_base64 = None
+        self.shown = []
+
+    def update(self):
+        time.sleep(self.update_s)
+        self.shown.append(self.src_base64[:12])
+
+
+def _frame(producer, seq):
+    return f"{producer:02d}:{seq:08d}:" + "A" * FRAME_BYTES
+
+
+def test_slow_page_keeps_memory_bounded():
+    control = SlowImage(update_s=0.02)
+    delivery = FrameDelivery(control)
+    stop = threading.Event()
+    submitted = [0, 0, 0]
+
+    def produce(producer):
+        seq = 0
+        while not stop.is_set():
+            delivery.submit(_frame(producer, seq))
+            seq += 1
+            submitted[producer] = seq
+            time.sleep(0.002)
+
+    tracemalloc.start()
+    try:
+        producers = [threading.Thread(target=produce, args=(i,)) for i in range(3)]
+        for t in producers:
+            t.start()
+        time.sleep(0.2)
+        settled, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        time.sleep(0.8)
+        stop.set()
+        for t in producers:
+            t.join()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    stats = delivery.stats
+    assert stats["delivered"] > 10
+    assert stats["dropped"] > stats["delivered"]
+    assert stats["errors"] == 0
+    # Producers each hold one frame, plus one parked and one being shown;
+    # a queue of everything submitted would be sum(submitted) frames
+    assert sum(submitted) > 100
+    assert peak - settled < 8 * FRAME_BYTES
+
+
+def test_newest_frame_wins_after_a_burst():
+    control = SlowImage(update_s=0.05)
+    delivery = FrameDelivery(control)
+    first = threading.Thread(target=delivery.submit, args=(_frame(0, 0),))
+    first.start()
+    time.sleep(0.01)
+    for seq in range(1, 20):
+        delivery.submit(_frame(0, seq))
+    first.join()
+
+    assert control.shown == ["00:00000000:", "00:00000019:"]
+    assert delivery.stats["dropped"] == 18
+
+
+def test_errors_close_delivery():
+    class Closed(SlowImage):
+        def update(self):
+            raise RuntimeError("session closed")
+
+    errors = []
+    delivery = FrameDelivery(Closed(0.0), on_error=errors.append)
+    delivery.submit(_frame(0, 0))
+    delivery.submit(_frame(0, 1))
+
+    assert delivery.closed
+    assert len(errors) == 1
+    assert delivery.stats == {"delivered": 0, "dropped": 0, "errors": 1}
+
+
+def test_pipeline_counts_drops_before_a_slow_delivery():
+    control = SlowImage(update_s=0.05)
+    delivery = FrameDelivery(control)
+    stop = threading.Event()
+    frame = np.zeros((48, 64, 3), dtype=np.uint8)
+
+    def capture():
+        time.sleep(0.002)
+        return frame.copy()
+
+    pipeline = FramePipeline(capture, lambda f: f, lambda f: _frame(0, 0), delivery.submit, stop)
+    pipeline.start()
+    time.sleep(0.6)
+    stop.set()
+    pipeline.join()
+
+    # One deliver thread never parks a frame in FrameDelivery; the
+    # pipeline's drop-oldest queue is where slow-page drops are counted
+    assert delivery.stats["dropped"] == 0
+    assert pipeline.dropped["deliver"] > 0
+    assert pipeline.delivered == delivery.stats["delivered"]
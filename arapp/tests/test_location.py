@@ -0,0 +1,27 @@
+from src.ar_navigation.location import ReplayLocationProvider
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_trace_sorts_by_time_with_repeated_timestamps():
+    trace = [
+        (2.0, 13.6212, 123.1942, 5.0),
+        (0.0, 13.6210, 123.1940, None),
+        (1.0, 13.6211, 123.1941, None),
+        (1.0, 13.6211, 123.1941, 4.0),
+    ]
+    clock = Clock()
+    replay = ReplayLocationProvider(trace, clock=clock)
+
+    assert [row[0] for row in replay.trace] == [0.0, 1.0, 1.0, 2.0]
+    # Equal times keep their recorded order
+    assert replay.trace[1][3] is None and replay.trace[2][3] == 4.0
+    replay.read()
+    clock.now = 1.5
+    assert tuple(replay.read()[:2]) == (13.6211, 123.1941)
@@ -0,0 +1,69 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from src.ar_navigation.pipeline import FramePipeline, FramePool
+
+
+def _capture(buf=None):
+    time.sleep(0.002)
+    return np.zeros((48, 64, 3), dtype=np.uint8)
+
+
+def _fails_after(n):
+    calls = [0]
+
+    def stage(frame):
+        calls[0] += 1
+        if calls[0] > n:
+            raise RuntimeError("stage broke")
+        return frame
+
+    return stage
+
+
+@pytest.mark.parametrize("failing", ["capture", "compose", "encode", "deliver"])
+def test_a_failing_stage_stops_run(failing):
+    stages = {
+        "capture": _capture,
+        "compose": lambda f: f,
+        "encode": lambda f: b"jpeg",
+        "deliver": lambda payload: None,
+    }
+    broken = _fails_after(5)
+    stages[failing] = (lambda buf=None: broken(_capture())) if failing == "capture" else broken
+    stop = threading.Event()
+    pipeline = FramePipeline(stages["capture"], stages["compose"], stages["encode"], stages["deliver"], stop,
+                             pool=FramePool() if failing != "capture" else None)
+
+    runner = threading.Thread(target=pipeline.run, daemon=True)
+    runner.start()
+    runner.join(5.0)
+
+    assert not runner.is_alive()
+    assert stop.is_set()
+    assert isinstance(pipeline.error, RuntimeError)
+    assert all(not t.is_alive() for t in pipeline._threads)
+
+
+def test_encoders_close_delivery_when_the_last_one_exits():
+    stop = threading.Event()
+    delivered = []
+    frames = iter(range(20))
+
+    def capture():
+        n = next(frames, None)
+        if n is None:
+            stop.set()
+            return None
+        return np.full((4, 4, 3), n, dtype=np.uint8)
+
+    pipeline = FramePipeline(capture, lambda f: f, lambda f: int(f[0, 0, 0]), delivered.append, stop)
+    pipeline.start()
+    pipeline.join(5.0)
+
+    assert pipeline.error is None
+    assert pipeline.encoded._closed
+    assert delivered == sorted(delivered)
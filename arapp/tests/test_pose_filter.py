@@ -0,0 +1,80 @@
+import random
+from math import hypot
+
+import numpy as np
+
+from src.ar_navigation.polyline import from_local_xy, to_local_xy
+from src.ar_navigation.pose_filter import PoseFilter
+
+ORIGIN = (13.6210, 123.1940)
+FPS = 30
+SPEED_MPS = 1.4
+
+
+def _latlon(x, y):
+    return tuple(from_local_xy(np.array([[x, y]]), ORIGIN)[0].tolist())
+
+
+def _xy(lat, lon):
+    return tuple(to_local_xy([(lat, lon)], ORIGIN)[0][0].tolist())
+
+
+def _walk(filtered, seconds=60, gps_sigma=8.0, seed=3):
+    """Position RMSE and biggest frame-to-frame jump walking north with 1 Hz fixes"""
+    rng = random.Random(seed)
+    pose = PoseFilter(default_accuracy_m=gps_sigma)
+    errors, jumps = [], []
+    prev = None
+    for frame in range(seconds * FPS):
+        t = frame / FPS
+        y = SPEED_MPS * t
+        if frame % FPS == 0:
+            fix = _latlon(rng.gauss(0, gps_sigma), y + rng.gauss(0, gps_sigma)) + (gps_sigma, t)
+        if filtered:
+            pose.observe(*fix)
+            px, py = _xy(*pose.position(now=t))
+        else:
+            px, py = _xy(fix[0], fix[1])
+        if t >= 5:
+            errors.append(hypot(px, py - y))
+            jumps.append(hypot(px - prev[0], py - prev[1]))
+        prev = (px, py)
+    return float(np.sqrt(np.mean(np.square(errors)))), max(jumps)
+
+
+def test_filter_cuts_error_and_frame_to_frame_jumps():
+    raw_rmse, raw_jump = _walk(filtered=False)
+    rmse, jump = _walk(filtered=True)
+
+    assert rmse < 0.7 * raw_rmse
+    assert jump < 0.5 * raw_jump
+
+
+def test_outliers_are_gated_until_they_persist():
+    pose = PoseFilter(default_accuracy_m=3.0)
+    for t in range(10):
+        pose.observe(*_latlon(0.0, 0.0), 3.0, float(t))
+    far = _latlon(500.0, 0.0)
+
+    pose.observe(*far, 3.0, 10.0)
+    pose.observe(*far, 3.0, 11.0)
+    assert pose.stats["rejected"] == 2
+    assert hypot(*_xy(*pose.position(now=11.0))) < 1.0
+
+    # The third in a row means the user really moved: jump there
+    pose.observe(*far, 3.0, 12.0)
+    assert pose.stats["resets"] == 1
+    x, y = _xy(*pose.position(now=12.0))
+    assert abs(x - 500.0) < 1.0 and abs(y) < 1.0
+
+
+def test_heading_wraps_through_north():
+    pose = PoseFilter(heading_tau_s=0.35)
+    assert abs(pose.heading(359.0, now=0.0) - 359.0) < 1e-9
+
+    heading = pose.heading(1.0, now=0.1)
+    # Smoothing between 359 and 1 stays near north, never swings through 180
+    assert heading > 359.0 or heading < 1.0
+    for i in range(2, 30):
+        heading = pose.heading(1.0, now=i * 0.1)
+    assert abs(heading - 1.0) < 0.1
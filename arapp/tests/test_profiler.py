@@ -0,0 +1,43 @@
+import threading
+import time
+
+from src.ar_navigation.profiler import StageProfiler
+
+
+def test_percentiles_over_the_kept_samples():
+    profiler = StageProfiler(capacity=100)
+    for ms in range(1, 201):
+        profiler.record("encode", ms / 1e3)
+
+    p = profiler.percentiles()["encode"]
+    # Only the last 100 samples (101..200 ms) are kept
+    assert p["count"] == 200
+    assert 150.0 <= p["p50_ms"] <= 151.0
+    assert p["max_ms"] == 200.0
+
+
+def test_reset_while_recording_and_reading():
+    profiler = StageProfiler(capacity=64)
+    stop = threading.Event()
+    errors = []
+
+    def run(fn):
+        try:
+            while not stop.is_set():
+                fn()
+        except Exception as e:
+            errors.append(e)
+
+    workers = [
+        threading.Thread(target=run, args=(lambda: [profiler.record(s, 0.001) for s in ("pose", "arrow", "encode")],)),
+        threading.Thread(target=run, args=(profiler.percentiles,)),
+        threading.Thread(target=run, args=(profiler.reset,)),
+    ]
+    for t in workers:
+        t.start()
+    time.sleep(0.5)
+    stop.set()
+    for t in workers:
+        t.join()
+
+    assert errors == []
@@ -0,0 +1,74 @@
+import time
+
+from src.ar_navigation import rerouter as rerouter_module
+from src.ar_navigation.rerouter import Rerouter
+
+DEST = (13.6220, 123.1950)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _off_route(rerouter, frames):
+    for _ in range(frames):
+        rerouter.update(13.6210, 123.1940, 50.0, DEST)
+        # Let a started worker finish before the next frame
+        deadline = time.monotonic() + 2.0
+        while rerouter._busy and time.monotonic() < deadline:
+            time.sleep(0.001)
+
+
+def _count_routes(monkeypatch, route):
+    calls = []
+
+    def get_local_route(position, destination):
+        calls.append(position)
+        return route
+
+    monkeypatch.setattr(rerouter_module, "get_local_route", get_local_route)
+    return calls
+
+
+def test_failed_reroutes_back_off(monkeypatch):
+    calls = _count_routes(monkeypatch, None)
+    clock = Clock()
+    rerouter = Rerouter(frames_required=15, retry_s=5.0, max_retry_s=20.0, clock=clock)
+
+    _off_route(rerouter, 15 * 10)
+    assert len(calls) == 1
+    assert rerouter.failures == 1
+
+    clock.now = 5.0
+    _off_route(rerouter, 15)
+    assert len(calls) == 2
+
+    # Second failure in a row: 10 s, then capped at 20 s
+    clock.now = 14.0
+    _off_route(rerouter, 30)
+    assert len(calls) == 2
+    clock.now = 15.0
+    _off_route(rerouter, 15)
+    assert len(calls) == 3
+    clock.now = 34.0
+    _off_route(rerouter, 15)
+    assert len(calls) == 3
+    clock.now = 35.0
+    _off_route(rerouter, 15)
+    assert len(calls) == 4
+    assert rerouter.poll() is None
+
+
+def test_success_clears_the_backoff(monkeypatch):
+    route = [(13.6210, 123.1940), DEST]
+    calls = _count_routes(monkeypatch, route)
+    rerouter = Rerouter(frames_required=15, clock=Clock())
+
+    _off_route(rerouter, 30)
+    assert len(calls) == 2
+    assert rerouter.failures == 0
+    assert rerouter.poll() is not None
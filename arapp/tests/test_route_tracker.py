@@ -0,0 +1,25 @@
+import numpy as np
+
+from src.ar_navigation.polyline import from_local_xy, postprocess_route
+from src.ar_navigation.route_tracker import RouteTracker
+
+ORIGIN = (13.6210, 123.1940)
+
+
+def _latlon(x, y):
+    return from_local_xy(np.array([[x, y]], dtype=np.float64), ORIGIN)[0].tolist()
+
+
+def test_distance_to_the_next_turn_ignores_resampled_points():
+    # 100 m north then 100 m east, re-spaced every 8 m like an AR route
+    corner = from_local_xy(np.array([[0.0, 0.0], [0.0, 100.0], [100.0, 100.0]]), ORIGIN)
+    tracker = RouteTracker(postprocess_route(corner.tolist(), simplify_tol_m=0, resample_m=8.0))
+
+    walk = [(0.0, y) for y in range(0, 100, 2)] + [(x, 100.0) for x in range(0, 100, 2)]
+    seen = {xy: tracker.update(*_latlon(*xy)) for xy in walk}
+    far, near, after = seen[(0.0, 10.0)], seen[(0.0, 90.0)], seen[(50.0, 100.0)]
+
+    assert 80.0 < far.to_vertex_m < 90.0
+    assert 0.0 < near.to_vertex_m < 10.0
+    assert 45.0 < after.to_vertex_m < 52.0
+    assert far.off_route_m < 0.5